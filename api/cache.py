@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple, Type
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from api.data import Dataset, get_dataset
+from api.metrics import Observed
+
+
+# =========================================================
+# Config
+# =========================================================
+
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+
+# =========================================================
+# Encoding / ETags
+# =========================================================
+
+def encode_json(content) -> bytes:
+    """
+    Compact UTF-8 JSON, as FastAPI's JSONResponse produces. Uses orjson
+    when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match evaluation (RFC 9110 weak comparison): any listed tag,
+    with or without a W/ prefix, or "*".
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+# =========================================================
+# Dataset-level responses
+# =========================================================
+
+def dataset_json_response(
+    request: Request,
+    key: str,
+    build: Callable[[Dataset], object],
+    model: Optional[Type[BaseModel]] = None,
+) -> Response:
+    """
+    Serve a payload that only depends on the loaded dataset.
+
+    `build` receives the dataset snapshot to read from. The body and its
+    ETag are computed once per dataset (memoized on it), so serving is
+    independent of catalog size. Clients revalidating with a
+    matching If-None-Match get an empty 304.
+    """
+
+    ds = get_dataset()
+
+    def render() -> Tuple[bytes, str]:
+        payload = build(ds)
+        if model is not None:
+            payload = model.model_validate(payload).model_dump(mode="json")
+        body = encode_json(payload)
+        return body, make_etag(body)
+
+    body, etag = ds.memoize(("response", key), render)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# =========================================================
+# Serialized response cache
+# =========================================================
+
+class ResponseCache:
+    """
+    LRU cache of serialized response bodies with a TTL and a total size
+    bound in bytes. Keys must carry every version the body depends on
+    (dataset, model), so stale entries are simply never hit again and age
+    out.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, time.monotonic() + self.ttl_seconds)
+            self._size += len(body)
+
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        body, _ = self._entries.pop(key)
+        self._size -= len(body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+RESPONSE_CACHE = ResponseCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS)
+
+Observed("dri_response_cache_hits_total", "Response cache hits", "counter", lambda: RESPONSE_CACHE.hits)
+Observed("dri_response_cache_misses_total", "Response cache misses", "counter", lambda: RESPONSE_CACHE.misses)
+Observed("dri_response_cache_evictions_total", "Response cache evictions", "counter", lambda: RESPONSE_CACHE.evictions)
+Observed("dri_response_cache_bytes", "Bytes held by the response cache", "gauge", lambda: RESPONSE_CACHE._size)
@@ -1,16 +1,205 @@
 import json
+import logging
 import os
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+from api.index import ResourceIndex
+from api.store import ResourceStore, fingerprint, load_snapshot, snapshot_path
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
 
 # Resolve project root
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-ENRICHED_PATH = os.path.join(
+ENRICHED_PATH = os.getenv("ENRICHED_PATH") or os.path.join(
     BASE_DIR,
     "data",
     "enriched",
     "resources_enriched.json"
 )
 
-# Load enriched resources once at startup
-with open(ENRICHED_PATH, "r", encoding="utf-8") as f:
-    RESOURCES = json.load(f)
+# How often the watcher checks the data file for changes (0 disables)
+DATA_RELOAD_INTERVAL_SECONDS = float(os.getenv("DATA_RELOAD_INTERVAL_SECONDS", "10"))
+
+# Load the ETL's binary snapshot instead of parsing the JSON when it matches
+USE_DATA_SNAPSHOT = os.getenv("USE_DATA_SNAPSHOT", "1") != "0"
+
+
+def load_resources(path: str = ENRICHED_PATH) -> list:
+    """Raw enriched records as a list of dicts (ETL / seeding use)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_store(path: str, version: Optional[str] = None) -> Tuple[ResourceStore, str]:
+    """
+    The store and dataset version for an enriched JSON file.
+
+    The binary snapshot next to it is memory-mapped instead when it was
+    built from this exact file: no parsing at startup, and uvicorn workers
+    share its pages. A size/mtime match is trusted without hashing the
+    JSON. A missing, stale or unreadable snapshot falls back to the JSON.
+    """
+    snapshot = snapshot_path(path)
+    if USE_DATA_SNAPSHOT and os.path.exists(snapshot):
+        try:
+            store, source = load_snapshot(snapshot)
+            if source is not None:
+                st = os.stat(path)
+                if version is None and (st.st_size, st.st_mtime_ns) == (source["size"], source["mtime_ns"]):
+                    return store, source["version"]
+                version = version or fingerprint(path)
+                if version == source["version"]:
+                    return store, version
+            logger.info("Snapshot %s does not match %s; parsing the JSON", snapshot, path)
+        except (OSError, ValueError, KeyError):
+            logger.exception("Unreadable snapshot %s; parsing the JSON", snapshot)
+
+    return ResourceStore.load_json(path), version or fingerprint(path)
+
+
+class Dataset:
+    """
+    One loaded snapshot of the enriched catalog and everything derived
+    from it.
+
+    Derived values are memoized on the snapshot itself, so loading a new
+    dataset invalidates all of them at once.
+    """
+
+    def __init__(self, store: ResourceStore, version: str, path: Optional[str] = None):
+        self.store = store
+        self.version = version
+        # The enriched JSON it was loaded from, if any; derived files the
+        # ETL writes next to it are looked up from here
+        self.path = path
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+        self.index = ResourceIndex(store)
+        self._memo: Dict[Hashable, object] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, path: str = ENRICHED_PATH) -> "Dataset":
+        return cls(*load_store(path), path=path)
+
+    def memoize(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Return the value cached under `key`, building it on first use."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = build()
+            return self._memo[key]
+
+
+def _file_stat(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class DatasetHolder:
+    """
+    Owns the active Dataset and hot-swaps it when the data file changes.
+
+    A new snapshot is parsed, indexed and warmed entirely off the request
+    path, then published with a single reference assignment. Requests that
+    already hold the previous Dataset keep using it until they finish.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._stat = _file_stat(path)
+        self._dataset = Dataset.load(path)
+        self._warmers: List[Callable[[Dataset], None]] = []
+        self._reload_lock = threading.Lock()
+        self._failed_stat: Optional[Tuple[int, int]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def dataset(self) -> Dataset:
+        return self._dataset
+
+    def add_warmer(self, warm: Callable[[Dataset], None]) -> None:
+        """Register work to run on a new Dataset before it goes live."""
+        if warm not in self._warmers:
+            self._warmers.append(warm)
+
+    def reload_if_changed(self) -> bool:
+        """
+        Load and swap in the data file if it changed. Returns True when a
+        new dataset was published.
+        """
+
+        with self._reload_lock:
+            stat = _file_stat(self.path)
+            if stat == self._stat or stat == self._failed_stat:
+                return False
+
+            try:
+                version = fingerprint(self.path)
+                if version == self._dataset.version:
+                    self._stat = stat
+                    return False
+
+                dataset = Dataset(*load_store(self.path, version), path=self.path)
+                for warm in self._warmers:
+                    warm(dataset)
+            except Exception:
+                # Most likely a writer mid-way through the file; retried
+                # once the file changes again
+                logger.exception("Failed to reload dataset from %s", self.path)
+                self._failed_stat = stat
+                return False
+
+            if _file_stat(self.path) != stat:
+                # Changed while loading: pick up the final version next tick
+                return False
+
+            self._stat = stat
+            self._failed_stat = None
+            self._dataset = dataset
+
+        logger.info("Loaded dataset version %s (%d resources)", dataset.version, len(dataset.store))
+        return True
+
+    def start_watching(self, interval: float = DATA_RELOAD_INTERVAL_SECONDS) -> None:
+        if interval <= 0 or self._thread is not None:
+            return
+
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception:
+                    logger.exception("Dataset watcher error")
+
+        self._thread = threading.Thread(target=watch, name="dataset-watcher", daemon=True)
+        self._thread.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# Load enriched resources once at startup into a compact columnar store
+HOLDER = DatasetHolder(ENRICHED_PATH)
+
+
+def get_dataset() -> Dataset:
+    """
+    The active dataset. Callers should fetch it once per request and use
+    that snapshot throughout.
+    """
+    return HOLDER.dataset
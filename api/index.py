@@ -0,0 +1,191 @@
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from api.store import ResourceStore
+
+
+class Posting(NamedTuple):
+    """
+    Resource positions for one (skill_cluster, resource_type) key.
+
+    Positions are kept in demo order (-domain_weight, resource_id), and
+    `neg_weights` mirrors them so a minimum domain weight is a bisect.
+    """
+
+    positions: np.ndarray
+    neg_weights: np.ndarray
+
+
+EMPTY_POSTING = Posting(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+
+def _fold_case(categories: List[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    Map category codes onto lower-cased keys, merging categories that only
+    differ by case. Returns (keys, key_id per category code).
+    """
+
+    keys: Dict[str, int] = {}
+    key_of_code = [keys.setdefault(c.lower(), len(keys)) for c in categories]
+    return list(keys), np.array(key_of_code, dtype=np.int64)
+
+
+def _group(order: np.ndarray, group_ids: np.ndarray):
+    """
+    Split `order` into runs sharing a group id, keeping relative order.
+
+    Yields (group_id, positions).
+    """
+
+    if len(order) == 0:
+        return
+    perm = np.argsort(group_ids, kind="stable")
+    sorted_ids = group_ids[perm]
+    bounds = np.flatnonzero(np.diff(sorted_ids)) + 1
+    for chunk in np.split(perm, bounds):
+        yield int(group_ids[chunk[0]]), order[chunk]
+
+
+class ResourceIndex:
+    """
+    Inverted index over the resource store: skill_cluster -> resource_type
+    -> positions.
+
+    Built once when the dataset is loaded so request-time filtering costs
+    O(matches) instead of a scan over the whole catalog. Keys are stored
+    lower-cased; `None` as resource_type holds every type for the skill.
+
+    With `include_secondary`, a skill also matches records that have it as
+    a secondary cluster (store.skill_labels). Those postings are only kept
+    for keys where they add records to the primary posting.
+    """
+
+    def __init__(self, store: ResourceStore):
+        self._ids = store.resource_id
+        weights = store.domain_weight.astype(np.int64)
+        # Stable sort by weight over the (cached) id order: one integer
+        # sort instead of a string lexsort
+        by_id = store._id_order
+        demo_order = by_id[np.argsort(-weights[by_id], kind="stable")]
+
+        skills, skill_of_code = _fold_case(store.skill_cluster.categories)
+        types, type_of_code = _fold_case(store.resource_type.categories)
+
+        skill_ids = skill_of_code[store.skill_cluster.codes][demo_order]
+        type_ids = type_of_code[store.resource_type.codes][demo_order]
+
+        self._postings: Dict[Tuple[str, Optional[str]], Posting] = {}
+
+        for skill_id, positions in _group(demo_order, skill_ids):
+            self._add((skills[skill_id], None), positions, weights)
+
+        pair_ids = skill_ids * len(types) + type_ids
+        for pair_id, positions in _group(demo_order, pair_ids):
+            skill_id, type_id = divmod(pair_id, len(types))
+            self._add((skills[skill_id], types[type_id]), positions, weights)
+
+        # Secondary clusters: one (demo rank, label) entry per record and
+        # folded label, in demo order
+        labels, label_of_code = _fold_case(store.skill_labels.categories)
+        n_labels = max(len(labels), 1)
+        rows, codes = store.skill_labels.pairs()
+        rank = np.empty(len(demo_order), dtype=np.int64)
+        rank[demo_order] = np.arange(len(demo_order))
+        entries = np.sort(rank[rows] * n_labels + label_of_code[codes])
+        entries = entries[np.r_[True, entries[1:] != entries[:-1]]]
+        rows, label_ids = demo_order[entries // n_labels], entries % n_labels
+
+        self._related: Dict[Tuple[str, Optional[str]], Posting] = {}
+
+        for label_id, positions in _group(rows, label_ids):
+            self._add_related((labels[label_id], None), positions, weights)
+
+        pair_ids = label_ids * len(types) + type_of_code[store.resource_type.codes][rows]
+        for pair_id, positions in _group(rows, pair_ids):
+            label_id, type_id = divmod(pair_id, len(types))
+            self._add_related((labels[label_id], types[type_id]), positions, weights)
+
+    def _add(self, key, positions: np.ndarray, weights: np.ndarray) -> None:
+        self._postings[key] = Posting(positions, -weights[positions])
+
+    def _add_related(self, key, positions: np.ndarray, weights: np.ndarray) -> None:
+        # Labels include the primary cluster, so equal length means equal
+        if len(positions) != len(self.posting(*key).positions):
+            self._related[key] = Posting(positions, -weights[positions])
+
+    def posting(
+        self,
+        skill: str,
+        resource_type: Optional[str] = None,
+        include_secondary: bool = False,
+    ) -> Posting:
+        key = (skill, resource_type)
+        if include_secondary and key in self._related:
+            return self._related[key]
+        return self._postings.get(key, EMPTY_POSTING)
+
+    def items(self):
+        return self._postings.items()
+
+    def related_items(self):
+        """Postings that include secondary clusters, where they differ."""
+        return self._related.items()
+
+    def window(
+        self,
+        skill: str,
+        resource_type: Optional[str] = None,
+        minimum_domain_weight: Optional[int] = None,
+        include_secondary: bool = False,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Posting positions plus how many of them (a prefix) pass the weight
+        filter. Lets callers slice a page without copying every match.
+        """
+
+        posting = self.posting(skill, resource_type, include_secondary)
+
+        if minimum_domain_weight is None:
+            return posting.positions, len(posting.positions)
+
+        count = np.searchsorted(posting.neg_weights, -minimum_domain_weight, side="right")
+        return posting.positions, int(count)
+
+    def start_after(
+        self,
+        skill: str,
+        resource_type: Optional[str],
+        domain_weight: int,
+        resource_id: str,
+        include_secondary: bool = False,
+    ) -> int:
+        """
+        Index of the first posting entry ordered after (domain_weight,
+        resource_id) in demo order. Two bisects, no scan.
+        """
+
+        posting = self.posting(skill, resource_type, include_secondary)
+        lo = int(np.searchsorted(posting.neg_weights, -domain_weight, side="left"))
+        hi = int(np.searchsorted(posting.neg_weights, -domain_weight, side="right"))
+
+        ids, positions = self._ids, posting.positions
+        key = resource_id.encode("utf-8")
+        return lo + bisect_right(range(lo, hi), key, key=lambda i: ids[positions[i]])
+
+    def lookup(
+        self,
+        skill: str,
+        resource_type: Optional[str] = None,
+        minimum_domain_weight: Optional[int] = None,
+        include_secondary: bool = False,
+    ) -> np.ndarray:
+        """
+        Positions matching the (already normalized) filters, in demo order.
+        """
+
+        positions, count = self.window(
+            skill, resource_type, minimum_domain_weight, include_secondary
+        )
+        return positions[:count]
@@ -1,4 +1,6 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 
 from api.schemas import (
     SkillListResponse,
@@ -14,7 +16,16 @@ from api.service import (
     get_stats,
 )
 
-from api.routes import recommendations
+import api.ml.ranker as ranker
+from api.service.materialized import warm_rankings
+from api.service.search import warm_search
+from api.service.suggest import warm_suggest
+from api.service.similar import warm_similar
+from api.cache import RESPONSE_CACHE, dataset_json_response
+from api.data import HOLDER, get_dataset
+from api.metrics import CONTENT_TYPE, MetricsMiddleware, render as render_metrics
+
+from api.routes import recommendations, search, similar, suggest
 from fastapi.openapi.models import APIKey, APIKeyIn
 from fastapi.security import APIKeyHeader
 
@@ -34,6 +45,10 @@ tags_metadata = [
         "name": "Recommendations",
         "description": "Ranked developer resource recommendations (ML or deterministic)",
     },
+    {
+        "name": "Search",
+        "description": "Keyword search and as-you-type suggestions over resource names, categories, skills and domains",
+    },
     {
         "name": "Help",
         "description": "API usage guidance and examples",
@@ -41,48 +56,117 @@ tags_metadata = [
 ]
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model and materialize full-mode rankings before serving
+    # traffic; reloaded datasets are warmed before they are swapped in
+    ranker.preload_model()
+    HOLDER.add_warmer(warm_rankings)
+    HOLDER.add_warmer(warm_search)
+    HOLDER.add_warmer(warm_suggest)
+    HOLDER.add_warmer(warm_similar)
+    warm_rankings()
+    warm_search()
+    warm_suggest()
+    warm_similar()
+
+    HOLDER.start_watching()
+    ranker.start_watching(on_swap=warm_rankings)
+    yield
+    ranker.stop_watching()
+    HOLDER.stop_watching()
+
+
 app = FastAPI(
     title="Developer Resource Intelligence API",
     version="1.0.0",
     description="Deterministic + ML-powered recommendation system for developer learning resources",
     openapi_tags=tags_metadata,
+    lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
+
 
 # ===== Health =====
 
 @app.get("/v1/health", tags=["Health"])
 def health():
-    return {"status": "ok"}
+    dataset = get_dataset()
+    return {
+        "status": "ok",
+        "dataset": {
+            "version": dataset.version,
+            "resources": len(dataset.store),
+            "loaded_at": dataset.loaded_at,
+        },
+        "model": {
+            "available": ranker.model_available(),
+            "version": ranker.model_version(),
+        },
+    }
+
+
+@app.get(
+    "/v1/debug/cache",
+    tags=["Health"],
+    summary="Response cache statistics",
+    description="Hit/miss counters and memory use of the recommendation response cache",
+)
+def cache_stats():
+    return RESPONSE_CACHE.stats()
+
+
+@app.get(
+    "/v1/metrics",
+    tags=["Health"],
+    summary="Prometheus metrics",
+    description=(
+        "Request latency by route, per-stage latency of the recommendation "
+        "and search hot paths, candidate-set sizes, ranking modes, model "
+        "fallbacks and response cache counters, in the Prometheus text format"
+    ),
+)
+def metrics():
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
 
 
 # ===== Discovery =====
 
 @app.get("/v1/skills", response_model=SkillListResponse, tags=["Discovery"])
-def skills():
-    skills = get_available_skills()
-    return {
-        "total": len(skills),
-        "skills": skills,
-    }
+def skills(request: Request):
+    def build(dataset):
+        skills = get_available_skills(dataset)
+        return {
+            "total": len(skills),
+            "skills": skills,
+        }
+
+    return dataset_json_response(request, "skills", build, SkillListResponse)
 
 
 @app.get("/v1/resource-types", tags=["Discovery"])
-def resource_types():
-    resource_types = get_available_resource_types()
-    return {
-        "total": len(resource_types),
-        "resource_types": resource_types,
-    }
+def resource_types(request: Request):
+    def build(dataset):
+        resource_types = get_available_resource_types(dataset)
+        return {
+            "total": len(resource_types),
+            "resource_types": resource_types,
+        }
+
+    return dataset_json_response(request, "resource_types", build)
 
 
 @app.get("/v1/domains", response_model=DomainListResponse, tags=["Discovery"])
-def domains():
-    domains = get_available_domains()
-    return {
-        "total": len(domains),
-        "domains": domains,
-    }
+def domains(request: Request):
+    def build(dataset):
+        domains = get_available_domains(dataset)
+        return {
+            "total": len(domains),
+            "domains": domains,
+        }
+
+    return dataset_json_response(request, "domains", build, DomainListResponse)
 
 @app.get(
     "/v1/debug/availability",
@@ -90,9 +174,9 @@ def domains():
     summary="Available filter combinations",
     description="Shows which resource types exist for each skill cluster"
 )
-def availability():
+def availability(request: Request):
     from api.service import get_filter_availability
-    return get_filter_availability()
+    return dataset_json_response(request, "availability", get_filter_availability)
 
 
 @app.get(
@@ -102,8 +186,13 @@ def availability():
     summary="Dataset statistics",
     description="High-level statistics about skills and domains in the dataset",
 )
-def stats():
-    return get_stats()
+def stats(request: Request):
+    return dataset_json_response(
+        request,
+        "stats",
+        lambda dataset: get_stats(dataset=dataset),
+        StatsResponse,
+    )
 
 
 # ===== Help =====
@@ -136,6 +225,9 @@ def help():
             "basic": "/v1/recommendations?skill=backend",
             "filtered": "/v1/recommendations?skill=data&resource_type=tool&min_domain_weight=3",
             "paginated": "/v1/recommendations?skill=frontend&limit=5&offset=5",
+            "search": "/v1/search?q=react",
+            "suggest": "/v1/suggest?prefix=rea",
+            "similar": "/v1/resources/{resource_id}/similar",
         },
     }
 
@@ -143,3 +235,6 @@ def help():
 # ===== Routers =====
 
 app.include_router(recommendations.router)
+app.include_router(search.router)
+app.include_router(suggest.router)
+app.include_router(similar.router)
@@ -0,0 +1,271 @@
+import bisect
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# =========================================================
+# Config
+# =========================================================
+
+# Add a Server-Timing header with the stage timings of each response
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0") == "1"
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Upper bounds of the candidate-set size buckets
+SIZE_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# =========================================================
+# Metrics
+# =========================================================
+# A small in-process registry rendered in the Prometheus text format.
+# Each metric updates under its own lock; recording is a dict lookup and
+# a few additions, so it stays on in every request.
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def lines(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.lines()]
+
+
+class Counter(_Metric):
+    """Monotonic count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in values]
+
+
+class Histogram(_Metric):
+    """Bucketed observations per label combination, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float], labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # Per label combination: per-bucket (not cumulative) counts, the
+        # last one for values above every bound, and the sum
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        at = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][at] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            series = sorted((k, (list(counts), total)) for k, (counts, total) in self._series.items())
+
+        out = []
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = _labels(self.label_names, key, f'le="{_number(bound)}"')
+                out.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            le = _labels(self.label_names, key, 'le="+Inf"')
+            out.append(f"{self.name}_bucket{le} {cumulative}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            out.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return out
+
+
+class Observed(_Metric):
+    """A counter or gauge whose value is read from elsewhere when scraped."""
+
+    def __init__(self, name: str, help: str, kind: str, read: Callable[[], float]):
+        super().__init__(name, help)
+        self.kind = kind
+        self.read = read
+
+    def lines(self) -> List[str]:
+        return [f"{self.name} {_number(self.read())}"]
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    return "\n".join(line for metric in _registry for line in metric.render()) + "\n"
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "dri_http_request_duration_seconds",
+    "Time to the end of each response, by route template and status",
+    LATENCY_BUCKETS,
+    ("method", "route", "status"),
+)
+STAGE_SECONDS = Histogram(
+    "dri_stage_duration_seconds",
+    "Time spent in each hot-path stage",
+    LATENCY_BUCKETS,
+    ("stage",),
+)
+CANDIDATES = Histogram(
+    "dri_candidates",
+    "Resources matching a query's filters, before pagination",
+    SIZE_BUCKETS,
+    ("endpoint", "access_mode"),
+)
+RANKING_MODES = Counter(
+    "dri_ranking_mode_total",
+    "Computed recommendation responses by ranking mode",
+    ("ranking_mode",),
+)
+MODEL_FALLBACKS = Counter(
+    "dri_model_fallbacks_total",
+    "Model scoring failures answered by rule scoring instead",
+    ("scope",),
+)
+
+
+# =========================================================
+# Stage spans
+# =========================================================
+
+# (stage, seconds) spans of the current request, for Server-Timing. Sync
+# endpoints run in a copy of the request's context, which shares this list
+_request_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_spans", default=None)
+
+
+class span:
+    """
+    Time a block as one stage of the current request:
+
+        with span("rank"):
+            ...
+
+    Spans may nest; an outer span includes the time of inner ones.
+    """
+
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> "span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self.start
+        STAGE_SECONDS.observe(elapsed, self.stage)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((self.stage, elapsed))
+
+
+def server_timing(spans: List[Tuple[str, float]], total: float) -> bytes:
+    """Server-Timing header value: each stage, then the whole request as "app"."""
+    entries = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in spans]
+    entries.append(f"app;dur={total * 1000:.3f}")
+    return ", ".join(entries).encode("latin-1")
+
+
+# =========================================================
+# Middleware
+# =========================================================
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by route template (so ids in
+    paths do not create new series) and collecting the request's spans.
+    With SERVER_TIMING, responses carry them in a Server-Timing header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        spans: List[Tuple[str, float]] = []
+        token = _request_spans.set(spans)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    header = server_timing(spans, time.perf_counter() - start)
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header)]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_spans.reset(token)
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status),
+            )
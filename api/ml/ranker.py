@@ -1,19 +1,210 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+
 import joblib
+import numpy as np
 import pathlib
-from typing import Optional
+from typing import Callable, Optional, Sequence, Tuple
+
+from api.metrics import MODEL_FALLBACKS
+
+logger = logging.getLogger(__name__)
 
 # Resolve path relative to this file
 MODEL_PATH = pathlib.Path(__file__).parent / "linear_ranker.pkl"
 
+# How often the model file is checked for changes (0 disables)
+MODEL_RELOAD_INTERVAL_SECONDS = float(os.getenv("MODEL_RELOAD_INTERVAL_SECONDS", "10"))
+
+# =========================================================
+# Model registry
+# =========================================================
+#
+# `_model` is the live model; readers take it with a single reference read,
+# so a swap is atomic. `_loaded` pairs it with its version and the file stat
+# it was loaded from. Whether MODEL_PATH exists is cached per path so the
+# hot path never stats the file. A file that fails to load is remembered by
+# (path, stat) in `_failed`, and not retried until it changes.
+
 _model: Optional[object] = None
+_loaded: Optional[Tuple[object, str, Tuple[int, int]]] = None
+_exists: Optional[Tuple[pathlib.Path, bool]] = None
+_failed: Optional[Tuple[pathlib.Path, Optional[Tuple[int, int]]]] = None
+_lock = threading.Lock()
+_stop = threading.Event()
+_watcher: Optional[threading.Thread] = None
+
+
+def _file_stat(path: pathlib.Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_model(path: pathlib.Path) -> Tuple[object, str, Tuple[int, int]]:
+    """Unpickle a model file; returns (model, version, stat)."""
+    stat = _file_stat(path)
+    data = path.read_bytes()
+    version = hashlib.blake2b(data, digest_size=6).hexdigest()
+    return joblib.load(io.BytesIO(data)), version, stat
+
+
+def _try_read_model(path: pathlib.Path, stat: Optional[Tuple[int, int]]):
+    """_read_model(), or None if the file fails to load (logged and counted once per stat)."""
+    global _failed
+
+    if _failed == (path, stat):
+        return None
+    try:
+        return _read_model(path)
+    except Exception:
+        _failed = (path, stat)
+        MODEL_FALLBACKS.inc("load")
+        logger.exception("Failed to load ML model from %s; ranking by rule", path)
+        return None
 
 
 def _load_model():
-    global _model
-    if _model is None and MODEL_PATH.exists():
-        _model = joblib.load(MODEL_PATH)
-    return _model
+    global _model, _loaded
+
+    model = _model
+    if model is None and model_available():
+        with _lock:
+            # Only one concurrent first request pays for the unpickle
+            if _model is None:
+                model, version, stat = _read_model(MODEL_PATH)
+                _loaded = (model, version, stat)
+                _model = model
+            model = _model
+    return model
+
+
+def model_available() -> bool:
+    global _exists
+
+    path = MODEL_PATH
+    cached = _exists
+    if cached is None or cached[0] != path:
+        cached = _exists = (path, path.exists())
+    return cached[1]
+
+
+def current_model() -> Tuple[Optional[object], Optional[str]]:
+    """
+    The live model and its version, loaded on first use. (None, None) when
+    there is no model file or it cannot be loaded, so callers rank by rule
+    instead of failing.
+    """
+    global _model, _loaded
+
+    if not model_available():
+        return None, None
+    loaded = _loaded
+    if loaded is not None and loaded[0] is _model:
+        return loaded[0], loaded[1]
+
+    with _lock:
+        if _model is None:
+            read = _try_read_model(MODEL_PATH, _file_stat(MODEL_PATH))
+            if read is None:
+                return None, None
+            _loaded = read
+            _model = read[0]
+        return _model, _loaded[1]
+
+
+def model_version(model: Optional[object] = None) -> Optional[str]:
+    """Version (content hash) of `model`, or of the live model by default."""
+    model = model if model is not None else _model
+    loaded = _loaded
+    if model is None or loaded is None or loaded[0] is not model:
+        return None
+    return loaded[1]
+
+
+def preload_model() -> Optional[object]:
+    """Load the model eagerly (at startup) instead of on the first request."""
+    return current_model()[0]
+
+
+def reload_model_if_changed() -> bool:
+    """
+    Swap in MODEL_PATH if it was replaced, added or removed since it was
+    loaded. The new model is unpickled before the swap, so requests keep
+    using the old one until it is ready. Returns True on a swap.
+    """
+
+    global _model, _loaded, _exists
+
+    path = MODEL_PATH
+    stat = _file_stat(path)
+    _exists = (path, stat is not None)
 
+    loaded = _loaded
+    if loaded is not None and loaded[0] is _model and loaded[2] == stat:
+        return False
+    if stat is None and _model is None:
+        return False
+
+    if stat is None:
+        with _lock:
+            _model, _loaded = None, None
+        logger.info("ML model removed; falling back to rule scoring")
+        return True
+
+    read = _try_read_model(path, stat)
+    if read is None:
+        # Keep serving the current model (if any) until the file is fixed
+        return False
+    model, version, stat = read
+    with _lock:
+        _loaded = (model, version, stat)
+        _model = model
+    logger.info("Loaded ML model version %s", version)
+    return True
+
+
+def start_watching(
+    interval: float = MODEL_RELOAD_INTERVAL_SECONDS,
+    on_swap: Optional[Callable[[], None]] = None,
+) -> None:
+    """Poll MODEL_PATH in a background thread and hot-swap on change."""
+    global _watcher
+
+    if interval <= 0 or _watcher is not None:
+        return
+
+    _stop.clear()
+
+    def watch():
+        while not _stop.wait(interval):
+            try:
+                if reload_model_if_changed() and on_swap is not None:
+                    on_swap()
+            except Exception:
+                logger.exception("Model watcher error")
+
+    _watcher = threading.Thread(target=watch, name="model-watcher", daemon=True)
+    _watcher.start()
+
+
+def stop_watching() -> None:
+    global _watcher
+
+    _stop.set()
+    if _watcher is not None:
+        _watcher.join()
+        _watcher = None
+
+
+# =========================================================
+# Features / scoring
+# =========================================================
 
 def extract_features(resource):
     return [
@@ -24,12 +215,53 @@ def extract_features(resource):
     ]
 
 
-def predict_score(resource) -> float:
+def build_feature_matrix(resources: Sequence) -> np.ndarray:
+    """
+    Stack extract_features() for many resources into one (n, 4) matrix.
+    """
+    return np.array(
+        [extract_features(r) for r in resources],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+
+
+def feature_matrix(
+    domain_weight: np.ndarray,
+    is_github: np.ndarray,
+    is_tool: np.ndarray,
+    is_documentation: np.ndarray,
+) -> np.ndarray:
+    """
+    Columnar equivalent of build_feature_matrix() for array-backed data.
+    """
+    return np.column_stack(
+        [domain_weight, is_github, is_tool, is_documentation]
+    ).astype(np.float64)
+
+
+def predict_scores_batch(resources: Sequence = (), features: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Score a whole candidate set with a single model.predict() call.
+
+    Pass `features` to reuse a precomputed matrix instead of rebuilding it
+    from `resources`.
+    """
     model = _load_model()
     if model is None:
         raise RuntimeError("ML model not available")
-    return float(model.predict([extract_features(resource)])[0])
 
+    X = features if features is not None else build_feature_matrix(resources)
+    scores = np.asarray(model.predict(X), dtype=np.float64).ravel()
 
-def model_available() -> bool:
-    return MODEL_PATH.exists()
+    if scores.shape[0] != X.shape[0]:
+        raise RuntimeError(
+            f"ML model returned {scores.shape[0]} scores for {X.shape[0]} resources"
+        )
+    return scores
+
+
+def predict_score(resource) -> float:
+    model = _load_model()
+    if model is None:
+        raise RuntimeError("ML model not available")
+    return float(model.predict([extract_features(resource)])[0])
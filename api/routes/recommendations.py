@@ -1,10 +1,28 @@
-from typing import Optional
+import re
+import time
+import zlib
+from typing import Literal, Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, Query, Header
+from fastapi import APIRouter, HTTPException, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from api.schemas import RecommendationResponse
-from api.service import get_recommendations as service_get_recommendations
+from api.schemas import (
+    BatchRecommendationRequest,
+    BatchRecommendationResponse,
+    RecommendationResponse,
+)
+from api.service import (
+    get_recommendations as service_get_recommendations,
+    get_recommendations_batch as service_get_recommendations_batch,
+    recommendation_cache_key,
+)
+from api.service.export import RankedExport, csv_header, csv_lines, ndjson_lines
 from api.auth import verify_api_key_optional
+from api.cache import RESPONSE_CACHE, encode_json
+from api.data import get_dataset
+from api.metrics import span
 
 router = APIRouter(prefix="/v1")
 
@@ -28,6 +46,20 @@ Note: Skill and Resource_type values are case-insensitive (e.g. `data`, `Data`,
 
 ---
 
+### Secondary clusters
+Each resource has one primary skill cluster and may match others. Set
+`include_secondary=true` to also return resources where `skill` is a
+secondary cluster.
+
+---
+
+### Pagination
+Page with `offset`, or pass the `next_cursor` from the previous response as
+`cursor` to fetch the next page. Cursors stay cheap for deep pages but expire
+when the dataset or ranking model changes (400; restart from the first page).
+
+---
+
 ### Access Modes
 
 🔓 **Demo mode** (no API key)
@@ -60,6 +92,10 @@ def get_recommendations(
         ge=0,
         description="Number of results to skip (pagination offset)",
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous response's next_cursor",
+    ),
     resource_type: Optional[str] = Query(
         None,
         description="Optional filter to include only a specific resource type (e.g. course, article)",
@@ -69,18 +105,225 @@ def get_recommendations(
         ge=0,
         description="Optional minimum domain relevance score required for results",
     ),
+    include_secondary: bool = Query(
+        False,
+        description="Also match resources that have the skill as a secondary cluster",
+    ),
     x_api_key: Optional[str] = Header(
         default=None,
         description="Optional API key. Required for full access mode",
     ),
 ):
     access_mode = verify_api_key_optional(x_api_key)
+    dataset = get_dataset()
 
-    return service_get_recommendations(
+    query = dict(
         skill=skill,
         limit=limit,
         offset=offset,
         resource_type=resource_type,
         minimum_domain_weight=minimum_domain_weight,
         access_mode=access_mode,
+        dataset=dataset,
+        cursor=cursor,
+        include_secondary=include_secondary,
+    )
+
+    # Hot queries are served from already-serialized bytes
+    key = recommendation_cache_key(**query)
+    body = RESPONSE_CACHE.get(key)
+    cache_status = "HIT"
+
+    if body is None:
+        cache_status = "MISS"
+        result = service_get_recommendations(**query)
+        with span("serialize"):
+            body = encode_json(
+                RecommendationResponse.model_validate(result).model_dump(mode="json")
+            )
+        RESPONSE_CACHE.put(key, body)
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"X-Cache": cache_status},
+    )
+
+
+@router.post(
+    "/recommendations/batch",
+    response_model=BatchRecommendationResponse,
+    tags=["Recommendations"],
+    summary="Get recommendations for several queries at once",
+    description="""
+Answer up to 50 recommendation queries in one request. Each query takes the
+same fields as the `/v1/recommendations` query parameters.
+
+Results come back in request order, each with its own `status`, timing
+(`elapsed_ms`) and either a `response` or an `error`. One failing query
+(e.g. an expired cursor) does not fail the batch.
+
+All queries are answered from the same dataset snapshot and access mode.
+""",
+)
+def get_recommendations_batch(
+    request: BatchRecommendationRequest,
+    x_api_key: Optional[str] = Header(
+        default=None,
+        description="Optional API key. Required for full access mode",
+    ),
+):
+    start = time.perf_counter()
+    access_mode = verify_api_key_optional(x_api_key)
+
+    items = service_get_recommendations_batch(
+        [query.model_dump() for query in request.queries],
+        access_mode=access_mode,
+        dataset=get_dataset(),
+    )
+
+    result = {
+        "count": len(items),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        "results": items,
+    }
+    body = encode_json(
+        BatchRecommendationResponse.model_validate(result).model_dump(mode="json")
+    )
+    return Response(content=body, media_type="application/json")
+
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether Accept-Encoding allows gzip with a non-zero q-value (RFC 9110)."""
+    qualities = {}
+    for part in (accept_encoding or "").split(","):
+        coding, *params = part.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.strip().lower()] = q
+
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def _content_disposition(skill: str, format: str) -> str:
+    """
+    Attachment header naming the file after the skill: an ASCII-only
+    `filename` plus the exact name as RFC 5987 `filename*`.
+    """
+    name = skill.strip().lower()
+    fallback = re.sub(r"[^a-z0-9_-]+", "_", name).strip("_") or "export"
+    encoded = quote(f"{name}.{format}", safe="")
+    return f"attachment; filename=\"{fallback}.{format}\"; filename*=UTF-8''{encoded}"
+
+
+@router.get(
+    "/recommendations/export",
+    tags=["Recommendations"],
+    summary="Stream the full ranked catalog for a filter",
+    description="""
+Stream **every** ranked resource matching the filters, best first, as
+NDJSON (one JSON object per line) or CSV. Full mode only.
+
+Rows are produced in fixed-size chunks, so memory use does not grow with
+the result set. Send `Accept-Encoding: gzip` for a gzip-compressed stream.
+The stream stops early if the client disconnects.
+""",
+    response_class=StreamingResponse,
+)
+async def export_recommendations(
+    request: Request,
+    skill: str = Query(
+        ...,
+        description="Skill cluster to export (e.g. 'data', 'backend')",
+    ),
+    resource_type: Optional[str] = Query(
+        None,
+        description="Optional filter to include only a specific resource type",
+    ),
+    minimum_domain_weight: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Optional minimum domain relevance score required for results",
+    ),
+    include_secondary: bool = Query(
+        False,
+        description="Also export resources that have the skill as a secondary cluster",
+    ),
+    format: Literal["ndjson", "csv"] = Query(
+        "ndjson",
+        description="Output format",
+    ),
+    x_api_key: Optional[str] = Header(
+        default=None,
+        description="API key. Export requires full access mode",
+    ),
+    accept_encoding: Optional[str] = Header(default=None),
+):
+    if verify_api_key_optional(x_api_key) != "full":
+        raise HTTPException(status_code=401, detail="Export requires a valid API key")
+
+    # May build the ranking table; keep it off the event loop
+    export = await run_in_threadpool(
+        RankedExport,
+        skill,
+        resource_type,
+        minimum_domain_weight,
+        get_dataset(),
+        include_secondary=include_secondary,
+    )
+    encode = csv_lines if format == "csv" else ndjson_lines
+    compress = _accepts_gzip(accept_encoding)
+
+    async def stream():
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        chunks = export.chunks()
+
+        def next_block():
+            records = next(chunks, None)
+            return None if records is None else encode(records)
+
+        block = csv_header() if format == "csv" else b""
+        while block is not None:
+            if compressor is not None:
+                block = compressor.compress(block)
+            if block:
+                yield block
+
+            if await request.is_disconnected():
+                return
+            block = await run_in_threadpool(next_block)
+
+        if compressor is not None:
+            yield compressor.flush()
+
+    headers = {
+        "Content-Disposition": _content_disposition(skill, format),
+        "X-Dataset-Version": export.dataset.version,
+        "X-Ranking-Mode": export.ranking_mode,
+        "Vary": "Accept-Encoding",
+    }
+    if export.model_version:
+        headers["X-Model-Version"] = export.model_version
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers,
     )
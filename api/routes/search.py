@@ -0,0 +1,68 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query, Response
+
+from api.schemas import SearchResponse
+from api.service.search import search_resources
+from api.auth import verify_api_key_optional
+from api.cache import encode_json
+from api.data import get_dataset
+
+router = APIRouter(prefix="/v1")
+
+
+@router.get(
+    "/search",
+    response_model=SearchResponse,
+    tags=["Search"],
+    summary="Keyword search over resources",
+    description="""
+Full-text search over resource names, categories and domains, ranked by
+BM25.
+
+### Typeahead
+Set `prefix=true` to treat the last word of `q` as a prefix
+(`q=java` with `prefix=true` matches "JavaScript").
+
+### Matching
+By default every word of `q` must match. Set `match_all=false` to return
+resources matching any word.
+
+### Blending
+- `domain_weight_boost` adds `boost × log(1 + domain_weight)` to each score.
+- `rank_boost` (full mode only) adds `boost × the recommendation score`,
+  scaled to [0, 1].
+
+Demo mode returns at most 8 results; full mode at most 100.
+""",
+)
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search words"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of results to return"),
+    offset: int = Query(0, ge=0, le=10_000, description="Number of results to skip"),
+    prefix: bool = Query(False, description="Treat the last word as a prefix (typeahead)"),
+    match_all: bool = Query(True, description="Require every word to match"),
+    skill: Optional[str] = Query(None, description="Only resources in this skill cluster"),
+    resource_type: Optional[str] = Query(None, description="Only resources of this type"),
+    domain_weight_boost: float = Query(0.0, ge=0, le=100, description="Weight of domain_weight in the score"),
+    rank_boost: float = Query(0.0, ge=0, le=100, description="Weight of the recommendation score (full mode)"),
+    x_api_key: Optional[str] = Header(
+        default=None,
+        description="Optional API key. Required for full access mode",
+    ),
+):
+    result = search_resources(
+        q,
+        limit=limit,
+        offset=offset,
+        prefix=prefix,
+        match_all=match_all,
+        skill=skill,
+        resource_type=resource_type,
+        domain_weight_boost=domain_weight_boost,
+        rank_boost=rank_boost,
+        access_mode=verify_api_key_optional(x_api_key),
+        dataset=get_dataset(),
+    )
+    body = encode_json(SearchResponse.model_validate(result).model_dump(mode="json"))
+    return Response(content=body, media_type="application/json")
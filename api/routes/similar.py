@@ -0,0 +1,46 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, Path, Query, Response
+
+from api.schemas import SimilarResponse
+from api.service.similar import similar_resources
+from api.auth import verify_api_key_optional
+from api.cache import encode_json
+from api.data import get_dataset
+
+router = APIRouter(prefix="/v1")
+
+
+@router.get(
+    "/resources/{resource_id}/similar",
+    response_model=SimilarResponse,
+    tags=["Recommendations"],
+    summary="Resources similar to a resource",
+    description="""
+"More like this": the resources most similar to `resource_id`, by cosine
+similarity of embeddings built from name, category and domain. Each
+result's `score` is that similarity.
+
+Neighbours come from an approximate (IVF) index, so very rarely a close
+match may be missed.
+
+Demo mode returns at most 8 results; full mode at most 100. Unknown ids
+return 404.
+""",
+)
+def similar(
+    resource_id: str = Path(..., max_length=64, description="Resource to find neighbours of"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of results to return"),
+    x_api_key: Optional[str] = Header(
+        default=None,
+        description="Optional API key. Required for full access mode",
+    ),
+):
+    result = similar_resources(
+        resource_id,
+        limit=limit,
+        access_mode=verify_api_key_optional(x_api_key),
+        dataset=get_dataset(),
+    )
+    body = encode_json(SimilarResponse.model_validate(result).model_dump(mode="json"))
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,45 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query, Response
+
+from api.schemas import SuggestResponse
+from api.service.suggest import suggest
+from api.cache import encode_json
+from api.data import get_dataset
+
+router = APIRouter(prefix="/v1")
+
+
+@router.get(
+    "/suggest",
+    response_model=SuggestResponse,
+    tags=["Search"],
+    summary="As-you-type suggestions",
+    description="""
+Skills, categories, domains and resource names with a word starting with
+`prefix` (`prefix=dat` suggests "data" and "Big Data Handbook").
+
+Each kind returns up to `limit` suggestions, heaviest first: a resource
+name weighs its `domain_weight`, and a skill, category or domain the
+summed `domain_weight` of its resources. Name suggestions carry their
+`resource_id`.
+
+Use `kinds` to ask for some kinds only, e.g. `kinds=skill,category`.
+""",
+)
+def suggest_route(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    kinds: Optional[str] = Query(
+        None,
+        description="Comma-separated kinds to suggest: skill, category, domain, name (default: all)",
+    ),
+    limit: int = Query(5, ge=1, le=10, description="Maximum suggestions per kind"),
+):
+    result = suggest(
+        prefix,
+        kinds=kinds.split(",") if kinds else None,
+        limit=limit,
+        dataset=get_dataset(),
+    )
+    body = encode_json(SuggestResponse.model_validate(result).model_dump(mode="json"))
+    return Response(content=body, media_type="application/json")
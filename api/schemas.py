@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 
@@ -54,8 +54,12 @@ class RecommendationResponse(BaseModel):
     skill_cluster: str
     count: int
     ranking_mode: Optional[str] = None
+    # Version of the ML model that produced the scores (full mode, ML only)
+    model_version: Optional[str] = None
     # Backwards-compatible alias
     total_results: Optional[int] = None
+    # Opaque token for the next page; null on the last page
+    next_cursor: Optional[str] = None
     results: List[Resource]
 
     class Config:
@@ -79,3 +83,67 @@ class RecommendationResponse(BaseModel):
                 ]
             }
         }
+
+
+class SearchResponse(BaseModel):
+    query: str
+    count: int
+    total_results: int
+    # "bm25", or "bm25+ml"/"bm25+rule" when the rank score is blended in
+    ranking_mode: str
+    # Each result's score is its search relevance
+    results: List[Resource]
+
+
+class SimilarResponse(BaseModel):
+    resource_id: str
+    count: int
+    # Each result's score is its cosine similarity to the resource
+    results: List[Resource]
+
+
+class SuggestionItem(BaseModel):
+    # "skill", "category", "domain" or "name"
+    kind: str
+    text: str
+    weight: int
+    # Name suggestions only
+    resource_id: Optional[str] = None
+
+
+class SuggestResponse(BaseModel):
+    prefix: str
+    count: int
+    suggestions: List[SuggestionItem]
+
+
+# Batch requests are answered in one pass; keep them bounded
+MAX_BATCH_QUERIES = 50
+
+
+class RecommendationQuery(BaseModel):
+    skill: str
+    limit: int = Field(5, ge=1, le=100)
+    offset: int = Field(0, ge=0)
+    resource_type: Optional[str] = None
+    minimum_domain_weight: Optional[int] = Field(None, ge=0)
+    cursor: Optional[str] = None
+    include_secondary: bool = False
+
+
+class BatchRecommendationRequest(BaseModel):
+    queries: List[RecommendationQuery] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+
+
+class BatchRecommendationItem(BaseModel):
+    # HTTP status this query would have returned on its own
+    status: int
+    elapsed_ms: float
+    response: Optional[RecommendationResponse] = None
+    error: Optional[str] = None
+
+
+class BatchRecommendationResponse(BaseModel):
+    count: int
+    elapsed_ms: float
+    results: List[BatchRecommendationItem]
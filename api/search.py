@@ -0,0 +1,364 @@
+import re
+import threading
+from bisect import bisect_left
+from itertools import chain
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from api.store import ResourceStore, StringTable
+
+# Word tokens, lower-cased: "React-Native 2" -> ["react", "native", "2"]
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Most index terms a prefix expands to (the most frequent ones win)
+MAX_PREFIX_TERMS = 32
+
+# Incremental builds keep the previous vocabulary, so terms of removed or
+# renamed records linger; term ids are renumbered once more than this
+# fraction of them no longer occurs in any record
+COMPACT_DEAD_FRACTION = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def domain_tokens(domain: str) -> List[str]:
+    """
+    Domain labels minus the TLD and "www": "docs.github.com" -> ["docs",
+    "github"]. A TLD would otherwise be a term in almost every document.
+    """
+    labels = domain.lower().split(".")
+    if len(labels) > 1:
+        labels = labels[:-1]
+    return [t for label in labels if label != "www" for t in tokenize(label)]
+
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenated aranges: start, start+1, ..., start+length-1 for each pair."""
+    total = int(lengths.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(lengths)
+    return np.repeat(starts - (ends - lengths), lengths) + np.arange(total)
+
+
+def _same_strings(a: StringTable, i: np.ndarray, b: StringTable, j: np.ndarray) -> np.ndarray:
+    """Whether a[i[k]] == b[j[k]], for every k, without decoding."""
+    a_len = a.offsets[i + 1] - a.offsets[i]
+    same = a_len == b.offsets[j + 1] - b.offsets[j]
+    i, j, lengths = i[same], j[same], a_len[same]
+
+    nonempty = lengths > 0
+    i, j, lengths = i[nonempty], j[nonempty], lengths[nonempty]
+    equal = np.ones(len(nonempty), dtype=bool)
+    if len(lengths):
+        differs = a.buffer[_ranges(a.offsets[i], lengths)] != b.buffer[_ranges(b.offsets[j], lengths)]
+        equal[nonempty] = np.add.reduceat(differs, np.cumsum(lengths) - lengths) == 0
+
+    same[np.flatnonzero(same)] = equal
+    return same
+
+
+class _Terms:
+    """Vocabulary: term -> id, plus the terms in sorted order for prefixes."""
+
+    def __init__(self, ids: Optional[Dict[str, int]] = None):
+        self.ids: Dict[str, int] = dict(ids or {})
+
+    def id(self, term: str) -> int:
+        return self.ids.setdefault(term, len(self.ids))
+
+    def freeze(self) -> None:
+        self.sorted = sorted(self.ids)
+        self.sorted_ids = np.array([self.ids[t] for t in self.sorted], dtype=np.int64)
+
+    def with_prefix(self, prefix: str) -> np.ndarray:
+        lo = bisect_left(self.sorted, prefix)
+        hi = bisect_left(self.sorted, prefix + "\U0010ffff", lo)
+        return self.sorted_ids[lo:hi]
+
+
+class SearchHit(NamedTuple):
+    position: int
+    score: float
+
+
+class SearchIndex:
+    """
+    BM25 inverted index over resource_name, category and domain.
+
+    Postings are CSR arrays (term -> store positions, with term
+    frequencies), so a query touches only the postings of its terms. The
+    last query token can be a prefix for typeahead; it expands to the most
+    frequent index terms that start with it.
+
+    Passing the previous dataset's index makes the build incremental:
+    records whose id and name are unchanged reuse their tokenized names,
+    and categories/domains are tokenized once per distinct value. The
+    vocabulary carries over too, and is compacted when mostly dead.
+    """
+
+    def __init__(self, store: ResourceStore, previous: Optional["SearchIndex"] = None):
+        self.store = store
+        self.terms = _Terms(previous.terms.ids if previous is not None else None)
+        # Term ids per category/domain value of this store only, so values
+        # that disappear are dropped on the next build
+        self._value_terms: Dict[str, List[int]] = {}
+        known = previous._value_terms if previous is not None else {}
+        n = len(store)
+
+        self.name_terms, self.name_offsets, self.reused = self._name_terms(previous)
+        name_rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.name_offsets))
+
+        # Categories and domains: tokens per distinct value, mapped to records
+        rows, term_ids = [name_rows], [self.name_terms]
+        for column, split in ((store.category, tokenize), (store.domain, domain_tokens)):
+            code_terms, code_offsets = self._value_csr(column.categories, split, known)
+            lengths = np.diff(code_offsets)[column.codes]
+            rows.append(np.repeat(np.arange(n, dtype=np.int64), lengths))
+            term_ids.append(code_terms[_ranges(code_offsets[column.codes], lengths)])
+
+        self._build_postings(np.concatenate(rows), np.concatenate(term_ids), n)
+        if len(self.df) and (self.df == 0).mean() > COMPACT_DEAD_FRACTION:
+            self._compact()
+        self.terms.freeze()
+
+        # Zeroed record -> slot maps for multi-term queries, reused across
+        # queries (each query clears the entries it set)
+        self._free: List[np.ndarray] = []
+        self._free_lock = threading.Lock()
+
+    # -----------------------------------------------------
+    # Build
+    # -----------------------------------------------------
+
+    def _name_terms(self, previous: Optional["SearchIndex"]) -> Tuple[np.ndarray, np.ndarray, int]:
+        store = self.store
+        n = len(store)
+        old = np.full(n, -1, dtype=np.int64)
+
+        if previous is not None and n and len(previous.store):
+            prev = previous.store
+            order = prev._id_order
+            i = np.minimum(np.searchsorted(prev.resource_id, store.resource_id, sorter=order), len(order) - 1)
+            matched = np.flatnonzero(prev.resource_id[order[i]] == store.resource_id)
+            candidates = order[i[matched]]
+            same = _same_strings(store.resource_name, matched, prev.resource_name, candidates)
+            old[matched[same]] = candidates[same]
+
+        reused = old >= 0
+        lengths = np.zeros(n, dtype=np.int64)
+        if reused.any():
+            lengths[reused] = np.diff(previous.name_offsets)[old[reused]]
+
+        fresh_positions = np.flatnonzero(~reused)
+        if len(fresh_positions) == n:
+            names = list(store.resource_name)
+        else:
+            names = [store.resource_name[pos] for pos in fresh_positions.tolist()]
+        tokens = list(map(tokenize, names))
+        lengths[fresh_positions] = list(map(len, tokens))
+        ids = self.terms.ids
+        fresh = [ids.setdefault(t, len(ids)) for t in chain.from_iterable(tokens)]
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        terms = np.empty(int(offsets[-1]), dtype=np.int64)
+
+        if reused.any():
+            at = np.flatnonzero(reused)
+            terms[_ranges(offsets[at], lengths[at])] = previous.name_terms[
+                _ranges(previous.name_offsets[old[at]], lengths[at])
+            ]
+        terms[_ranges(offsets[fresh_positions], lengths[fresh_positions])] = fresh
+        return terms, offsets, int(reused.sum())
+
+    def _value_csr(self, values: List[str], split, known: Dict[str, List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        lists = []
+        for value in values:
+            # Keyed per tokenizer: a category and a domain may share a string
+            key = f"{split.__name__}\0{value}"
+            if key not in self._value_terms:
+                ids = known.get(key)
+                self._value_terms[key] = ids if ids is not None else [self.terms.id(t) for t in split(value)]
+            lists.append(self._value_terms[key])
+
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in lists], out=offsets[1:])
+        terms = np.fromiter((t for ts in lists for t in ts), dtype=np.int64, count=int(offsets[-1]))
+        return terms, offsets
+
+    def _build_postings(self, rows: np.ndarray, term_ids: np.ndarray, n: int) -> None:
+        n_terms = len(self.terms.ids)
+        doc_len = np.bincount(rows, minlength=n).astype(np.float32)
+        self.avg_doc_len = float(doc_len.mean()) if n else 0.0
+
+        # One entry per (term, record) with its frequency, sorted by term
+        keys = np.sort(term_ids * max(n, 1) + rows)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        tf = np.diff(np.r_[starts, len(keys)]).astype(np.float32)
+        keys = keys[starts]
+        terms, docs = np.divmod(keys, max(n, 1))
+
+        df = np.bincount(terms, minlength=n_terms)
+        self.offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df, out=self.offsets[1:])
+        self.df = df
+        self.docs = docs.astype(np.int32 if n < 2**31 else np.int64)
+
+        # Per-posting BM25 term weight: fixed per dataset, so the query
+        # just sums them
+        idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[docs] / max(self.avg_doc_len, 1e-9))
+        self.weights = idf[terms] * tf * (BM25_K1 + 1) / (tf + norm)
+
+    def _compact(self) -> None:
+        """Drop terms no record has any more and renumber the rest densely."""
+        live = np.flatnonzero(self.df > 0)
+        remap = np.full(len(self.df), -1, dtype=np.int64)
+        remap[live] = np.arange(len(live))
+
+        self.terms = _Terms({t: int(remap[i]) for t, i in self.terms.ids.items() if remap[i] >= 0})
+        self.name_terms = remap[self.name_terms]
+        # A category/domain value may be listed but unused; it is re-split
+        # on the next build that needs it
+        self._value_terms = {
+            key: [int(remap[t]) for t in ids]
+            for key, ids in self._value_terms.items()
+            if all(remap[t] >= 0 for t in ids)
+        }
+        # Postings are grouped by term and dead terms have none, so only
+        # the per-term arrays change
+        self.df = self.df[live]
+        self.offsets = np.zeros(len(live) + 1, dtype=np.int64)
+        np.cumsum(self.df, out=self.offsets[1:])
+
+    # -----------------------------------------------------
+    # Query
+    # -----------------------------------------------------
+
+    def query_terms(self, text: str, prefix: bool = False) -> List[np.ndarray]:
+        """Term ids per query token; a trailing prefix token may expand to several."""
+        tokens = tokenize(text)
+        groups = []
+        for i, token in enumerate(tokens):
+            if prefix and i == len(tokens) - 1:
+                ids = self.terms.with_prefix(token)
+                if len(ids) > MAX_PREFIX_TERMS:
+                    ids = ids[np.argsort(-self.df[ids], kind="stable")[:MAX_PREFIX_TERMS]]
+            else:
+                term_id = self.terms.ids.get(token)
+                ids = np.array([] if term_id is None else [term_id], dtype=np.int64)
+            groups.append(ids[self.df[ids] > 0] if len(ids) else ids)
+        return groups
+
+    def _posting(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.docs[start:end], self.weights[start:end]
+
+    def _acquire(self) -> np.ndarray:
+        with self._free_lock:
+            if self._free:
+                return self._free.pop()
+        return np.zeros(len(self.store), dtype=np.int64)
+
+    def _release(self, slots: np.ndarray) -> None:
+        with self._free_lock:
+            self._free.append(slots)
+
+    def _union(self, term_ids: List[int], slots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Records in any of the postings, with summed weights."""
+        if len(term_ids) == 1:
+            docs, weights = self._posting(term_ids[0])
+            return docs.astype(np.int64), weights.astype(np.float64)
+
+        postings = [self._posting(t) for t in term_ids]
+        scores = np.zeros(sum(len(docs) for docs, _ in postings), dtype=np.float64)
+        parts, count = [], 0
+        for docs, weights in postings:
+            new = docs[slots[docs] == 0]
+            slots[new] = np.arange(count + 1, count + 1 + len(new))
+            count += len(new)
+            parts.append(new)
+            scores[slots[docs] - 1] += weights
+
+        candidates = np.concatenate(parts).astype(np.int64)
+        slots[candidates] = 0
+        return candidates, scores[:count]
+
+    def _intersect(
+        self,
+        candidates: np.ndarray,
+        scores: np.ndarray,
+        term_ids: List[int],
+        slots: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidates also in any of the postings, with their weights added."""
+        added = np.zeros(len(candidates), dtype=np.float64)
+        hit = np.zeros(len(candidates), dtype=bool)
+        postings = [self._posting(t) for t in term_ids]
+
+        if len(candidates) * 32 < sum(len(docs) for docs, _ in postings):
+            # Few candidates: binary-search them in each (sorted) posting
+            for docs, weights in postings:
+                at = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                found = docs[at] == candidates
+                added[found] += weights[at[found]]
+                hit |= found
+        else:
+            # Many candidates: look each posting entry up in a dense slot map
+            slots[candidates] = np.arange(1, len(candidates) + 1)
+            for docs, weights in postings:
+                at = slots[docs]
+                found = at > 0
+                at = at[found] - 1
+                added[at] += weights[found]
+                hit[at] = True
+            slots[candidates] = 0
+
+        return candidates[hit], scores[hit] + added[hit]
+
+    def match(self, text: str, prefix: bool = False, match_all: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (positions, BM25 scores) of the records matching `text`, unordered.
+
+        With `match_all` every query token must match (any expansion of a
+        prefix token counts); otherwise any token does.
+        """
+        groups = [g.tolist() for g in self.query_terms(text, prefix)]
+        empty = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        if match_all and any(not g for g in groups):
+            return empty
+        if not match_all:
+            groups = [sorted({t for g in groups for t in g})]
+        if not groups or not groups[0]:
+            return empty
+
+        slots = self._acquire()
+        try:
+            # Rarest token first, so every later step works on fewer candidates
+            groups.sort(key=lambda g: int(self.df[g].sum()))
+            candidates, scores = self._union(groups[0], slots)
+            for group in groups[1:]:
+                if not len(candidates):
+                    break
+                candidates, scores = self._intersect(candidates, scores, group, slots)
+            return candidates, scores
+        finally:
+            self._release(slots)
+
+
+def top_hits(positions: np.ndarray, scores: np.ndarray, k: int) -> List[SearchHit]:
+    """Best `k` by (-score, position), best first."""
+    if 0 < k < len(positions):
+        kth = np.partition(-scores, k - 1)[k - 1]
+        keep = -scores <= kth
+        positions, scores = positions[keep], scores[keep]
+    order = np.lexsort((positions, -scores))[:k]
+    return [SearchHit(p, s) for p, s in zip(positions[order].tolist(), scores[order].tolist())]
@@ -5,4 +5,6 @@ from .service import (
     get_available_domains,
     get_stats,
     get_recommendations,
+    get_recommendations_batch,
+    recommendation_cache_key,
 )
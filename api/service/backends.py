@@ -0,0 +1,209 @@
+import os
+import threading
+from typing import Dict, Hashable, List, NamedTuple, Optional
+
+from fastapi import HTTPException
+
+from api.data import Dataset
+from api.metrics import span
+from api.service.cursor import DEMO_RANKING, Cursor, check_cursor
+from api.service.materialized import get_ranking_table
+
+
+# Which storage answers recommendation queries: "memory" or "sqlite"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory").lower()
+
+
+class Page(NamedTuple):
+    """
+    One page of recommendations from a storage backend.
+
+    `version` and `ranking` identify the ordering the page came from and
+    are what cursors are bound to.
+    """
+
+    records: List[Dict]
+    total: int
+    has_more: bool
+    ranking_mode: Optional[str]
+    model_version: Optional[str]
+    version: str
+    ranking: str
+
+
+class StorageBackend:
+    """
+    Source of filtered, ranked and paginated recommendation pages.
+
+    Queries arrive normalized: lower-cased skill and resource_type and an
+    effective limit. Full mode orders by (-score, catalog position), demo
+    mode by (-domain_weight, resource_id). With `include_secondary` the
+    skill also matches records that have it as a secondary cluster.
+    """
+
+    name = "base"
+
+    def cache_token(self, access_mode: str, dataset: Dataset) -> Hashable:
+        """Changes whenever the pages this backend serves may change."""
+        raise NotImplementedError
+
+    def page(
+        self,
+        dataset: Dataset,
+        access_mode: str,
+        skill: str,
+        resource_type: Optional[str],
+        minimum_domain_weight: Optional[int],
+        limit: int,
+        offset: int,
+        after: Optional[Cursor],
+        query: str,
+        include_secondary: bool = False,
+    ) -> Page:
+        raise NotImplementedError
+
+
+# =========================================================
+# In-memory backend
+# =========================================================
+
+class MemoryBackend(StorageBackend):
+    """
+    Serves pages from the loaded Dataset: index postings for demo order and
+    the materialized ranking table for full mode.
+    """
+
+    name = "memory"
+
+    def cache_token(self, access_mode: str, dataset: Dataset) -> Hashable:
+        rankings = None if access_mode == "demo" else get_ranking_table(dataset).generation
+        return dataset.version, rankings
+
+    def page(
+        self,
+        dataset,
+        access_mode,
+        skill,
+        resource_type,
+        minimum_domain_weight,
+        limit,
+        offset,
+        after,
+        query,
+        include_secondary=False,
+    ):
+        ds = dataset
+        with span("filter"):
+            positions, total = ds.index.window(
+                skill, resource_type, minimum_domain_weight, include_secondary
+            )
+
+        if not total:
+            return Page([], 0, False, None, None, ds.version, "")
+
+        with span("rank"):
+            if access_mode == "full":
+                table = get_ranking_table(ds)
+                ranking_mode = table.ranking_mode
+                model_version = table.model_version if ranking_mode == "ml" else None
+                ranking = model_version or ranking_mode
+
+                start_pos = None
+                if after is not None:
+                    check_cursor(after, ds.version, ranking, query)
+                    start_pos = _cursor_position(ds, after)
+
+                if minimum_domain_weight is None:
+                    # Precomputed ordering: a page is a slice
+                    ranked = table.ranked(skill, resource_type, include_secondary)
+                    start = offset if after is None else ranked.start_after(after.key, start_pos)
+                    end = min(start + limit, total)
+                    window = list(zip(
+                        ranked.scores[start:end].tolist(),
+                        ranked.positions[start:end].tolist(),
+                    ))
+                else:
+                    # Weight-filtered candidates have no precomputed ordering
+                    candidates = positions[:total]
+                    start = offset
+                    if after is not None:
+                        candidates = table.after(candidates, after.key, start_pos)
+                        start = total - len(candidates)
+                        window = table.top_k(candidates, limit)
+                    else:
+                        window = table.top_k(candidates, offset + limit)[offset:]
+
+            else:
+                # Demo mode: deterministic, no ML.
+                # Index postings are already in (-domain_weight, resource_id) order.
+                ranking_mode = ranking = DEMO_RANKING
+                model_version = None
+                start = offset
+                if after is not None:
+                    check_cursor(after, ds.version, ranking, query)
+                    start = ds.index.start_after(
+                        skill,
+                        resource_type,
+                        int(after.key),
+                        after.resource_id,
+                        include_secondary,
+                    )
+                end = min(start + limit, total)
+                window = [(None, pos) for pos in positions[start:end].tolist()]
+
+        with span("paginate"):
+            records = [
+                {**ds.store.record(pos), "score": score}
+                for score, pos in window
+            ]
+        return Page(
+            records,
+            total,
+            start + len(records) < total,
+            ranking_mode,
+            model_version,
+            ds.version,
+            ranking,
+        )
+
+
+def _cursor_position(ds: Dataset, cursor: Cursor) -> int:
+    pos = ds.store.find(cursor.resource_id)
+    if pos is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return pos
+
+
+# =========================================================
+# Backend selection
+# =========================================================
+
+_backend: Optional[StorageBackend] = None
+_lock = threading.Lock()
+
+
+def get_backend() -> StorageBackend:
+    """The configured backend, created on first use."""
+    global _backend
+
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = _create_backend(STORAGE_BACKEND)
+    return _backend
+
+
+def set_backend(backend: Optional[StorageBackend]) -> None:
+    """Swap the active backend (None resets to the configured one)."""
+    global _backend
+    _backend = backend
+
+
+def _create_backend(name: str) -> StorageBackend:
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        # SQLAlchemy is only needed when this backend is selected
+        from api.service.sqlite_backend import SQLiteBackend
+        return SQLiteBackend()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {name!r}")
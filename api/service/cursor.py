@@ -0,0 +1,87 @@
+import base64
+import hashlib
+import json
+import math
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException
+
+# The `ranking` of demo-mode cursors, whose keys are domain weights
+DEMO_RANKING = "deterministic"
+
+
+class Cursor(NamedTuple):
+    """
+    Position after the last result of a page, tied to the ordering that
+    produced it.
+
+    `key` is the primary sort value of that result: its score in full mode,
+    its domain_weight in demo mode. `resource_id` breaks ties.
+    """
+
+    dataset_version: str
+    ranking: str
+    query: str
+    key: float
+    resource_id: str
+
+
+def query_fingerprint(
+    access_mode: str,
+    skill: str,
+    resource_type: Optional[str],
+    minimum_domain_weight: Optional[int],
+    include_secondary: bool = False,
+) -> str:
+    """Short hash of the normalized filters a cursor is valid for."""
+    filters = [access_mode, skill, resource_type, minimum_domain_weight]
+    if include_secondary:
+        filters.append(True)
+    raw = json.dumps(filters)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    raw = json.dumps(list(cursor), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Parse an opaque cursor; malformed tokens are a 400."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        version, ranking, query, key, resource_id = json.loads(raw)
+        # bool is an int, and json accepts NaN and Infinity
+        if (
+            isinstance(key, bool)
+            or not isinstance(key, (int, float))
+            or not math.isfinite(key)
+            or not isinstance(resource_id, str)
+        ):
+            raise ValueError(key)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return Cursor(str(version), str(ranking), str(query), key, resource_id)
+
+
+def check_cursor(cursor: Cursor, dataset_version: str, ranking: str, query: str) -> None:
+    """
+    Reject a cursor minted for other filters or a different ordering.
+
+    Cursors are stateless, so once the dataset or model changes the old
+    positions are meaningless and clients must restart from page one.
+    """
+    if cursor.query != query:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor does not match the requested filters",
+        )
+    if cursor.dataset_version != dataset_version or cursor.ranking != ranking:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor expired: the dataset or model changed; restart from the first page",
+        )
+    if ranking == DEMO_RANKING and cursor.key != int(cursor.key):
+        # Demo keys are domain weights, always whole numbers
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -1,14 +1,16 @@
 from typing import List, Dict
 
 
-def demo_recommendations(results: List[Dict]) -> Dict:
+def demo_recommendations(results: List[Dict], skill: str | None = None) -> Dict:
     """
     Shape demo-mode recommendations to match RecommendationResponse schema.
+
+    `skill` is echoed when the page is empty (an offset past the end).
     """
 
     return {
         "mode": "demo",
-        "skill_cluster": results[0]["skill_cluster"] if results else None,
+        "skill_cluster": results[0]["skill_cluster"] if results else skill,
         "results": results,
         "count": len(results),
         "total_results": len(results),
@@ -0,0 +1,96 @@
+import csv
+import io
+from typing import Dict, Iterator, List, Optional
+
+from api.cache import encode_json
+from api.data import Dataset, get_dataset
+from api.service.materialized import get_ranking_table
+from api.service.service import _normalize_resource_type
+
+
+# Records built, encoded and flushed per step; bounds export memory
+EXPORT_CHUNK_SIZE = 1000
+
+# Columns of an exported row, in order (the Resource schema)
+EXPORT_FIELDS = (
+    "resource_id",
+    "resource_name",
+    "source_url",
+    "domain",
+    "category",
+    "resource_type",
+    "skill_cluster",
+    "domain_weight",
+    "score",
+)
+
+
+class RankedExport:
+    """
+    Every ranked resource for one filter, produced chunk by chunk.
+
+    The dataset and ranking table are pinned when the export starts, so a
+    reload or model swap mid-stream cannot mix two orderings.
+    """
+
+    def __init__(
+        self,
+        skill: str,
+        resource_type: Optional[str] = None,
+        minimum_domain_weight: Optional[int] = None,
+        dataset: Optional[Dataset] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        include_secondary: bool = False,
+    ):
+        self.dataset = dataset or get_dataset()
+        table = get_ranking_table(self.dataset)
+        self.ranking_mode = table.ranking_mode
+        self.model_version = table.model_version if table.ranking_mode == "ml" else None
+
+        self._ranked = table.ranked(
+            skill.strip().lower(),
+            _normalize_resource_type(resource_type),
+            include_secondary,
+        )
+        self._minimum_domain_weight = minimum_domain_weight
+        self._chunk_size = chunk_size
+
+    def chunks(self) -> Iterator[List[Dict]]:
+        store = self.dataset.store
+        positions, scores = self._ranked.positions, self._ranked.scores
+
+        for start in range(0, len(positions), self._chunk_size):
+            chunk = positions[start:start + self._chunk_size]
+            chunk_scores = scores[start:start + self._chunk_size]
+
+            if self._minimum_domain_weight is not None:
+                keep = store.domain_weight[chunk] >= self._minimum_domain_weight
+                chunk, chunk_scores = chunk[keep], chunk_scores[keep]
+
+            if len(chunk):
+                yield [
+                    {**store.record(pos), "score": score}
+                    for pos, score in zip(chunk.tolist(), chunk_scores.tolist())
+                ]
+
+
+# =========================================================
+# Encoders
+# =========================================================
+
+def ndjson_lines(records: List[Dict]) -> bytes:
+    return b"".join(
+        encode_json({f: r[f] for f in EXPORT_FIELDS}) + b"\n"
+        for r in records
+    )
+
+
+def csv_header() -> bytes:
+    return (",".join(EXPORT_FIELDS) + "\r\n").encode("utf-8")
+
+
+def csv_lines(records: List[Dict]) -> bytes:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    writer.writerows(records)
+    return out.getvalue().encode("utf-8")
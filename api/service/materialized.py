@@ -0,0 +1,164 @@
+import itertools
+import threading
+import weakref
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+import api.ml.ranker as ranker
+from api.data import Dataset, get_dataset
+from api.index import ResourceIndex
+from api.store import ResourceStore
+from api.service.ranking import rank_store, store_features
+
+
+class RankedList(NamedTuple):
+    """
+    Full-mode ordering for one (skill_cluster, resource_type) key.
+
+    `positions` are sorted by (-score, position); `scores` is aligned and
+    `neg_scores` mirrors it in ascending order for bisecting.
+    """
+
+    positions: np.ndarray
+    scores: np.ndarray
+    neg_scores: np.ndarray
+
+    def start_after(self, score: float, pos: int) -> int:
+        """Index of the first entry ordered after (score, pos)."""
+        lo = int(np.searchsorted(self.neg_scores, -score, side="left"))
+        hi = int(np.searchsorted(self.neg_scores, -score, side="right"))
+        return lo + int(np.searchsorted(self.positions[lo:hi], pos, side="right"))
+
+
+EMPTY_RANKED_LIST = RankedList(
+    np.zeros(0, dtype=np.int64),
+    np.zeros(0, dtype=np.float64),
+    np.zeros(0, dtype=np.float64),
+)
+
+_generations = itertools.count(1)
+
+
+class RankingTable:
+    """
+    Scores and ranked lists for every filter combination under one model.
+
+    Scores only depend on static record fields and the loaded model, so
+    they are computed once per model and every page is served by slicing.
+    """
+
+    def __init__(
+        self,
+        store: ResourceStore,
+        index: ResourceIndex,
+        model: Optional[object],
+        features: Optional[np.ndarray] = None,
+    ):
+        self.model = model
+        self.model_version = ranker.model_version(model)
+        # Unique per table; lets caches key on "which rankings" cheaply
+        self.generation = next(_generations)
+
+        scores, self.ranking_mode = rank_store(
+            store,
+            allow_ml=model is not None,
+            features=features,
+        )
+        self.scores = scores
+
+        self._lists: Dict[Tuple[str, Optional[str]], RankedList] = {
+            key: self._rank(posting.positions) for key, posting in index.items()
+        }
+        # Lists that include secondary clusters, where they differ
+        self._related: Dict[Tuple[str, Optional[str]], RankedList] = {
+            key: self._rank(posting.positions) for key, posting in index.related_items()
+        }
+
+    def _rank(self, candidates: np.ndarray) -> RankedList:
+        scores = self.scores
+        positions = candidates[np.lexsort((candidates, -scores[candidates]))]
+        ranked_scores = scores[positions]
+        return RankedList(positions, ranked_scores, -ranked_scores)
+
+    def ranked(
+        self,
+        skill: str,
+        resource_type: Optional[str] = None,
+        include_secondary: bool = False,
+    ) -> RankedList:
+        key = (skill, resource_type)
+        if include_secondary and key in self._related:
+            return self._related[key]
+        return self._lists.get(key, EMPTY_RANKED_LIST)
+
+    def after(self, candidates: np.ndarray, score: float, pos: int) -> np.ndarray:
+        """Candidates ordered after (score, pos) in (-score, position) order."""
+        scores = self.scores[candidates]
+        return candidates[(scores < score) | ((scores == score) & (candidates > pos))]
+
+    def top_k(self, candidates: Sequence[int], k: int) -> List[Tuple[float, int]]:
+        """
+        Best `k` (score, position) pairs among ad-hoc candidates, best first.
+
+        Used when a filter has no precomputed list. A partial selection
+        keeps this near O(n) instead of sorting every candidate.
+        """
+
+        candidates = np.asarray(candidates, dtype=np.int64)
+        scores = self.scores[candidates]
+
+        if 0 < k < len(candidates):
+            # Keep everything tied with the k-th best so ties break by position
+            kth = np.partition(-scores, k - 1)[k - 1]
+            keep = -scores <= kth
+            candidates, scores = candidates[keep], scores[keep]
+
+        order = np.lexsort((candidates, -scores))[:k]
+        return list(zip(scores[order].tolist(), candidates[order].tolist()))
+
+
+# =========================================================
+# Tables per dataset
+# =========================================================
+
+# Per-dataset (model, table) slot. Weak keys let a replaced dataset and its
+# rankings be freed once no in-flight request holds it.
+_tables: "weakref.WeakKeyDictionary[Dataset, Tuple[Optional[object], RankingTable]]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+def get_ranking_table(dataset: Optional[Dataset] = None) -> RankingTable:
+    """
+    Return the ranking table for a dataset (the active one by default)
+    under the currently loaded model.
+
+    The table is rebuilt whenever the dataset or model changes (loaded,
+    swapped or removed); otherwise this is a cheap identity check.
+    """
+
+    dataset = dataset or get_dataset()
+    model, _ = ranker.current_model()
+    current = _tables.get(dataset)
+
+    if current is not None and current[0] is model:
+        return current[1]
+
+    with _lock:
+        current = _tables.get(dataset)
+        if current is None or current[0] is not model:
+            features = None
+            if model is not None:
+                # Static per dataset, so kept across model swaps
+                features = dataset.memoize(
+                    "ml_features", lambda: store_features(dataset.store)
+                )
+            table = RankingTable(dataset.store, dataset.index, model, features)
+            current = _tables[dataset] = (model, table)
+        return current[1]
+
+
+def warm_rankings(dataset: Optional[Dataset] = None) -> None:
+    """Materialize rankings ahead of the first full-mode request."""
+    get_ranking_table(dataset)
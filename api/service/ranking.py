@@ -1,7 +1,19 @@
-from typing import Tuple
+import logging
+from typing import List, Optional, Sequence, Tuple
 
-from api.ml.ranker import predict_score, model_available
-from api.service.scoring import compute_score
+import numpy as np
+
+from api.ml.ranker import (
+    predict_score,
+    predict_scores_batch,
+    model_available,
+    feature_matrix,
+)
+from api.metrics import MODEL_FALLBACKS
+from api.service.scoring import compute_score, compute_scores
+from api.store import ResourceStore
+
+logger = logging.getLogger(__name__)
 
 
 def rank_resource(resource: dict, allow_ml: bool = True) -> Tuple[float, str]:
@@ -17,7 +29,86 @@ def rank_resource(resource: dict, allow_ml: bool = True) -> Tuple[float, str]:
         try:
             return predict_score(resource), "ml"
         except Exception:
-            # Safe fallback if model fails
+            # Safe fallback if model fails; counted, since it is otherwise silent
+            MODEL_FALLBACKS.inc("resource")
             return compute_score(resource), "rule"
 
     return compute_score(resource), "rule"
+
+
+def rank_resources(
+    resources: Sequence[dict],
+    allow_ml: bool = True,
+    features: Optional[np.ndarray] = None,
+) -> Tuple[List[float], str]:
+    """
+    Rank many resources, scoring ML in one batched model call.
+
+    Falls back to per-resource rank_resource() if the batch call fails.
+
+    Returns:
+        (scores, ranking_mode)
+        ranking_mode is "ml" only if every resource was scored by the model
+    """
+
+    if allow_ml and model_available():
+        try:
+            scores = predict_scores_batch(resources, features=features)
+            return scores.tolist(), "ml"
+        except Exception:
+            MODEL_FALLBACKS.inc("batch")
+            logger.warning("Batch model scoring failed; scoring one by one", exc_info=True)
+
+    scores = []
+    modes = set()
+    for r in resources:
+        score, mode = rank_resource(r, allow_ml=allow_ml)
+        scores.append(score)
+        modes.add(mode)
+
+    return scores, "ml" if modes == {"ml"} else "rule"
+
+
+def store_features(store: ResourceStore) -> np.ndarray:
+    """ML feature matrix for every resource in the store."""
+    return feature_matrix(
+        store.domain_weight,
+        store.is_github,
+        store.resource_type.mask("tool"),
+        store.resource_type.mask("documentation"),
+    )
+
+
+def rank_store(
+    store: ResourceStore,
+    allow_ml: bool = True,
+    features: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, str]:
+    """
+    Score every resource in a columnar store.
+
+    ML is one batched call; rule scoring is vectorized over the columns.
+    If the batch call fails, falls back to rank_resources() on records.
+
+    Returns:
+        (scores aligned with store positions, ranking_mode)
+    """
+
+    if allow_ml and model_available():
+        try:
+            if features is None:
+                features = store_features(store)
+            return predict_scores_batch(features=features), "ml"
+        except Exception:
+            MODEL_FALLBACKS.inc("store")
+            logger.warning("Store model scoring failed; ranking records instead", exc_info=True)
+            scores, mode = rank_resources(list(store), allow_ml=allow_ml)
+            return np.array(scores, dtype=np.float64), mode
+
+    scores = compute_scores(
+        store.domain_weight,
+        store.is_github,
+        store.resource_type.mask("tool"),
+        store.resource_type.mask("documentation"),
+    )
+    return scores, "rule"
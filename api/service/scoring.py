@@ -1,5 +1,7 @@
 from typing import Mapping
 
+import numpy as np
+
 
 def compute_score(resource: Mapping) -> float:
     score = float(resource.get("domain_weight", 0))
@@ -13,3 +15,18 @@ def compute_score(resource: Mapping) -> float:
         score += 0.5
 
     return round(score, 2)
+
+
+def compute_scores(
+    domain_weight: np.ndarray,
+    is_github: np.ndarray,
+    is_tool: np.ndarray,
+    is_documentation: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized compute_score() over whole columns.
+    """
+    score = domain_weight.astype(np.float64)
+    score += np.where(is_github, 2.0, 0.0)
+    score += np.where(is_tool, 1.0, np.where(is_documentation, 0.5, 0.0))
+    return np.round(score, 2)
@@ -0,0 +1,118 @@
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+from api.data import Dataset, get_dataset
+from api.metrics import CANDIDATES, span
+from api.search import SearchIndex, top_hits
+from api.service.materialized import get_ranking_table
+from api.service.service import DEMO_MAX_RESULTS, FULL_MAX_RESULTS
+from api.store import Categorical
+
+
+# =========================================================
+# Index per dataset
+# =========================================================
+
+# The most recently built index; the next dataset's build reuses its
+# tokenized names for unchanged records
+_latest: Optional[SearchIndex] = None
+_lock = threading.Lock()
+
+
+def get_search_index(dataset: Optional[Dataset] = None) -> SearchIndex:
+    ds = dataset or get_dataset()
+    return ds.memoize("search_index", lambda: _build(ds))
+
+
+def _build(dataset: Dataset) -> SearchIndex:
+    global _latest
+    with _lock:
+        index = SearchIndex(dataset.store, previous=_latest)
+        _latest = index
+    return index
+
+
+def warm_search(dataset: Optional[Dataset] = None) -> None:
+    """Build the search index ahead of the first search."""
+    get_search_index(dataset)
+
+
+# =========================================================
+# Search
+# =========================================================
+
+def _code_mask(column: Categorical, value: str) -> np.ndarray:
+    """Per category code: whether it equals `value` case-insensitively."""
+    return np.array([c.lower() == value for c in column.categories], dtype=bool)
+
+
+def search_resources(
+    q: str,
+    limit: int = 10,
+    offset: int = 0,
+    prefix: bool = False,
+    match_all: bool = True,
+    skill: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    domain_weight_boost: float = 0.0,
+    rank_boost: float = 0.0,
+    access_mode: str = "demo",
+    dataset: Optional[Dataset] = None,
+) -> Dict:
+    """
+    Keyword search over resource names, categories and domains, by BM25.
+
+    Optional boosts blend in authority: `domain_weight_boost` adds
+    boost * log1p(domain_weight), and `rank_boost` (full mode only) adds
+    boost * the recommendation score, scaled to [0, 1].
+    """
+    ds = dataset or get_dataset()
+    store = ds.store
+    is_demo = access_mode != "full"
+
+    with span("search_match"):
+        positions, scores = get_search_index(ds).match(q, prefix=prefix, match_all=match_all)
+
+    keep = None
+    if skill:
+        keep = _code_mask(store.skill_cluster, skill.strip().lower())[store.skill_cluster.codes[positions]]
+    if resource_type:
+        type_ok = _code_mask(store.resource_type, resource_type.strip().lower())[
+            store.resource_type.codes[positions]
+        ]
+        keep = type_ok if keep is None else keep & type_ok
+    if keep is not None:
+        positions, scores = positions[keep], scores[keep]
+
+    scores = scores.astype(np.float64)
+    ranking_mode = "bm25"
+    if domain_weight_boost:
+        scores = scores + domain_weight_boost * np.log1p(store.domain_weight[positions])
+    if rank_boost and not is_demo:
+        table = get_ranking_table(ds)
+        scale = float(np.abs(table.scores).max()) if len(table.scores) else 0.0
+        if scale:
+            scores = scores + rank_boost * table.scores[positions] / scale
+        ranking_mode = f"bm25+{table.ranking_mode}"
+
+    CANDIDATES.observe(len(positions), "search", access_mode)
+
+    limit = min(limit, DEMO_MAX_RESULTS if is_demo else FULL_MAX_RESULTS)
+    with span("search_rank"):
+        hits = top_hits(positions, scores, offset + limit)[offset:]
+
+    results = []
+    for hit in hits:
+        record = store.record(hit.position)
+        record["score"] = round(hit.score, 6)
+        results.append(record)
+
+    return {
+        "query": q,
+        "count": len(results),
+        "total_results": len(positions),
+        "ranking_mode": ranking_mode,
+        "results": results,
+    }
@@ -1,12 +1,22 @@
 from typing import List, Dict
-from collections import Counter
 import os
+import time
+
+import numpy as np
 
 from fastapi import HTTPException
 
-from api.data import RESOURCES
-from api.service.ranking import rank_resource
+from api.data import Dataset, get_dataset
+from api.metrics import CANDIDATES, RANKING_MODES
+from api.store import Categorical, ResourceStore
+from api.service.backends import get_backend
 from api.service.demo import demo_recommendations
+from api.service.cursor import (
+    Cursor,
+    decode_cursor,
+    encode_cursor,
+    query_fingerprint,
+)
 
 
 # =========================================================
@@ -27,44 +37,98 @@ FULL_MAX_RESULTS = 100
 # Discovery / Metadata
 # =========================================================
 
-def get_available_skills() -> List[str]:
-    return sorted({r["skill_cluster"] for r in RESOURCES})
+def _present(column: Categorical) -> List[str]:
+    counts = column.counts()
+    return [c for c, n in zip(column.categories, counts) if n]
+
+
+def _most_common(column: Categorical, top_n: int | None = None) -> List[tuple]:
+    """
+    Counter.most_common() over a categorical column: count descending,
+    ties in order of first appearance.
+    """
+    counts = column.counts()
+    order = np.argsort(-counts, kind="stable")[:top_n]
+    return [
+        (column.categories[code], int(counts[code]))
+        for code in order
+        if counts[code]
+    ]
+
 
+# Results depend only on the loaded data, so each is computed once per
+# dataset and memoized on it; a reload starts from an empty memo.
 
-def get_available_resource_types() -> List[str]:
-    return sorted({r["resource_type"] for r in RESOURCES})
+def get_available_skills(dataset: Dataset | None = None) -> List[str]:
+    ds = dataset or get_dataset()
+    return ds.memoize(
+        "skills",
+        lambda: sorted(set(_present(ds.store.skill_cluster))),
+    )
 
 
-def get_filter_availability() -> Dict[str, List[str]]:
+def get_available_resource_types(dataset: Dataset | None = None) -> List[str]:
+    ds = dataset or get_dataset()
+    return ds.memoize(
+        "resource_types",
+        lambda: sorted(set(_present(ds.store.resource_type))),
+    )
+
+
+def get_filter_availability(dataset: Dataset | None = None) -> Dict[str, List[str]]:
+    ds = dataset or get_dataset()
+    return ds.memoize("availability", lambda: _filter_availability(ds.store))
+
+
+def _filter_availability(store: ResourceStore) -> Dict[str, List[str]]:
+    n_types = len(store.resource_type.categories)
+    pairs = np.unique(
+        store.skill_cluster.codes.astype(np.int64) * n_types
+        + store.resource_type.codes
+    )
+
     availability: Dict[str, set] = {}
-    for r in RESOURCES:
-        availability.setdefault(r["skill_cluster"], set()).add(r["resource_type"])
-    return {k: sorted(v) for k, v in availability.items()}
+    for pair in pairs.tolist():
+        skill_code, type_code = divmod(pair, n_types)
+        availability.setdefault(skill_code, set()).add(
+            store.resource_type.categories[type_code]
+        )
+    return {
+        store.skill_cluster.categories[code]: sorted(availability[code])
+        for code in sorted(availability)
+    }
 
 
-def get_available_domains() -> List[Dict]:
-    counter = Counter(r["domain"] for r in RESOURCES)
-    return [{"domain": d, "count": c} for d, c in counter.most_common()]
+def get_available_domains(dataset: Dataset | None = None) -> List[Dict]:
+    ds = dataset or get_dataset()
+    return ds.memoize(
+        "domains",
+        lambda: [
+            {"domain": d, "count": c}
+            for d, c in _most_common(ds.store.domain)
+        ],
+    )
+
 
+def get_stats(top_n: int = 5, dataset: Dataset | None = None) -> Dict:
+    ds = dataset or get_dataset()
+    return ds.memoize(("stats", top_n), lambda: _stats(ds.store, top_n))
 
-def get_stats(top_n: int = 5) -> Dict:
-    skill_counts = Counter(r["skill_cluster"] for r in RESOURCES)
-    domain_counts = Counter(r["domain"] for r in RESOURCES)
-    resource_type_counts = Counter(r["resource_type"] for r in RESOURCES)
 
+def _stats(store: ResourceStore, top_n: int) -> Dict:
     return {
-        "total_resources": len(RESOURCES),
+        "total_resources": len(store),
         "top_skills": [
             {"skill_cluster": skill, "count": count}
-            for skill, count in skill_counts.most_common(top_n)
+            for skill, count in _most_common(store.skill_cluster, top_n)
         ],
         "top_domains": [
             {"domain": domain, "count": count}
-            for domain, count in domain_counts.most_common(top_n)
+            for domain, count in _most_common(store.domain, top_n)
         ],
         "resource_types": [
             {"resource_type": rtype, "count": count}
-            for rtype, count in resource_type_counts.most_common()
+            for rtype, count in _most_common(store.resource_type)
         ],
     }
 
@@ -73,6 +137,51 @@ def get_stats(top_n: int = 5) -> Dict:
 # Core Recommendations Logic
 # =========================================================
 
+def _normalize_resource_type(resource_type: str | None) -> str | None:
+    # A blank type is no filter, not a filter matching nothing
+    return (resource_type or "").strip().lower() or None
+
+
+def _effective_limit(limit: int, is_demo: bool) -> int:
+    return DEMO_MAX_RESULTS if is_demo else min(limit, FULL_MAX_RESULTS)
+
+
+def recommendation_cache_key(
+    skill: str,
+    limit: int = 5,
+    offset: int = 0,
+    resource_type: str | None = None,
+    minimum_domain_weight: int | None = None,
+    access_mode: str = "demo",
+    dataset: Dataset | None = None,
+    cursor: str | None = None,
+    include_secondary: bool = False,
+) -> tuple:
+    """
+    Everything a get_recommendations() response depends on: the normalized
+    query plus the storage backend's data/ranking version.
+
+    `skill` is kept verbatim because responses echo it back.
+    """
+
+    ds = dataset or get_dataset()
+    is_demo = access_mode == "demo"
+    backend = get_backend()
+
+    return (
+        backend.name,
+        backend.cache_token(access_mode, ds),
+        access_mode,
+        skill,
+        _normalize_resource_type(resource_type),
+        _effective_limit(limit, is_demo),
+        offset,
+        minimum_domain_weight,
+        cursor,
+        include_secondary,
+    )
+
+
 def get_recommendations(
     skill: str,
     limit: int = 5,
@@ -80,10 +189,20 @@ def get_recommendations(
     resource_type: str | None = None,
     minimum_domain_weight: int | None = None,
     access_mode: str = "demo",
+    dataset: Dataset | None = None,
+    cursor: str | None = None,
+    include_secondary: bool = False,
 ):
     """
     Returns ranked recommendations based on access mode.
 
+    Pages are addressed either by `offset` or by an opaque `cursor` taken
+    from a previous response's `next_cursor`. A cursor resumes right after
+    the last result it saw without scanning past earlier pages.
+
+    With `include_secondary`, resources whose secondary skill clusters
+    include `skill` match as well as those where it is the primary one.
+
     demo:
         - deterministic ranking
         - capped results
@@ -94,6 +213,7 @@ def get_recommendations(
     """
 
     is_demo = access_mode == "demo"
+    ds = dataset or get_dataset()
 
     # -----------------------------------------------------
     # Filter
@@ -101,30 +221,46 @@ def get_recommendations(
 
     normalized_skill = skill.strip().lower()
 
-    normalized_resource_type = (
-        resource_type.strip().lower()
-        if resource_type
-        else None
+    normalized_resource_type = _normalize_resource_type(resource_type)
+
+    after = None
+    if cursor:
+        if offset:
+            raise HTTPException(
+                status_code=400,
+                detail="Use either offset or cursor, not both",
+            )
+        after = decode_cursor(cursor)
+
+    query = query_fingerprint(
+        access_mode,
+        normalized_skill,
+        normalized_resource_type,
+        minimum_domain_weight,
+        include_secondary,
     )
 
-    filtered = [
-        r for r in RESOURCES
-        if r["skill_cluster"].lower() == normalized_skill
-    ]
+    effective_limit = _effective_limit(limit, is_demo)
 
-    if normalized_resource_type:
-        filtered = [
-            r for r in filtered
-            if r["resource_type"].lower() == normalized_resource_type
-        ]
+    # -----------------------------------------------------
+    # Rank + paginate (authoritative limits)
+    # -----------------------------------------------------
 
-    if minimum_domain_weight is not None:
-        filtered = [
-            r for r in filtered
-            if r["domain_weight"] >= minimum_domain_weight
-        ]
+    result = get_backend().page(
+        ds,
+        access_mode,
+        normalized_skill,
+        normalized_resource_type,
+        minimum_domain_weight,
+        effective_limit,
+        offset,
+        after,
+        query,
+        include_secondary,
+    )
+    CANDIDATES.observe(result.total, "recommendations", access_mode)
 
-    if not filtered:
+    if not result.total:
         return {
             "mode": access_mode,
             "skill_cluster": skill,
@@ -134,52 +270,19 @@ def get_recommendations(
             "ranking_mode": None,
         }
 
-    # -----------------------------------------------------
-    # Rank
-    # -----------------------------------------------------
-
-    results = []
-    ranking_mode = None
-
-    if access_mode == "full":
-        ranked = []
-
-        for r in filtered:
-            score, mode = rank_resource(r)
-            ranking_mode = mode
-
-            r_with_score = r.copy()
-            r_with_score["score"] = score
-
-            ranked.append((r_with_score, score))
-
-        ranked.sort(key=lambda x: x[1], reverse=True)
-        results = [r for r, _ in ranked]
-
-    else:
-        # Demo mode: deterministic, no ML
-        results = sorted(
-            filtered,
-            key=lambda r: (-r["domain_weight"], r["resource_id"])
-        )
-
-        results = [
-            {**r, "score": None}
-            for r in results
-        ]
+    page = result.records
+    RANKING_MODES.inc(result.ranking_mode)
 
-        ranking_mode = "deterministic"
-
-    # -----------------------------------------------------
-    # Pagination (authoritative limits)
-    # -----------------------------------------------------
-
-    effective_limit = (
-        DEMO_MAX_RESULTS if is_demo else min(limit, FULL_MAX_RESULTS)
-    )
-
-    total = len(results)
-    page = results[offset: offset + effective_limit]
+    next_cursor = None
+    if page and result.has_more:
+        last = page[-1]
+        next_cursor = encode_cursor(Cursor(
+            result.version,
+            result.ranking,
+            query,
+            last["domain_weight"] if is_demo else last["score"],
+            last["resource_id"],
+        ))
 
     # -----------------------------------------------------
     # Demo shaping
@@ -189,7 +292,9 @@ def get_recommendations(
         if not ENABLE_DEMO:
             raise HTTPException(status_code=401, detail="Demo mode disabled")
 
-        return demo_recommendations(page)
+        response = demo_recommendations(page, skill)
+        response["next_cursor"] = next_cursor
+        return response
 
     # -----------------------------------------------------
     # Full response
@@ -200,6 +305,61 @@ def get_recommendations(
         "skill_cluster": skill,
         "results": page,
         "count": len(page),
-        "total_results": total,
-        "ranking_mode": ranking_mode,
+        "total_results": result.total,
+        "ranking_mode": result.ranking_mode,
+        "model_version": result.model_version,
+        "next_cursor": next_cursor,
     }
+
+
+# =========================================================
+# Batch Recommendations
+# =========================================================
+
+def get_recommendations_batch(
+    queries: List[Dict],
+    access_mode: str = "demo",
+    dataset: Dataset | None = None,
+) -> List[Dict]:
+    """
+    Answer several recommendation queries against one dataset snapshot.
+
+    Queries are run grouped by skill so each skill's posting lists and
+    rankings are hot while its queries run, and identical queries are
+    answered once. Each query succeeds or fails on its own.
+
+    Returns one item per query, in request order.
+    """
+
+    ds = dataset or get_dataset()
+
+    groups: Dict[str, List[int]] = {}
+    for i, query in enumerate(queries):
+        groups.setdefault(query["skill"].strip().lower(), []).append(i)
+
+    items: List[Dict | None] = [None] * len(queries)
+    answered: Dict[tuple, Dict] = {}
+
+    for indices in groups.values():
+        for i in indices:
+            query = queries[i]
+            start = time.perf_counter()
+            try:
+                key = recommendation_cache_key(
+                    access_mode=access_mode, dataset=ds, **query
+                )
+                if key not in answered:
+                    answered[key] = {
+                        "status": 200,
+                        "response": get_recommendations(
+                            access_mode=access_mode, dataset=ds, **query
+                        ),
+                    }
+                item = dict(answered[key])
+            except HTTPException as exc:
+                item = {"status": exc.status_code, "error": exc.detail}
+
+            item["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            items[i] = item
+
+    return items
@@ -0,0 +1,66 @@
+import logging
+import os
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+from api.data import Dataset, get_dataset
+from api.service.service import DEMO_MAX_RESULTS, FULL_MAX_RESULTS
+from api.similar import SimilarIndex, load_similar, similar_path
+
+logger = logging.getLogger(__name__)
+
+
+def get_similar_index(dataset: Optional[Dataset] = None) -> SimilarIndex:
+    ds = dataset or get_dataset()
+    return ds.memoize("similar_index", lambda: _load(ds))
+
+
+def _load(dataset: Dataset) -> SimilarIndex:
+    """
+    The ETL's index for this dataset, memory-mapped, when it was built
+    from the same JSON; otherwise one built in-process.
+    """
+    path = similar_path(dataset.path) if dataset.path else None
+    if path and os.path.exists(path):
+        try:
+            index, source = load_similar(path)
+            if source is not None and source["version"] == dataset.version and len(index) == len(dataset.store):
+                return index
+            logger.info("Similar-resources index %s does not match the dataset; rebuilding", path)
+        except (OSError, ValueError, KeyError):
+            logger.exception("Unreadable similar-resources index %s; rebuilding", path)
+    return SimilarIndex.build(dataset.store)
+
+
+def warm_similar(dataset: Optional[Dataset] = None) -> None:
+    """Map (or build) the similar-resources index ahead of the first request."""
+    get_similar_index(dataset)
+
+
+def similar_resources(
+    resource_id: str,
+    limit: int = 10,
+    access_mode: str = "demo",
+    dataset: Optional[Dataset] = None,
+) -> Dict:
+    """The resources most similar to `resource_id`, most similar first."""
+    ds = dataset or get_dataset()
+    position = ds.store.find(resource_id)
+    if position is None:
+        raise HTTPException(status_code=404, detail=f"Unknown resource_id: {resource_id}")
+
+    limit = min(limit, DEMO_MAX_RESULTS if access_mode != "full" else FULL_MAX_RESULTS)
+    hits = get_similar_index(ds).neighbours(position, limit)
+
+    results = []
+    for hit in hits:
+        record = ds.store.record(hit.position)
+        record["score"] = round(hit.score, 6)
+        results.append(record)
+
+    return {
+        "resource_id": resource_id,
+        "count": len(results),
+        "results": results,
+    }
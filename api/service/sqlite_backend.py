@@ -0,0 +1,170 @@
+import os
+import weakref
+from typing import Dict, Hashable
+
+from fastapi import HTTPException
+from sqlalchemy import func, or_, select
+
+from db.database import DATABASE_PATH, read_only_engine
+from db.models import CatalogMeta, Resource
+from api.data import Dataset
+from api.metrics import span
+from api.service.backends import Page, StorageBackend
+from api.service.cursor import DEMO_RANKING, check_cursor
+
+
+# Pooled read-only connections per worker process
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "8"))
+
+RESOURCES = Resource.__table__
+META = CatalogMeta.__table__
+
+RECORD_COLUMNS = [
+    RESOURCES.c.resource_id,
+    RESOURCES.c.resource_name,
+    RESOURCES.c.source_url,
+    RESOURCES.c.domain,
+    RESOURCES.c.category,
+    RESOURCES.c.resource_type,
+    RESOURCES.c.skill_cluster,
+    RESOURCES.c.domain_weight,
+    RESOURCES.c.is_github,
+]
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Serves pages straight from the seeded SQLite catalog (db/seed.py).
+
+    Filtering, ordering and LIMIT/OFFSET run in SQL over composite indexes
+    that match each ordering, and full-mode scores are read from the
+    precomputed `score` column, so nothing is held in memory per query.
+    Cursors become keyset conditions on the same indexes.
+
+    `catalog_meta` (dataset and model versions) is read once per loaded
+    dataset, not per request; a re-seed is picked up when the dataset next
+    reloads. include_secondary filters match skill_labels with a LIKE that
+    no index can serve, so they scan the whole table; they are meant for
+    occasional broad queries, not the hot path.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = DATABASE_PATH, pool_size: int = DATABASE_POOL_SIZE):
+        self.engine = read_only_engine(path, pool_size)
+        # catalog_meta per dataset; weak keys free it with the dataset
+        self._meta: "weakref.WeakKeyDictionary[Dataset, Dict[str, str]]" = weakref.WeakKeyDictionary()
+
+    def meta(self) -> Dict[str, str]:
+        with self.engine.connect() as conn:
+            return dict(conn.execute(select(META.c.key, META.c.value)).all())
+
+    def dataset_meta(self, dataset: Dataset) -> Dict[str, str]:
+        """meta(), read on the first request for `dataset` and kept with it."""
+        meta = self._meta.get(dataset)
+        if meta is None:
+            # Racing first requests may both read it; they read the same rows
+            meta = self._meta[dataset] = self.meta()
+        return meta
+
+    def cache_token(self, access_mode, dataset) -> Hashable:
+        meta = self.dataset_meta(dataset)
+        return meta.get("dataset_version"), meta.get("model_version"), meta.get("ranking_mode")
+
+    def page(
+        self,
+        dataset,
+        access_mode,
+        skill,
+        resource_type,
+        minimum_domain_weight,
+        limit,
+        offset,
+        after,
+        query,
+        include_secondary=False,
+    ):
+        t = RESOURCES
+        meta = self.dataset_meta(dataset)
+        version = meta.get("dataset_version", "")
+        if include_secondary:
+            # Labels are space-delimited, so this matches whole labels only.
+            # A leading-wildcard LIKE: a full table scan (see the class docstring)
+            conditions = [t.c.skill_labels.contains(f" {skill} ", autoescape=True)]
+        else:
+            conditions = [t.c.skill_key == skill]
+        if resource_type is not None:
+            conditions.append(t.c.type_key == resource_type)
+        if minimum_domain_weight is not None:
+            conditions.append(t.c.domain_weight >= minimum_domain_weight)
+
+        with self.engine.connect() as conn:
+            with span("filter"):
+                total = conn.execute(
+                    select(func.count()).select_from(t).where(*conditions)
+                ).scalar_one()
+
+            if not total:
+                return Page([], 0, False, None, None, version, "")
+
+            if access_mode == "full":
+                ranking_mode = meta.get("ranking_mode", "rule")
+                model_version = meta.get("model_version") or None
+                ranking = model_version or ranking_mode
+                order = [t.c.score.desc(), t.c.position]
+                columns = RECORD_COLUMNS + [t.c.score]
+
+                if after is not None:
+                    check_cursor(after, version, ranking, query)
+                    position = conn.execute(
+                        select(t.c.position).where(t.c.resource_id == after.resource_id)
+                    ).scalar()
+                    if position is None:
+                        raise HTTPException(status_code=400, detail="Invalid cursor")
+                    conditions += [
+                        t.c.score <= after.key,
+                        or_(t.c.score < after.key, t.c.position > position),
+                    ]
+            else:
+                ranking_mode = ranking = DEMO_RANKING
+                model_version = None
+                order = [t.c.domain_weight.desc(), t.c.resource_id]
+                columns = RECORD_COLUMNS
+
+                if after is not None:
+                    check_cursor(after, version, ranking, query)
+                    weight = int(after.key)
+                    conditions += [
+                        t.c.domain_weight <= weight,
+                        or_(t.c.domain_weight < weight, t.c.resource_id > after.resource_id),
+                    ]
+
+            # One extra row tells whether another page follows
+            with span("rank"):
+                rows = conn.execute(
+                    select(*columns)
+                    .where(*conditions)
+                    .order_by(*order)
+                    .limit(limit + 1)
+                    .offset(0 if after is not None else offset)
+                ).mappings().all()
+
+        with span("paginate"):
+            records = [_record(row) for row in rows[:limit]]
+        return Page(
+            records,
+            total,
+            len(rows) > limit,
+            ranking_mode,
+            model_version,
+            version,
+            ranking,
+        )
+
+
+def _record(row) -> Dict:
+    record = dict(row)
+    record["domain_weight"] = int(record["domain_weight"] or 0)
+    record["is_github"] = bool(record["is_github"])
+    record.setdefault("score", None)
+    return record
@@ -0,0 +1,55 @@
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException
+
+from api.data import Dataset, get_dataset
+from api.suggest import MAX_SUGGESTIONS, SUGGEST_KINDS, Suggester
+
+
+def get_suggester(dataset: Optional[Dataset] = None) -> Suggester:
+    ds = dataset or get_dataset()
+    return ds.memoize("suggester", lambda: Suggester(ds.store))
+
+
+def warm_suggest(dataset: Optional[Dataset] = None) -> None:
+    """Build the prefix indexes ahead of the first suggestion."""
+    get_suggester(dataset)
+
+
+def suggest(
+    prefix: str,
+    kinds: Optional[Iterable[str]] = None,
+    limit: int = 5,
+    dataset: Optional[Dataset] = None,
+) -> Dict:
+    """
+    Suggestions whose text has a word starting with `prefix`: up to
+    `limit` per kind, heaviest first, kinds in SUGGEST_KINDS order.
+    `kinds` naming no kind at all (None, or only blanks) means every kind.
+    """
+    wanted = {k.strip().lower() for k in kinds or ()} - {""}
+    if not wanted:
+        wanted = set(SUGGEST_KINDS)
+    unknown = wanted - set(SUGGEST_KINDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown suggestion kind(s): {', '.join(sorted(unknown))}. "
+            f"Expected any of: {', '.join(SUGGEST_KINDS)}",
+        )
+
+    text = prefix.lstrip()
+    limit = min(limit, MAX_SUGGESTIONS)
+    suggester = get_suggester(dataset)
+
+    suggestions = []
+    if text:
+        for kind in SUGGEST_KINDS:
+            if kind in wanted:
+                suggestions.extend(s._asdict() for s in suggester.suggest(text, kind, limit))
+
+    return {
+        "prefix": prefix,
+        "count": len(suggestions),
+        "suggestions": suggestions,
+    }
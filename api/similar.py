@@ -0,0 +1,275 @@
+import math
+import os
+import zlib
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.search import SearchHit, _ranges, domain_tokens, tokenize, top_hits
+from api.store import ResourceStore, map_arrays, write_arrays
+
+SIMILAR_MAGIC = b"DRISIM01"
+
+# Embedding width
+EMBED_DIM = 128
+
+# Vectors are stored as int8: unit-vector components times this. A
+# quarter of float32's size, and faster to widen than float16
+QUANT_SCALE = 127
+
+# How much each field contributes to a resource's embedding
+NAME_WEIGHT = 1.0
+CATEGORY_WEIGHT = 0.7
+DOMAIN_WEIGHT = 0.3
+
+# A word's character trigrams, together, weigh this much relative to the
+# word itself (so "react" and "reactjs" are close)
+TRIGRAM_WEIGHT = 0.5
+
+# Lists scored per query; more is slower and closer to exact
+DEFAULT_NPROBE = 8
+
+# k-means over a sample of this many vectors per list
+TRAIN_PER_LIST = 64
+KMEANS_ITERATIONS = 10
+MAX_LISTS = 4096
+
+# Vectors embedded or assigned per step, to bound temporary memory
+CHUNK_ROWS = 65536
+
+
+def similar_path(json_path: str) -> str:
+    """Where the similar-resources index of an enriched JSON file lives."""
+    return os.path.splitext(json_path)[0] + ".similar"
+
+
+# -----------------------------------------------------
+# Embeddings
+# -----------------------------------------------------
+# Hashed bag of words and character trigrams: no model and no stored
+# vocabulary, and the same text always lands on the same vector.
+
+def _hashed(features: List[str], weight: float) -> Tuple[List[int], List[float]]:
+    """Signed feature hashing: (dimensions, values) for `features`."""
+    dims, values = [], []
+    for feature in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        dims.append(h % EMBED_DIM)
+        values.append(weight if h & 0x80000000 else -weight)
+    return dims, values
+
+
+def _word_features(word: str) -> Tuple[List[int], List[float]]:
+    padded = f" {word} "
+    grams = [f"g:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    dims, values = _hashed([f"w:{word}"], 1.0)
+    gram_dims, gram_values = _hashed(grams, TRIGRAM_WEIGHT / math.sqrt(len(grams)))
+    return dims + gram_dims, values + gram_values
+
+
+class _Words:
+    """Word -> id, and the hashed features of chosen words in CSR layout."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def ids_of(self, words: List[str]) -> List[int]:
+        ids = self.ids
+        return [ids.setdefault(word, len(ids)) for word in words]
+
+    def csr(self, needed: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Features of the words where `needed` is set; other words have none."""
+        dims, values, lengths = [], [], np.zeros(len(self.ids), dtype=np.int64)
+        for word, i in self.ids.items():
+            if needed[i]:
+                word_dims, word_values = _word_features(word)
+                dims.extend(word_dims)
+                values.extend(word_values)
+                lengths[i] = len(word_dims)
+
+        offsets = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return np.array(dims, dtype=np.int64), np.array(values, dtype=np.float32), offsets
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length in place (all-zero rows stay zero)."""
+    norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))[:, None]
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _bags(rows: np.ndarray, word_ids: np.ndarray, weights: np.ndarray, words, n_rows: int) -> np.ndarray:
+    """Dense (n_rows, EMBED_DIM) sums of weighted word vectors, unit length."""
+    dims, values, offsets = words
+    lengths = np.diff(offsets)[word_ids]
+    at = _ranges(offsets[word_ids], lengths)
+    flat = np.repeat(rows, lengths) * EMBED_DIM + dims[at]
+    summed = np.bincount(flat, weights=values[at] * np.repeat(weights, lengths), minlength=n_rows * EMBED_DIM)
+    return _normalize(summed.astype(np.float32).reshape(n_rows, EMBED_DIM))
+
+
+def embed(store: ResourceStore) -> np.ndarray:
+    """
+    One unit vector per resource, quantized to int8: its name as an IDF-weighted
+    bag of words and trigrams, plus its category and domain (TLD
+    dropped), each normalized and weighted by field.
+    """
+    n = len(store)
+    words = _Words()
+
+    name_ids = [words.ids_of(tokenize(name)) for name in store.resource_name]
+    lengths = np.fromiter(map(len, name_ids), dtype=np.int64, count=n)
+    name_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(lengths, out=name_offsets[1:])
+    name_words = np.fromiter(chain.from_iterable(name_ids), dtype=np.int64, count=int(name_offsets[-1]))
+    del name_ids
+
+    value_ids = {}
+    for field, split in (("category", tokenize), ("domain", domain_tokens)):
+        value_ids[field] = [words.ids_of(split(v)) for v in getattr(store, field).categories]
+
+    # A name word no other name has cannot make two resources similar;
+    # it only adds hashing noise, so it gets no weight (and no features)
+    df = np.bincount(name_words, minlength=len(words.ids))
+    idf = np.where(df > 1, np.log((1 + n) / (1 + df)) + 1, 0).astype(np.float32)
+
+    needed = df > 1
+    for ids in value_ids.values():
+        needed[list(chain.from_iterable(ids))] = True
+    csr = words.csr(needed)
+
+    # Per distinct category / domain value, weighted by field
+    value_vectors = {}
+    for field, weight in (("category", CATEGORY_WEIGHT), ("domain", DOMAIN_WEIGHT)):
+        ids = value_ids[field]
+        rows = np.repeat(np.arange(len(ids), dtype=np.int64), [len(i) for i in ids])
+        flat = np.fromiter(chain.from_iterable(ids), dtype=np.int64, count=len(rows))
+        value_vectors[field] = _bags(rows, flat, np.ones(len(flat), dtype=np.float32), csr, len(ids)) * weight
+
+    vectors = np.empty((n, EMBED_DIM), dtype=np.int8)
+    for start in range(0, n, CHUNK_ROWS):
+        end = min(start + CHUNK_ROWS, n)
+        chunk_words = name_words[name_offsets[start]:name_offsets[end]]
+        rows = np.repeat(np.arange(end - start, dtype=np.int64), lengths[start:end])
+        chunk = _bags(rows, chunk_words, idf[chunk_words], csr, end - start) * NAME_WEIGHT
+        chunk += value_vectors["category"][store.category.codes[start:end]]
+        chunk += value_vectors["domain"][store.domain.codes[start:end]]
+        vectors[start:end] = np.rint(_normalize(chunk) * QUANT_SCALE)
+    return vectors
+
+
+# -----------------------------------------------------
+# IVF index
+# -----------------------------------------------------
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for every vector."""
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), CHUNK_ROWS):
+        chunk = vectors[start:start + CHUNK_ROWS].astype(np.float32)
+        out[start:start + CHUNK_ROWS] = np.argmax(chunk @ centroids.T, axis=1)
+    return out
+
+
+def _kmeans(sample: np.ndarray, n_lists: int, rng: np.random.Generator) -> np.ndarray:
+    """Spherical k-means: unit centroids maximizing cosine to their members."""
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = _nearest(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        # An emptied list keeps its centroid
+        filled = np.bincount(assign, minlength=n_lists) > 0
+        centroids[filled] = _normalize(sums[filled])
+    return centroids
+
+
+class SimilarIndex:
+    """
+    Approximate nearest neighbours by cosine over resource embeddings.
+
+    An inverted-file (IVF) index: k-means centroids split the vectors into
+    lists, stored list after list, and a query scores only the vectors of
+    the `nprobe` lists whose centroids are closest to it. Built by the ETL
+    and memory-mapped by the API (write_similar()/load_similar()).
+    """
+
+    def __init__(self, vectors: np.ndarray, centroids: np.ndarray, list_offsets: np.ndarray, positions: np.ndarray):
+        # vectors[i] belongs to store position positions[i]
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.positions = positions
+        self.slots = np.empty(len(positions), dtype=np.int64)
+        self.slots[positions] = np.arange(len(positions))
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @classmethod
+    def build(cls, store: ResourceStore, seed: int = 0) -> "SimilarIndex":
+        vectors = embed(store)
+        n = len(vectors)
+        n_lists = min(MAX_LISTS, max(1, round(math.sqrt(n)))) if n else 0
+
+        rng = np.random.default_rng(seed)
+        sample = vectors[np.sort(rng.choice(n, min(n, n_lists * TRAIN_PER_LIST), replace=False))]
+        centroids = (
+            _kmeans(_normalize(sample.astype(np.float32)), n_lists, rng)
+            if n else np.zeros((0, EMBED_DIM), dtype=np.float32)
+        )
+
+        assign = _nearest(vectors, centroids) if n else np.zeros(0, dtype=np.int64)
+        positions = np.argsort(assign, kind="stable")
+        list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=n_lists), out=list_offsets[1:])
+        return cls(vectors[positions], centroids, list_offsets, positions)
+
+    def neighbours(self, position: int, k: int, nprobe: int = DEFAULT_NPROBE) -> List[SearchHit]:
+        """The `k` resources most similar to the one at `position`, best first."""
+        slot = self.slots[position]
+        query = self.vectors[slot].astype(np.float32)
+        if not query.any():
+            return []
+
+        n_lists = len(self.centroids)
+        closeness = self.centroids @ query
+        if nprobe < n_lists:
+            lists = np.argpartition(-closeness, nprobe - 1)[:nprobe]
+        else:
+            lists = np.arange(n_lists)
+
+        starts = self.list_offsets[lists]
+        candidates = _ranges(starts, self.list_offsets[lists + 1] - starts)
+        candidates = candidates[candidates != slot]
+        scores = self.vectors[candidates].astype(np.float32) @ query / QUANT_SCALE**2
+        return top_hits(self.positions[candidates], scores, k)
+
+
+def write_similar(index: SimilarIndex, path: str, source: Optional[Dict] = None) -> None:
+    """Write `index` (atomically); `source` identifies the dataset JSON (see source_info())."""
+    header = {"count": len(index), "dim": EMBED_DIM, "source": source}
+    write_arrays(path, SIMILAR_MAGIC, header, {
+        "vectors": index.vectors,
+        "centroids": index.centroids,
+        "list_offsets": index.list_offsets,
+        "positions": index.positions,
+    })
+
+
+def load_similar(path: str) -> Tuple[SimilarIndex, Optional[Dict]]:
+    """
+    Memory-map an index written by write_similar(). Returns it and the
+    source it was built from. Raises ValueError if the file is not one.
+    """
+    try:
+        header, arrays = map_arrays(path, SIMILAR_MAGIC)
+    except ValueError:
+        raise ValueError(f"Not a similar-resources index: {path}") from None
+
+    index = SimilarIndex(arrays["vectors"], arrays["centroids"], arrays["list_offsets"], arrays["positions"])
+    if len(index) != header["count"] or index.vectors.shape != (header["count"], EMBED_DIM):
+        raise ValueError(f"Corrupt similar-resources index: {path}")
+    return index, header["source"]
@@ -0,0 +1,463 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from functools import cached_property
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class StringTable:
+    """
+    Many strings packed into one UTF-8 buffer plus an offsets array.
+
+    Costs a few bytes per string instead of a full Python str object each.
+    """
+
+    def __init__(self, buffer: np.ndarray, offsets: np.ndarray):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.buffer[start:end].tobytes().decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        data = self.buffer.tobytes()
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end].decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return self.buffer.nbytes + self.offsets.nbytes
+
+
+class Categorical:
+    """
+    Interned low-cardinality strings: one small code per record.
+
+    Categories are numbered in order of first appearance.
+    """
+
+    def __init__(self, codes: np.ndarray, categories: List[str]):
+        self.codes = codes
+        self.categories = categories
+        self._lookup = {c: i for i, c in enumerate(categories)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.categories[self.codes[i]]
+
+    def code(self, value: str) -> Optional[int]:
+        return self._lookup.get(value)
+
+    def mask(self, value: str) -> np.ndarray:
+        """Boolean array: records whose value equals `value` exactly."""
+        code = self.code(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def counts(self) -> np.ndarray:
+        """Record count per category code."""
+        return np.bincount(self.codes, minlength=len(self.categories))
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+
+class LabelSets:
+    """
+    A few labels per record, in CSR layout: record i's label codes are
+    codes[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, codes: np.ndarray, offsets: np.ndarray, categories: List[str]):
+        self.codes = codes
+        self.offsets = offsets
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> List[str]:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return [self.categories[c] for c in self.codes[start:end]]
+
+    def pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(record position, label code) for every label of every record."""
+        rows = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+        return rows, self.codes
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.offsets.nbytes
+
+
+class ResourceStore:
+    """
+    Columnar, array-backed resource catalog.
+
+    Only the fields the API serves are kept. Records are turned back into
+    dicts one page at a time via record()/records().
+
+    `skill_labels` holds every skill cluster a record matched (primary
+    first), from the ETL's skill_scores; filters on secondary clusters go
+    through it.
+    """
+
+    CATEGORICAL_FIELDS = ("domain", "category", "resource_type", "skill_cluster")
+    STRING_FIELDS = ("resource_name", "source_url")
+
+    def __init__(
+        self,
+        resource_id: np.ndarray,
+        resource_name: StringTable,
+        source_url: StringTable,
+        domain: Categorical,
+        category: Categorical,
+        resource_type: Categorical,
+        skill_cluster: Categorical,
+        domain_weight: np.ndarray,
+        is_github: np.ndarray,
+        skill_labels: LabelSets,
+    ):
+        self.resource_id = resource_id
+        self.resource_name = resource_name
+        self.source_url = source_url
+        self.domain = domain
+        self.category = category
+        self.resource_type = resource_type
+        self.skill_cluster = skill_cluster
+        self.domain_weight = domain_weight
+        self.is_github = is_github
+        self.skill_labels = skill_labels
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "ResourceStore":
+        builder = StoreBuilder()
+        for r in records:
+            builder.add(r)
+        return builder.build()
+
+    @classmethod
+    def load_json(cls, path: str) -> "ResourceStore":
+        """
+        Build a store straight from an enriched JSON file.
+
+        Each record is folded into the column builders as soon as it is
+        parsed, so the full list of dicts never exists in memory.
+        """
+        builder = StoreBuilder()
+
+        def add(record: Dict) -> Optional[Dict]:
+            # Nested objects (skill_scores) are handed back to their record
+            if "resource_id" not in record:
+                return record
+            builder.add(record)
+
+        with open(path, "r", encoding="utf-8") as f:
+            json.load(f, object_hook=add)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.domain_weight)
+
+    def record(self, pos: int) -> Dict:
+        return {
+            "resource_id": self.resource_id[pos].decode("utf-8"),
+            "resource_name": self.resource_name[pos],
+            "source_url": self.source_url[pos],
+            "domain": self.domain[pos],
+            "category": self.category[pos],
+            "resource_type": self.resource_type[pos],
+            "skill_cluster": self.skill_cluster[pos],
+            "domain_weight": int(self.domain_weight[pos]),
+            "is_github": bool(self.is_github[pos]),
+        }
+
+    @cached_property
+    def _id_order(self) -> np.ndarray:
+        return np.argsort(self.resource_id, kind="stable")
+
+    def find(self, resource_id: str) -> Optional[int]:
+        """Position of a resource by id (binary search over sorted ids)."""
+        key = resource_id.encode("utf-8")
+        order = self._id_order
+        i = int(np.searchsorted(self.resource_id, key, sorter=order))
+        if i < len(order) and self.resource_id[order[i]] == key:
+            return int(order[i])
+        return None
+
+    def records(self, positions: Iterable[int]) -> List[Dict]:
+        return [self.record(pos) for pos in positions]
+
+    def __iter__(self) -> Iterator[Dict]:
+        for pos in range(len(self)):
+            yield self.record(pos)
+
+    @property
+    def nbytes(self) -> int:
+        total = (
+            self.resource_id.nbytes + self.domain_weight.nbytes
+            + self.is_github.nbytes + self.skill_labels.nbytes
+        )
+        for name in self.STRING_FIELDS + self.CATEGORICAL_FIELDS:
+            total += getattr(self, name).nbytes
+        return total
+
+
+class StoreBuilder:
+    """
+    Accumulates records column by column into compact buffers.
+    """
+
+    def __init__(self):
+        self._ids = (bytearray(), array("q", [0]))
+        self._strings = {name: (bytearray(), array("q", [0])) for name in ResourceStore.STRING_FIELDS}
+        self._codes = {name: (array("I"), {}) for name in ResourceStore.CATEGORICAL_FIELDS}
+        self._weights = array("i")
+        self._github = bytearray()
+        self._labels = (array("I"), array("q", [0]), {})
+
+    def add(self, record: Dict) -> None:
+        for name, (buffer, offsets) in [("resource_id", self._ids), *self._strings.items()]:
+            buffer += (record.get(name) or "").encode("utf-8")
+            offsets.append(len(buffer))
+
+        for name, (codes, lookup) in self._codes.items():
+            value = record.get(name) or ""
+            codes.append(lookup.setdefault(value, len(lookup)))
+
+        self._weights.append(record.get("domain_weight", 0))
+        self._github.append(bool(record.get("is_github")))
+
+        codes, offsets, lookup = self._labels
+        primary = record.get("skill_cluster") or ""
+        for label in [primary, *(k for k in record.get("skill_scores") or () if k != primary)]:
+            codes.append(lookup.setdefault(label, len(lookup)))
+        offsets.append(len(codes))
+
+    def build(self) -> ResourceStore:
+        columns = {}
+
+        for name, (buffer, offsets) in self._strings.items():
+            columns[name] = StringTable(
+                np.frombuffer(buffer, dtype=np.uint8),
+                np.frombuffer(offsets, dtype=np.int64).copy(),
+            )
+
+        for name, (codes, lookup) in self._codes.items():
+            dtype = np.uint16 if len(lookup) <= np.iinfo(np.uint16).max else np.uint32
+            columns[name] = Categorical(
+                np.frombuffer(codes, dtype=np.uint32).astype(dtype),
+                list(lookup),
+            )
+
+        codes, offsets, lookup = self._labels
+        dtype = np.uint16 if len(lookup) <= np.iinfo(np.uint16).max else np.uint32
+        skill_labels = LabelSets(
+            np.frombuffer(codes, dtype=np.uint32).astype(dtype),
+            np.frombuffer(offsets, dtype=np.int64).copy(),
+            list(lookup),
+        )
+
+        return ResourceStore(
+            resource_id=self._build_ids(),
+            skill_labels=skill_labels,
+            domain_weight=np.frombuffer(self._weights, dtype=np.int32).copy(),
+            is_github=np.frombuffer(self._github, dtype=bool),
+            **columns,
+        )
+
+    def _build_ids(self) -> np.ndarray:
+        buffer, offsets = self._ids
+        lengths = np.diff(np.frombuffer(offsets, dtype=np.int64))
+
+        if len(lengths) and (lengths == lengths[0]).all() and lengths[0] > 0:
+            # Fixed-width ids (md5 hex): reinterpret the buffer in place
+            return np.frombuffer(buffer, dtype=f"S{lengths[0]}")
+
+        bounds = offsets.tolist()
+        return np.array(
+            [bytes(buffer[a:b]) for a, b in zip(bounds, bounds[1:])],
+            dtype=np.bytes_,
+        )
+
+
+# -----------------------------------------------------
+# Binary snapshot
+# -----------------------------------------------------
+# A store's arrays written out as-is, so loading is an mmap instead of a
+# JSON parse. Layout:
+#
+#   magic | header length (u64 LE) | JSON header | arrays, 64-byte aligned
+#
+# The header holds the category lists, each array's dtype/shape/offset and
+# the identity of the JSON file the snapshot was built from. Arrays are
+# read-only views over one shared, read-only mapping, so every worker
+# process maps the same page-cache pages. Other derived files (the
+# similar-resources index) use the same layout via write_arrays() and
+# map_arrays().
+
+SNAPSHOT_MAGIC = b"DRISNAP1"
+SNAPSHOT_ALIGN = 64
+
+
+def fingerprint(path: str) -> str:
+    """Content hash of a data file, used as the dataset version."""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_path(json_path: str) -> str:
+    """Where the binary snapshot of an enriched JSON file lives."""
+    return os.path.splitext(json_path)[0] + ".snapshot"
+
+
+def source_info(path: str) -> Dict:
+    """Identity of a data file: size, mtime and content hash."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "version": fingerprint(path)}
+
+
+def _align(n: int) -> int:
+    return -(-n // SNAPSHOT_ALIGN) * SNAPSHOT_ALIGN
+
+
+def _snapshot_arrays(store: ResourceStore) -> Dict[str, np.ndarray]:
+    arrays = {
+        "resource_id": store.resource_id,
+        # Saves the argsort behind find() at load time
+        "id_order": store._id_order,
+        "domain_weight": store.domain_weight,
+        "is_github": store.is_github,
+        "skill_labels.codes": store.skill_labels.codes,
+        "skill_labels.offsets": store.skill_labels.offsets,
+    }
+    for name in ResourceStore.STRING_FIELDS:
+        arrays[f"{name}.buffer"] = getattr(store, name).buffer
+        arrays[f"{name}.offsets"] = getattr(store, name).offsets
+    for name in ResourceStore.CATEGORICAL_FIELDS:
+        arrays[f"{name}.codes"] = getattr(store, name).codes
+    return arrays
+
+
+def write_arrays(path: str, magic: bytes, header: Dict, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Write named arrays in the snapshot layout (atomically); `header` is
+    stored alongside the array layout.
+    """
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+
+    layout, offset = {}, 0
+    for name, a in arrays.items():
+        offset = _align(offset)
+        layout[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        offset += a.nbytes
+
+    encoded = json.dumps({**header, "arrays": layout}, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(magic) + 8 + len(encoded))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(magic)
+        f.write(struct.pack("<Q", len(encoded)))
+        f.write(encoded)
+        for name, a in arrays.items():
+            f.write(b"\0" * (data_start + layout[name]["offset"] - f.tell()))
+            f.write(a.tobytes())
+    os.replace(tmp_path, path)
+
+
+def map_arrays(path: str, magic: bytes) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """
+    Memory-map a file written by write_arrays(). Returns its header and
+    read-only array views. Raises ValueError on a different magic.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    prefix = len(magic) + 8
+    if len(buffer) < prefix or buffer[:len(magic)] != magic:
+        raise ValueError(f"Not a {magic.decode()} file: {path}")
+    (header_length,) = struct.unpack("<Q", buffer[len(magic):prefix])
+    header = json.loads(buffer[prefix:prefix + header_length].decode("utf-8"))
+    data_start = _align(prefix + header_length)
+
+    arrays = {}
+    for name, spec in header.pop("arrays").items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        if not count:
+            # An empty trailing array may start past the end of the file
+            arrays[name] = np.empty(spec["shape"], dtype=dtype)
+            continue
+        arrays[name] = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=data_start + spec["offset"]
+        ).reshape(spec["shape"])
+    return header, arrays
+
+
+def write_snapshot(store: ResourceStore, path: str, source: Optional[Dict] = None) -> None:
+    """
+    Write `store` as a binary snapshot (atomically). `source` identifies
+    the JSON file it was built from (see source_info()).
+    """
+    header = {
+        "count": len(store),
+        "source": source,
+        "categories": {
+            name: getattr(store, name).categories
+            for name in ResourceStore.CATEGORICAL_FIELDS + ("skill_labels",)
+        },
+    }
+    write_arrays(path, SNAPSHOT_MAGIC, header, _snapshot_arrays(store))
+
+
+def load_snapshot(path: str) -> Tuple[ResourceStore, Optional[Dict]]:
+    """
+    Memory-map a snapshot. Returns the store and the source it was built
+    from. Raises ValueError if the file is not a valid snapshot.
+    """
+    try:
+        header, arrays = map_arrays(path, SNAPSHOT_MAGIC)
+    except ValueError:
+        raise ValueError(f"Not a resource snapshot: {path}") from None
+
+    categories = header["categories"]
+    store = ResourceStore(
+        resource_id=arrays["resource_id"],
+        domain_weight=arrays["domain_weight"],
+        is_github=arrays["is_github"],
+        skill_labels=LabelSets(
+            arrays["skill_labels.codes"],
+            arrays["skill_labels.offsets"],
+            categories["skill_labels"],
+        ),
+        **{
+            name: StringTable(arrays[f"{name}.buffer"], arrays[f"{name}.offsets"])
+            for name in ResourceStore.STRING_FIELDS
+        },
+        **{
+            name: Categorical(arrays[f"{name}.codes"], categories[name])
+            for name in ResourceStore.CATEGORICAL_FIELDS
+        },
+    )
+    if len(store) != header["count"]:
+        raise ValueError(f"Corrupt resource snapshot: {path}")
+    store.__dict__["_id_order"] = arrays["id_order"]
+    return store, header["source"]
@@ -0,0 +1,253 @@
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from api.search import _ranges
+from api.store import ResourceStore, StringTable
+
+# Kinds of suggestion, in response order
+SUGGEST_KINDS = ("skill", "category", "domain", "name")
+
+# Leading bytes of each key held in the sorted key array; longer prefixes
+# are confirmed against the text
+KEY_BYTES = 16
+
+# Prefixes matching more keys than this keep a precomputed top-k list;
+# smaller ranges are ranked at lookup time
+NODE_MIN_KEYS = 64
+
+# Most suggestions per kind and per prefix
+MAX_SUGGESTIONS = 10
+
+
+def _string_table(texts: List[str]) -> StringTable:
+    encoded = [t.encode("utf-8") for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return StringTable(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+
+def _lowered(table: StringTable) -> StringTable:
+    """`table` lower-cased: ASCII in bulk, strings with other bytes via str.lower()."""
+    buffer = table.buffer.copy()
+    buffer[(buffer >= 65) & (buffer <= 90)] += 32
+
+    wide = np.flatnonzero(buffer >= 128)
+    if not len(wide):
+        return StringTable(buffer, table.offsets)
+
+    # Non-ASCII lower-casing can change a string's byte length
+    rows = np.searchsorted(table.offsets, wide, side="right") - 1
+    rows = rows[np.r_[True, rows[1:] != rows[:-1]]]
+    encoded = [table[i].lower().encode("utf-8") for i in rows.tolist()]
+
+    lengths = np.diff(table.offsets)
+    new_lengths = lengths.copy()
+    new_lengths[rows] = [len(b) for b in encoded]
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(new_lengths, out=offsets[1:])
+
+    out = np.empty(int(offsets[-1]), dtype=np.uint8)
+    ascii_rows = np.ones(len(lengths), dtype=bool)
+    ascii_rows[rows] = False
+    at = np.flatnonzero(ascii_rows)
+    out[_ranges(offsets[at], lengths[at])] = buffer[_ranges(table.offsets[at], lengths[at])]
+    for row, data in zip(rows.tolist(), encoded):
+        out[offsets[row]:offsets[row] + len(data)] = np.frombuffer(data, dtype=np.uint8)
+    return StringTable(out, offsets)
+
+
+def _word_starts(table: StringTable):
+    """(row, byte position) of every word start, as TOKEN_RE splits words."""
+    buffer = table.buffer
+    # Lower-cased already; any non-ASCII byte counts as a word byte
+    word = ((buffer >= 48) & (buffer <= 57)) | ((buffer >= 97) & (buffer <= 122)) | (buffer >= 128)
+    start = word.copy()
+    start[1:] &= ~word[:-1]
+    firsts = table.offsets[:-1][np.diff(table.offsets) > 0]
+    start[firsts] = word[firsts]
+
+    positions = np.flatnonzero(start)
+    rows = np.searchsorted(table.offsets, positions, side="right") - 1
+    return rows, positions
+
+
+class PrefixIndex:
+    """
+    Prefix index over the words of many texts: "data" finds "Big Data
+    Guide" (its words "big data guide", "data guide" and "guide" are
+    keys).
+
+    Keys are the first KEY_BYTES lower-cased bytes from every word start,
+    in one sorted array. Every prefix matching more than NODE_MIN_KEYS
+    keys (a heavy node of the implied trie) stores its top texts by
+    weight, so a lookup is one dict probe; other prefixes match few keys,
+    found by binary search and ranked on the spot. Prefixes longer than
+    KEY_BYTES are confirmed against the lower-cased texts.
+    """
+
+    def __init__(self, texts: StringTable, weights: np.ndarray):
+        self.texts = texts
+        n = len(texts)
+
+        # Rank of each text: by weight, heaviest first, then by position
+        self.by_rank = np.argsort(-np.asarray(weights, dtype=np.int64), kind="stable")
+        self.rank = np.empty(n, dtype=np.int64)
+        self.rank[self.by_rank] = np.arange(n)
+
+        # Kept to confirm prefixes longer than KEY_BYTES
+        self.lowered = lowered = _lowered(texts)
+        rows, positions = _word_starts(lowered)
+        padded = np.concatenate([lowered.buffer, np.zeros(KEY_BYTES, dtype=np.uint8)])
+        keys = np.lib.stride_tricks.sliding_window_view(padded, KEY_BYTES)[positions]
+        # Zero the bytes past the end of each text
+        keys[np.arange(KEY_BYTES) >= (lowered.offsets[rows + 1] - positions)[:, None]] = 0
+
+        order = np.argsort(keys.view(f"S{KEY_BYTES}").ravel(), kind="stable")
+        keys = keys[order]
+        self.keys = keys.view(f"S{KEY_BYTES}").ravel()
+        self.key_text = rows[order].astype(np.int32 if n < 2**31 else np.int64)
+        # Byte offset of the key in the lower-cased text
+        self.key_start = (positions - lowered.offsets[rows])[order].astype(np.int32)
+
+        self._build_nodes(keys)
+
+    def _build_nodes(self, keys: np.ndarray) -> None:
+        n_keys = len(keys)
+        key_rank = self.rank[self.key_text]
+        n = max(len(self.texts), 1)
+
+        # Common prefix length of each pair of neighbouring keys
+        lcp = np.zeros(max(n_keys - 1, 0), dtype=np.int64)
+        same = np.ones(len(lcp), dtype=bool)
+        for j in range(KEY_BYTES):
+            same &= (keys[1:, j] == keys[:-1, j]) & (keys[1:, j] != 0)
+            lcp += same
+
+        has_keys = np.zeros(len(self.texts), dtype=bool)
+        has_keys[self.key_text] = True
+        root = np.full((1, MAX_SUGGESTIONS), -1, dtype=np.int64)
+        top = self.by_rank[has_keys[self.by_rank]][:MAX_SUGGESTIONS]
+        root[0, :len(top)] = top
+        tops = [root]
+        self.nodes: Dict[bytes, int] = {b"": 0}
+
+        # Keys under a heavy node one byte shorter (children of light nodes
+        # are light), with their group at the current depth
+        active = np.arange(n_keys)
+        for depth in range(1, KEY_BYTES + 1):
+            if not len(active):
+                break
+            breaks = np.empty(len(active), dtype=bool)
+            breaks[0] = True
+            np.less(lcp[active[:-1]], depth, out=breaks[1:])
+            breaks[1:] |= active[1:] != active[:-1] + 1
+            group = np.cumsum(breaks) - 1
+            heavy = np.bincount(group) > NODE_MIN_KEYS
+            keep = heavy[group]
+            active, group = active[keep], group[keep]
+            if not len(active):
+                break
+
+            # Per heavy group: its texts by rank, each text once
+            sort_key = np.sort(group * n + key_rank[active])
+            sort_key = sort_key[np.r_[True, sort_key[1:] != sort_key[:-1]]]
+            groups, ranks = np.divmod(sort_key, n)
+            first = np.r_[True, groups[1:] != groups[:-1]]
+            index = np.arange(len(groups))
+            within = index - np.maximum.accumulate(np.where(first, index, 0))
+
+            node = np.cumsum(first) - 1
+            table = np.full((int(first.sum()), MAX_SUGGESTIONS), -1, dtype=np.int64)
+            kept = within < MAX_SUGGESTIONS
+            table[node[kept], within[kept]] = self.by_rank[ranks[kept]]
+
+            # Prefix bytes of each heavy group, from its first key
+            group_first = active[np.r_[True, group[1:] != group[:-1]]]
+            prefixes = np.ascontiguousarray(keys[group_first, :depth]).tobytes()
+            base = len(self.nodes)
+            for i in range(len(table)):
+                self.nodes[prefixes[i * depth:(i + 1) * depth]] = base + i
+            tops.append(table)
+
+        self.tops = np.concatenate(tops)
+
+    def lookup(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> List[int]:
+        """Texts with a word starting with `prefix`, heaviest first."""
+        key = prefix.lower().encode("utf-8")
+        node = self.nodes.get(key)
+        if node is not None:
+            top = self.tops[node]
+            return top[top >= 0][:limit].tolist()
+
+        head = key[:KEY_BYTES]
+        lo = int(np.searchsorted(self.keys, head, side="left"))
+        hi = int(np.searchsorted(self.keys, head + b"\xff" * (KEY_BYTES - len(head)), side="right"))
+        texts = self.key_text[lo:hi]
+        if len(key) > KEY_BYTES:
+            texts = texts[self._continues(lo, hi, key)]
+
+        ranks = np.sort(self.rank[texts])
+        ranks = ranks[np.r_[True, ranks[1:] != ranks[:-1]]] if len(ranks) else ranks
+        return self.by_rank[ranks[:limit]].tolist()
+
+    def _continues(self, lo: int, hi: int, key: bytes) -> np.ndarray:
+        """Whether keys lo..hi, which match key[:KEY_BYTES], go on to match all of it."""
+        table = self.lowered
+        tail = np.frombuffer(key[KEY_BYTES:], dtype=np.uint8)
+        begin = table.offsets[self.key_text[lo:hi]] + self.key_start[lo:hi] + KEY_BYTES
+        fits = begin + len(tail) <= table.offsets[self.key_text[lo:hi] + 1]
+        at = np.minimum(begin[:, None] + np.arange(len(tail)), len(table.buffer) - 1)
+        return fits & (table.buffer[at] == tail).all(axis=1)
+
+
+class Suggestion(NamedTuple):
+    kind: str
+    text: str
+    weight: int
+    resource_id: Optional[str] = None
+
+
+class Suggester:
+    """
+    Typeahead over skills, categories, domains and resource names.
+
+    A name weighs its record's domain_weight; a skill, category or domain
+    weighs the summed domain_weight of its records.
+    """
+
+    def __init__(self, store: ResourceStore):
+        self.store = store
+        weights = store.domain_weight.astype(np.int64)
+        self.indexes: Dict[str, PrefixIndex] = {}
+        self.values: Dict[str, List[str]] = {}
+        self.weights: Dict[str, np.ndarray] = {}
+
+        rows, codes = store.skill_labels.pairs()
+        aggregates = {
+            "skill": (store.skill_labels.categories, codes, weights[rows]),
+            "category": (store.category.categories, store.category.codes, weights),
+            "domain": (store.domain.categories, store.domain.codes, weights),
+        }
+        for kind, (values, value_codes, value_weights) in aggregates.items():
+            totals = np.bincount(value_codes, weights=value_weights, minlength=len(values))
+            counts = np.bincount(value_codes, minlength=len(values))
+            keep = [i for i, v in enumerate(values) if v and counts[i]]
+            self.values[kind] = [values[i] for i in keep]
+            self.weights[kind] = totals[keep].astype(np.int64)
+            self.indexes[kind] = PrefixIndex(_string_table(self.values[kind]), self.weights[kind])
+
+        self.weights["name"] = weights
+        self.indexes["name"] = PrefixIndex(store.resource_name, weights)
+
+    def suggest(self, prefix: str, kind: str, limit: int = MAX_SUGGESTIONS) -> List[Suggestion]:
+        found = self.indexes[kind].lookup(prefix, limit)
+        weights = self.weights[kind]
+        if kind != "name":
+            return [Suggestion(kind, self.values[kind][i], int(weights[i])) for i in found]
+
+        store = self.store
+        return [
+            Suggestion(kind, store.resource_name[i], int(weights[i]), store.resource_id[i].decode("ascii"))
+            for i in found
+        ]
@@ -0,0 +1,102 @@
+"""
+Markdown extraction benchmark: the precompiled single-pass parser in
+etl.extract vs the previous line-by-line parser.
+
+Synthetic READMEs mimic aggregated awesome-lists: nested headings, list
+items nested a few levels deep, and one to three links per item. The
+previous parser is kept here (as legacy_iter_resources) as the baseline,
+and both are checked to extract the same links before timing.
+
+Usage:
+    python -m benchmarks.bench_extract [--links 10000 100000 1000000] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import time
+from datetime import datetime, timezone
+
+from benchmarks.synthetic import CATEGORIES, WORDS
+from etl.extract import iter_resources
+
+
+def legacy_iter_resources(markdown_text):
+    current_category = "Uncategorized"
+
+    for line in markdown_text.split("\n"):
+        heading_match = re.match(r"#{1,6}\s+(.*)", line)
+        if heading_match:
+            current_category = heading_match.group(1).strip()
+            continue
+
+        links = re.findall(r"\[(.*?)\]\((https?://[^)]+)\)", line)
+        for name, url in links:
+            yield {
+                "resource_name": name.strip(),
+                "source_url": url.strip(),
+                "category": current_category,
+                "extracted_at": datetime.now(timezone.utc).isoformat()
+            }
+
+
+def generate_markdown(n_links: int, seed: int = 7) -> str:
+    """A README with about `n_links` inline links. Deterministic per seed."""
+    rng = random.Random(seed)
+    lines = ["# Awesome Synthetic", "", "Intro text with no links at all.", ""]
+    links = 0
+
+    while links < n_links:
+        lines.append(f"## {rng.choice(CATEGORIES).title()}")
+        for _ in range(rng.randint(1, 4)):
+            lines.append(f"### {rng.choice(WORDS).title()} {links}")
+            lines.append("")
+            for _ in range(rng.randint(5, 40)):
+                depth = rng.choice([0, 0, 0, 1, 1, 2])
+                items = []
+                for _ in range(rng.choice([1, 1, 1, 2, 3])):
+                    name = f"{rng.choice(WORDS).title()} {links}"
+                    items.append(f"[{name}](https://site{rng.randint(0, 999)}.example.com/r/{links})")
+                    links += 1
+                lines.append(f"{'  ' * depth}- {' / '.join(items)} - a short description.")
+            lines.append("")
+
+    return "\n".join(lines)
+
+
+def _time(parse, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n = sum(1 for _ in parse(text))
+        best = min(best, time.perf_counter() - start)
+    return best, n
+
+
+def strip(records):
+    return [(r["category"], r["resource_name"], r["source_url"]) for r in records]
+
+
+def run(sizes, repeat):
+    print(f"{'links':>10} {'MB':>7} {'legacy s':>9} {'parser s':>9} {'speedup':>8} {'links/s':>12}")
+
+    for n in sizes:
+        text = generate_markdown(n)
+        assert strip(iter_resources(text)) == strip(legacy_iter_resources(text))
+
+        legacy, count = _time(legacy_iter_resources, text, repeat)
+        current, _ = _time(iter_resources, text, repeat)
+        print(f"{count:>10} {len(text) / 1e6:>7.1f} {legacy:>9.3f} {current:>9.3f} "
+              f"{legacy / current:>7.1f}x {count / current:>12,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--links", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.links, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
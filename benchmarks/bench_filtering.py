@@ -0,0 +1,90 @@
+"""
+Filtering benchmark: linear catalog scan vs the precomputed ResourceIndex.
+
+Usage:
+    python -m benchmarks.bench_filtering [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+from statistics import quantiles
+
+from api.index import ResourceIndex
+from api.store import ResourceStore
+from benchmarks.synthetic import generate_resources, SKILL_WEIGHTS, RESOURCE_TYPE_WEIGHTS
+
+
+def linear_filter(resources, skill, resource_type=None, minimum_domain_weight=None):
+    """The pre-index filtering path of get_recommendations."""
+    filtered = [r for r in resources if r["skill_cluster"].lower() == skill]
+    if resource_type:
+        filtered = [r for r in filtered if r["resource_type"].lower() == resource_type]
+    if minimum_domain_weight is not None:
+        filtered = [r for r in filtered if r["domain_weight"] >= minimum_domain_weight]
+    return filtered
+
+
+def make_queries(n_queries, seed=7):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        queries.append((
+            rng.choice(list(SKILL_WEIGHTS)),
+            rng.choice([None, None] + list(RESOURCE_TYPE_WEIGHTS)),
+            rng.choice([None, None, 1, 3, 10]),
+        ))
+    return queries
+
+
+def percentiles_us(samples_ns):
+    if len(samples_ns) < 2:
+        value = samples_ns[0] / 1000
+        return value, value
+    cuts = quantiles(samples_ns, n=100, method="inclusive")
+    return cuts[49] / 1000, cuts[98] / 1000
+
+
+def time_queries(fn, queries):
+    samples = []
+    for q in queries:
+        start = time.perf_counter_ns()
+        fn(*q)
+        samples.append(time.perf_counter_ns() - start)
+    return percentiles_us(samples)
+
+
+def run(sizes):
+    print(f"{'records':>10} {'build ms':>10} {'scan p50 us':>12} {'scan p99 us':>12} "
+          f"{'index p50 us':>13} {'index p99 us':>13}")
+
+    for n in sizes:
+        resources = generate_resources(n)
+
+        store = ResourceStore.from_records(resources)
+
+        start = time.perf_counter()
+        index = ResourceIndex(store)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Keep the scan run bounded at large sizes
+        n_scan = max(20, min(500, 20_000_000 // n))
+        scan = time_queries(
+            lambda s, t, w: linear_filter(resources, s, t, w),
+            make_queries(n_scan),
+        )
+        indexed = time_queries(index.lookup, make_queries(5000))
+
+        print(f"{n:>10} {build_ms:>10.1f} {scan[0]:>12.1f} {scan[1]:>12.1f} "
+              f"{indexed[0]:>13.2f} {indexed[1]:>13.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
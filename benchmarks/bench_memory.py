@@ -0,0 +1,86 @@
+"""
+Memory benchmark: resources held as a list of dicts (json.load) vs the
+columnar ResourceStore. Each measurement runs in a fresh subprocess and
+reports live heap (tracemalloc) and resident set size.
+
+Usage:
+    python -m benchmarks.bench_memory [--sizes 100000 1000000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks.synthetic import generate_resources
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def measure(kind: str, path: str) -> None:
+    """Load `path` as `kind` and print "heap_mb rss_mb"."""
+    from api.store import ResourceStore
+
+    gc.collect()
+    rss_before = rss_mb()
+    tracemalloc.start()
+
+    if kind == "store":
+        data = ResourceStore.load_json(path)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    gc.collect()
+    heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{heap / 1e6:.1f} {rss_mb() - rss_before:.1f}")
+
+
+def run(sizes):
+    print(f"{'records':>10} {'dicts heap MB':>14} {'store heap MB':>14} "
+          f"{'dicts RSS MB':>13} {'store RSS MB':>13} {'heap ratio':>11}")
+
+    for n in sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(generate_resources(n), f)
+            path = f.name
+
+        try:
+            results = {}
+            for kind in ("dicts", "store"):
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_memory", "--measure", kind, path],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                results[kind] = [float(x) for x in out]
+        finally:
+            os.unlink(path)
+
+        dicts, store = results["dicts"], results["store"]
+        print(f"{n:>10} {dicts[0]:>14.1f} {store[0]:>14.1f} "
+              f"{dicts[1]:>13.1f} {store[1]:>13.1f} {dicts[0] / store[0]:>10.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--measure", nargs=2, metavar=("KIND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+    else:
+        run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
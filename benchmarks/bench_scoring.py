@@ -0,0 +1,60 @@
+"""
+ML scoring microbenchmark: one model.predict() per resource vs one batched
+call over the whole candidate set.
+
+Usage:
+    python -m benchmarks.bench_scoring [--sizes 100 5000 100000]
+"""
+
+import argparse
+import time
+import warnings
+
+import api.ml.ranker as ranker
+from benchmarks.synthetic import generate_resources
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(sizes):
+    if ranker._load_model() is None:
+        raise SystemExit(f"No model at {ranker.MODEL_PATH}")
+
+    print(f"{'resources':>10} {'per-record ms':>14} {'batch ms':>10} "
+          f"{'batch (precomputed X) ms':>25} {'speedup':>8}")
+
+    for n in sizes:
+        resources = generate_resources(n)
+        features = ranker.build_feature_matrix(resources)
+
+        # The per-record path is slow; sample it at large sizes and scale up
+        sample = resources[: min(n, 5000)]
+        per_record = best_of(lambda: [ranker.predict_score(r) for r in sample], 3)
+        per_record *= n / len(sample)
+
+        batch = best_of(lambda: ranker.predict_scores_batch(resources), 5)
+        precomputed = best_of(lambda: ranker.predict_scores_batch(features=features), 5)
+
+        print(f"{n:>10} {per_record:>14.1f} {batch:>10.2f} "
+              f"{precomputed:>25.3f} {per_record / batch:>7.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 5_000, 100_000])
+    args = parser.parse_args()
+
+    # The bundled model was pickled by an older scikit-learn
+    warnings.filterwarnings("ignore", category=UserWarning)
+    run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
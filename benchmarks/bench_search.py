@@ -0,0 +1,78 @@
+"""
+Search benchmark: SearchIndex build time (fresh, and incremental after a
+reload that changes 1% of names) and query latency per query shape, on
+synthetic catalogs.
+
+Query latency covers index matching plus top-10 selection, i.e. the
+search work of /v1/search without HTTP and JSON.
+
+Usage:
+    python -m benchmarks.bench_search [--sizes 100000 1000000] [--queries 2000]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from api.search import SearchIndex, top_hits
+from api.store import ResourceStore
+from benchmarks.synthetic import WORDS, generate_resources
+
+
+def query_shapes(n, rng):
+    """Query makers by shape: (text, prefix)."""
+    return {
+        "rare term": lambda: (str(rng.randrange(n)), False),
+        "common term": lambda: (rng.choice(WORDS), False),
+        "two terms": lambda: (f"{rng.choice(WORDS)} {rng.choice(WORDS)}", False),
+        "term + id": lambda: (f"{rng.choice(WORDS)} {rng.randrange(n)}", False),
+        "prefix (3)": lambda: (rng.choice(WORDS)[:3], True),
+        "word + prefix": lambda: (f"{rng.choice(WORDS)} {rng.choice(WORDS)[:2]}", True),
+    }
+
+
+def run(sizes, n_queries):
+    print(f"{'records':>10} {'query':>14} {'p50 ms':>8} {'p99 ms':>8} {'avg hits':>10}")
+
+    for n in sizes:
+        records = generate_resources(n)
+        store = ResourceStore.from_records(records)
+
+        start = time.perf_counter()
+        index = SearchIndex(store)
+        fresh = time.perf_counter() - start
+
+        rng = random.Random(1)
+        for i in rng.sample(range(n), n // 100):
+            records[i] = {**records[i], "resource_name": f"{records[i]['resource_name']} v2"}
+        reloaded = ResourceStore.from_records(records)
+        start = time.perf_counter()
+        SearchIndex(reloaded, previous=index)
+        incremental = time.perf_counter() - start
+        print(f"{n:>10} build {fresh:.2f}s fresh, {incremental:.2f}s incremental (1% changed)")
+
+        for shape, make in query_shapes(n, rng).items():
+            times, hits = [], 0
+            for _ in range(n_queries):
+                text, prefix = make()
+                start = time.perf_counter()
+                positions, scores = index.match(text, prefix=prefix)
+                top_hits(positions, scores, 10)
+                times.append(time.perf_counter() - start)
+                hits += len(positions)
+            p50, p99 = np.percentile(times, [50, 99]) * 1000
+            print(f"{n:>10} {shape:>14} {p50:>8.3f} {p99:>8.3f} {hits / n_queries:>10,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Similar-resources benchmark: IVF index build time and size, then query
+latency and recall@10 against brute-force cosine, per nprobe, on
+synthetic catalogs.
+
+Usage:
+    python -m benchmarks.bench_similar [--sizes 100000 1000000] [--queries 500]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from api.similar import QUANT_SCALE, SimilarIndex, load_similar, write_similar
+from api.store import ResourceStore
+from benchmarks.synthetic import generate_resources
+
+
+def exact_scores(index, position):
+    query = index.vectors[index.slots[position]].astype(np.float32)
+    scores = np.concatenate([
+        index.vectors[start:start + 65536].astype(np.float32) @ query
+        for start in range(0, len(index), 65536)
+    ]) / QUANT_SCALE**2
+    scores[index.slots[position]] = -np.inf
+    return scores
+
+
+def run(sizes, n_queries):
+    print(f"{'records':>10} {'nprobe':>7} {'p50 ms':>8} {'p99 ms':>8} {'recall@10':>10}")
+
+    for n in sizes:
+        store = ResourceStore.from_records(generate_resources(n))
+        start = time.perf_counter()
+        built = SimilarIndex.build(store)
+        build_s = time.perf_counter() - start
+
+        path = os.path.join(tempfile.mkdtemp(), "resources.similar")
+        write_similar(built, path)
+        start = time.perf_counter()
+        index, _ = load_similar(path)
+        load_s = time.perf_counter() - start
+        print(f"{n:>10} build {build_s:.2f}s, {len(index.centroids)} lists, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB, load {load_s * 1000:.1f} ms")
+
+        rng = np.random.default_rng(1)
+        positions = rng.choice(n, n_queries, replace=False).tolist()
+
+        times = []
+        tenth_best = {}
+        for position in positions[:100]:
+            start = time.perf_counter()
+            scores = exact_scores(index, position)
+            tenth_best[position] = np.partition(scores, len(scores) - 10)[len(scores) - 10]
+            times.append(time.perf_counter() - start)
+        print(f"{n:>10} {'exact':>7} {np.percentile(times, 50) * 1000:>8.3f} "
+              f"{np.percentile(times, 99) * 1000:>8.3f} {1:>10.3f}")
+
+        for nprobe in (1, 4, 8, 16):
+            times, recall = [], []
+            for position in positions:
+                start = time.perf_counter()
+                hits = index.neighbours(position, 10, nprobe=nprobe)
+                times.append(time.perf_counter() - start)
+                if position in tenth_best:
+                    # Scores tie often; a hit counts if it scores as well as the 10th best
+                    recall.append(np.mean([h.score >= tenth_best[position] - 1e-6 for h in hits]))
+            p50, p99 = np.percentile(times, [50, 99]) * 1000
+            print(f"{n:>10} {nprobe:>7} {p50:>8.3f} {p99:>8.3f} {np.mean(recall):>10.3f}")
+
+        os.unlink(path)
+        os.rmdir(os.path.dirname(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
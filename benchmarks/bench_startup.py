@@ -0,0 +1,96 @@
+"""
+API startup benchmark: building the Dataset from the enriched JSON vs
+memory-mapping the ETL's binary snapshot. Each measurement runs in a fresh
+subprocess, like a new uvicorn worker.
+
+Reports load and index time, plus the worker's anonymous (private) memory
+and its file-backed memory, which the page cache shares between workers.
+
+Usage:
+    python -m benchmarks.bench_startup [--sizes 100000 1000000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_resources
+
+
+def memory_mb():
+    """(anonymous, file-backed) resident memory of this process in MB."""
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0]) / 1e3
+    return fields["RssAnon"], fields["RssFile"]
+
+
+def measure(kind: str, path: str) -> None:
+    """Load `path` as `kind` and print "load_s index_s anon_mb file_mb"."""
+    from api.index import ResourceIndex
+    from api.store import ResourceStore, load_snapshot, snapshot_path
+
+    anon_before, file_before = memory_mb()
+    start = time.perf_counter()
+    if kind == "snapshot":
+        store, _ = load_snapshot(snapshot_path(path))
+        # Touch every column, as serving eventually does
+        sum(int(a.sum()) for a in (store.domain_weight, store.resource_name.buffer, store.source_url.buffer))
+    else:
+        store = ResourceStore.load_json(path)
+    loaded = time.perf_counter()
+    ResourceIndex(store)
+    indexed = time.perf_counter()
+
+    anon, file = memory_mb()
+    print(f"{loaded - start:.4f} {indexed - loaded:.4f} {anon - anon_before:.1f} {file - file_before:.1f}")
+
+
+def run(sizes):
+    print(f"{'records':>10} {'source':>9} {'load s':>8} {'index s':>8} "
+          f"{'private MB':>11} {'shared MB':>10}")
+
+    for n in sizes:
+        from api.store import ResourceStore, snapshot_path, source_info, write_snapshot
+
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "resources_enriched.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(generate_resources(n), f, indent=2)
+        write_snapshot(ResourceStore.load_json(path), snapshot_path(path), source_info(path))
+
+        try:
+            for kind in ("json", "snapshot"):
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_startup", "--measure", kind, path],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                load, index, anon, file = (float(x) for x in out)
+                print(f"{n:>10} {kind:>9} {load:>8.3f} {index:>8.3f} {anon:>11.1f} {file:>10.1f}")
+        finally:
+            os.unlink(path)
+            os.unlink(snapshot_path(path))
+            os.rmdir(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--measure", nargs=2, metavar=("KIND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+    else:
+        run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Storage backend benchmark: recommendation queries served from the
+in-memory Dataset vs the SQLite catalog.
+
+Both backends answer the same random queries (skill, resource_type,
+minimum_domain_weight, offset) in full and demo mode through
+get_recommendations().
+
+Usage:
+    python -m benchmarks.bench_storage [--sizes 1000 100000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import warnings
+
+from sqlalchemy import create_engine, insert
+
+from api.data import Dataset
+from api.service import get_recommendations
+from api.service.backends import MemoryBackend, set_backend
+from api.service.sqlite_backend import SQLiteBackend
+from api.store import ResourceStore
+from benchmarks.bench_filtering import percentiles_us
+from benchmarks.synthetic import generate_resources, SKILL_WEIGHTS, RESOURCE_TYPE_WEIGHTS
+from db.database import Base
+from db.models import CatalogMeta, Resource
+from db.seed import serving_rows
+
+
+def build_sqlite(path, resources, version):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+
+    rows, meta = serving_rows(resources)
+    meta["dataset_version"] = version
+
+    with engine.begin() as conn:
+        conn.execute(insert(Resource), rows)
+        conn.execute(insert(CatalogMeta), [{"key": k, "value": v} for k, v in meta.items()])
+    engine.dispose()
+
+
+def make_queries(n_queries, seed=11):
+    rng = random.Random(seed)
+    return [
+        (
+            rng.choice(list(SKILL_WEIGHTS)),
+            rng.choice([None, None] + list(RESOURCE_TYPE_WEIGHTS)),
+            rng.choice([None, None, 1, 3]),
+            rng.choice([0, 0, 20, 200, 2000]),
+        )
+        for _ in range(n_queries)
+    ]
+
+
+def time_backend(backend, dataset, access_mode, queries):
+    set_backend(backend)
+    samples = []
+    for skill, rtype, weight, offset in queries:
+        start = time.perf_counter_ns()
+        get_recommendations(skill, 20, offset, rtype, weight, access_mode, dataset)
+        samples.append(time.perf_counter_ns() - start)
+    return percentiles_us(samples)
+
+
+def run(sizes, n_queries):
+    warnings.filterwarnings("ignore")
+    print(f"{'records':>10} {'mode':>5} {'memory p50 us':>14} {'memory p99 us':>14} "
+          f"{'sqlite p50 us':>14} {'sqlite p99 us':>14}")
+
+    for n in sizes:
+        resources = generate_resources(n)
+        dataset = Dataset(ResourceStore.from_records(resources), f"bench-{n}")
+        queries = make_queries(n_queries)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.db")
+            build_sqlite(path, resources, dataset.version)
+            sqlite = SQLiteBackend(path)
+
+            for access_mode in ("full", "demo"):
+                memory = MemoryBackend()
+                # Warm both: ranking table, connection pool, page cache
+                time_backend(memory, dataset, access_mode, queries[:50])
+                time_backend(sqlite, dataset, access_mode, queries[:50])
+
+                mem = time_backend(memory, dataset, access_mode, queries)
+                sql = time_backend(sqlite, dataset, access_mode, queries)
+                print(f"{n:>10} {access_mode:>5} {mem[0]:>14.1f} {mem[1]:>14.1f} "
+                      f"{sql[0]:>14.1f} {sql[1]:>14.1f}")
+
+            sqlite.engine.dispose()
+
+    set_backend(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Suggest benchmark: Suggester build time and lookup latency per prefix
+shape, on synthetic catalogs.
+
+Latency covers one lookup per kind (skill, category, domain, name), i.e.
+the suggestion work of /v1/suggest without HTTP and JSON.
+
+Usage:
+    python -m benchmarks.bench_suggest [--sizes 100000 1000000] [--queries 2000]
+"""
+
+import argparse
+import random
+import string
+import time
+
+import numpy as np
+
+from api.store import ResourceStore
+from api.suggest import SUGGEST_KINDS, Suggester
+from benchmarks.synthetic import WORDS, generate_resources
+
+
+def prefix_shapes(n, rng):
+    return {
+        "1 char": lambda: rng.choice(string.ascii_lowercase),
+        "word start": lambda: rng.choice(WORDS)[:3],
+        "whole word": lambda: rng.choice(WORDS),
+        "> 16 bytes": lambda: f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.randrange(n)}",
+        "no match": lambda: "zq" + rng.choice(string.ascii_lowercase),
+    }
+
+
+def run(sizes, n_queries):
+    print(f"{'records':>10} {'prefix':>12} {'p50 ms':>8} {'p99 ms':>8}")
+
+    for n in sizes:
+        store = ResourceStore.from_records(generate_resources(n))
+        start = time.perf_counter()
+        suggester = Suggester(store)
+        print(f"{n:>10} build {time.perf_counter() - start:.2f}s, "
+              f"{len(suggester.indexes['name'].nodes):,} name prefix nodes")
+
+        rng = random.Random(1)
+        for shape, make in prefix_shapes(n, rng).items():
+            times = []
+            for _ in range(n_queries):
+                prefix = make()
+                start = time.perf_counter()
+                for kind in SUGGEST_KINDS:
+                    suggester.suggest(prefix, kind, 10)
+                times.append(time.perf_counter() - start)
+            p50, p99 = np.percentile(times, [50, 99]) * 1000
+            print(f"{n:>10} {shape:>12} {p50:>8.3f} {p99:>8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
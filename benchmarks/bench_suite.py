@@ -0,0 +1,460 @@
+"""
+Benchmark suite: ETL stage timings and API latency and throughput on
+synthetic catalogs, written as one JSON report so runs can be compared
+across commits.
+
+For every catalog size:
+- etl: etl.pipeline.run() from raw records (extract+transform and
+  enrich passes), then the snapshot and similar-resources index it
+  publishes, timed on their own, and an incremental re-run with nothing
+  changed.
+- in_process: a fresh interpreter serves the catalog through FastAPI's
+  TestClient, one request at a time. Measures the app without a network.
+- uvicorn: the catalog is served by `uvicorn api.main:app` and driven
+  over keep-alive HTTP connections from several threads.
+
+Both API runs replay the same seeded mix of queries: demo and full mode,
+skill, type and weight filters, deep offsets, search, suggest and
+similar. The response cache is off unless --cache is given, so every
+request does the full work. Latencies are reported per query kind.
+
+Usage:
+    python -m benchmarks.bench_suite [--sizes 1000 100000 1000000] [--requests 2000]
+                                     [--concurrency 8] [--workers 1] [--cache]
+                                     [--output bench_report.json]
+    python -m benchmarks.bench_suite --compare OLD.json NEW.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from api.similar import SimilarIndex, similar_path, write_similar
+from api.store import ResourceStore, snapshot_path, source_info, write_snapshot
+from benchmarks.bench_transform import raw_records
+from benchmarks.synthetic import RESOURCE_TYPE_WEIGHTS, SKILL_WEIGHTS, WORDS, generate_resources
+from etl.enriched import publish_snapshot
+from etl.pipeline import run as run_pipeline
+from etl.stream import write_ndjson
+
+API_KEY = "bench-key"
+
+# Query kinds and their share of the workload
+QUERY_MIX = {
+    "demo": 20,
+    "demo_type": 8,
+    "demo_deep": 4,
+    "full": 16,
+    "full_type": 8,
+    "full_weight": 8,
+    "full_deep": 8,
+    "search": 12,
+    "suggest": 10,
+    "similar": 6,
+}
+
+# Requests replayed before measuring, to warm caches and connections
+WARMUP_FRACTION = 0.05
+
+# Seconds to wait for a uvicorn server to load the catalog
+SERVER_START_TIMEOUT = 600
+
+
+# -----------------------------------------------------
+# Workload
+# -----------------------------------------------------
+
+def workload(records, n_requests, seed=0):
+    """(kind, path, full mode) for `n_requests` requests against `records`."""
+    rng = random.Random(seed)
+    n = len(records)
+    skills, types = list(SKILL_WEIGHTS), list(RESOURCE_TYPE_WEIGHTS)
+    ids = [records[i]["resource_id"] for i in rng.sample(range(n), min(n, 1000))]
+
+    def deep():
+        return rng.randrange(n // 4 + 1)
+
+    makers = {
+        "demo": lambda: (f"/v1/recommendations?skill={rng.choice(skills)}", False),
+        "demo_type": lambda: (
+            f"/v1/recommendations?skill={rng.choice(skills)}&resource_type={rng.choice(types)}", False
+        ),
+        "demo_deep": lambda: (f"/v1/recommendations?skill={rng.choice(skills)}&offset={deep()}", False),
+        "full": lambda: (f"/v1/recommendations?skill={rng.choice(skills)}&limit=20", True),
+        "full_type": lambda: (
+            f"/v1/recommendations?skill={rng.choice(skills)}&resource_type={rng.choice(types)}&limit=20", True
+        ),
+        "full_weight": lambda: (
+            f"/v1/recommendations?skill={rng.choice(skills)}&minimum_domain_weight={rng.choice([1, 2, 5, 10])}"
+            f"&limit=20&offset={rng.choice([0, 0, 100])}",
+            True,
+        ),
+        "full_deep": lambda: (f"/v1/recommendations?skill={rng.choice(skills)}&limit=50&offset={deep()}", True),
+        "search": lambda: (f"/v1/search?q={rng.choice(WORDS)}+{rng.choice(WORDS)[:3]}&prefix=true", rng.random() < 0.5),
+        "suggest": lambda: (f"/v1/suggest?prefix={rng.choice(WORDS)[:rng.randint(1, 4)]}", False),
+        "similar": lambda: (f"/v1/resources/{rng.choice(ids)}/similar?limit=10", rng.random() < 0.5),
+    }
+    kinds = rng.choices(list(QUERY_MIX), weights=list(QUERY_MIX.values()), k=n_requests)
+    return [(kind, *makers[kind]()) for kind in kinds]
+
+
+def summarize(samples, elapsed):
+    """Latency percentiles per query kind, plus overall throughput."""
+    by_kind = {}
+    for kind, seconds in samples:
+        by_kind.setdefault(kind, []).append(seconds)
+    by_kind["all"] = [seconds for _, seconds in samples]
+
+    out = {}
+    for kind, times in sorted(by_kind.items()):
+        p50, p95, p99 = np.percentile(times, [50, 95, 99]) * 1000
+        out[kind] = {
+            "requests": len(times),
+            "mean_ms": round(float(np.mean(times)) * 1000, 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+        }
+    out["all"]["requests_per_second"] = round(len(samples) / elapsed, 1)
+    return out
+
+
+def _split(requests):
+    warmup = int(len(requests) * WARMUP_FRACTION)
+    return requests[:warmup], requests[warmup:]
+
+
+def _server_env(catalog, cache):
+    return {
+        **os.environ,
+        "ENRICHED_PATH": catalog,
+        "API_KEY": API_KEY,
+        "DATA_RELOAD_INTERVAL_SECONDS": "0",
+        "MODEL_RELOAD_INTERVAL_SECONDS": "0",
+        **({} if cache else {"RESPONSE_CACHE_MAX_BYTES": "0"}),
+    }
+
+
+# -----------------------------------------------------
+# ETL
+# -----------------------------------------------------
+
+def bench_etl(n, directory):
+    """Seconds per ETL stage for `n` raw records."""
+    raw_path = os.path.join(directory, "raw.ndjson")
+    write_ndjson(raw_records(n), raw_path)
+    output = os.path.join(directory, "resources_enriched.json")
+    paths = dict(
+        raw_path=raw_path,
+        output_path=output,
+        manifest_path=os.path.join(directory, "pipeline_manifest.sqlite"),
+        stage_manifest_path=os.path.join(directory, "manifest.json"),
+        snapshot=False,
+    )
+
+    start = time.perf_counter()
+    stats = run_pipeline(full=True, **paths)
+    pipeline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = ResourceStore.load_json(output)
+    loaded = time.perf_counter()
+    source = source_info(output)
+    write_snapshot(store, snapshot_path(output), source)
+    snapshotted = time.perf_counter()
+    write_similar(SimilarIndex.build(store), similar_path(output), source)
+    indexed = time.perf_counter()
+
+    start_incremental = time.perf_counter()
+    run_pipeline(**paths)
+    incremental = time.perf_counter() - start_incremental
+
+    return {
+        "records": stats["records"],
+        "pipeline_seconds": round(pipeline, 3),
+        "extract_transform_seconds": stats["extract_transform_seconds"],
+        "enrich_seconds": stats["enrich_seconds"],
+        "json_load_seconds": round(loaded - start, 3),
+        "snapshot_seconds": round(snapshotted - loaded, 3),
+        "similar_index_seconds": round(indexed - snapshotted, 3),
+        "incremental_seconds": round(incremental, 3),
+    }
+
+
+# -----------------------------------------------------
+# API in-process
+# -----------------------------------------------------
+
+def bench_in_process(catalog, workload_path, cache):
+    """Run measure_in_process() in a fresh interpreter serving `catalog`."""
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_suite", "--measure", workload_path],
+        env=_server_env(catalog, cache),
+        check=True, stdout=subprocess.PIPE, text=True,
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def measure_in_process(workload_path):
+    """Replay a workload through TestClient; prints the summary as JSON."""
+    with open(workload_path, encoding="utf-8") as f:
+        requests = json.load(f)
+
+    start = time.perf_counter()
+    from fastapi.testclient import TestClient
+    from api.main import app
+
+    with TestClient(app) as client:
+        started = time.perf_counter() - start
+        full = {"X-API-Key": API_KEY}
+
+        warmup, measured = _split(requests)
+        for _, path, is_full in warmup:
+            client.get(path, headers=full if is_full else None)
+
+        samples = []
+        begin = time.perf_counter()
+        for kind, path, is_full in measured:
+            t = time.perf_counter()
+            response = client.get(path, headers=full if is_full else None)
+            samples.append((kind, time.perf_counter() - t))
+            assert response.status_code == 200, (path, response.status_code)
+        elapsed = time.perf_counter() - begin
+
+    print(json.dumps({"startup_seconds": round(started, 3), "latency": summarize(samples, elapsed)}))
+
+
+# -----------------------------------------------------
+# API over uvicorn
+# -----------------------------------------------------
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_up(port, process):
+    start = time.perf_counter()
+    while time.perf_counter() - start < SERVER_START_TIMEOUT:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/v1/health")
+            if conn.getresponse().status == 200:
+                return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+def _replay(port, requests, samples):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    full = {"X-API-Key": API_KEY}
+    for kind, path, is_full in requests:
+        t = time.perf_counter()
+        conn.request("GET", path, headers=full if is_full else {})
+        response = conn.getresponse()
+        response.read()
+        samples.append((kind, time.perf_counter() - t))
+        assert response.status == 200, (path, response.status)
+    conn.close()
+
+
+def bench_uvicorn(catalog, requests, concurrency, workers, cache):
+    """Serve `catalog` with uvicorn and replay `requests` from `concurrency` threads."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=_server_env(catalog, cache),
+    )
+    try:
+        started = _wait_until_up(port, process)
+        warmup, measured = _split(requests)
+        _replay(port, warmup, [])
+
+        shares = [measured[i::concurrency] for i in range(concurrency)]
+        samples = [[] for _ in shares]
+        threads = [threading.Thread(target=_replay, args=(port, s, out)) for s, out in zip(shares, samples)]
+        begin = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - begin
+    finally:
+        process.terminate()
+        process.wait()
+
+    all_samples = [sample for out in samples for sample in out]
+    if len(all_samples) != len(measured):
+        raise RuntimeError("some uvicorn requests failed")
+    return {
+        "startup_seconds": round(started, 3),
+        "concurrency": concurrency,
+        "workers": workers,
+        "latency": summarize(all_samples, elapsed),
+    }
+
+
+# -----------------------------------------------------
+# Report
+# -----------------------------------------------------
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def run(sizes, n_requests, concurrency, workers, cache, skip_uvicorn=False):
+    report = {
+        "environment": environment(),
+        "config": {
+            "requests": n_requests,
+            "concurrency": concurrency,
+            "workers": workers,
+            "response_cache": cache,
+            "query_mix": QUERY_MIX,
+        },
+        "sizes": {},
+    }
+
+    for n in sizes:
+        directory = tempfile.mkdtemp()
+        try:
+            result = report["sizes"][str(n)] = {}
+            print(f"{n:>10} records: ETL...", file=sys.stderr)
+            etl_directory = os.path.join(directory, "etl")
+            os.mkdir(etl_directory)
+            result["etl"] = bench_etl(n, etl_directory)
+
+            # The API serves generated enriched records directly, with the
+            # snapshot and similar index the ETL would publish next to them
+            records = generate_resources(n)
+            catalog = os.path.join(directory, "resources_enriched.json")
+            with open(catalog, "w", encoding="utf-8") as f:
+                json.dump(records, f)
+            publish_snapshot(ResourceStore.load_json(catalog), catalog)
+
+            requests = workload(records, n_requests)
+            del records
+            workload_path = os.path.join(directory, "workload.json")
+            with open(workload_path, "w", encoding="utf-8") as f:
+                json.dump(requests, f)
+
+            print(f"{n:>10} records: API in-process...", file=sys.stderr)
+            result["in_process"] = bench_in_process(catalog, workload_path, cache)
+            if not skip_uvicorn:
+                print(f"{n:>10} records: API over uvicorn...", file=sys.stderr)
+                result["uvicorn"] = bench_uvicorn(catalog, requests, concurrency, workers, cache)
+        finally:
+            shutil.rmtree(directory)
+
+    return report
+
+
+def print_report(report):
+    for n, result in report["sizes"].items():
+        etl = result["etl"]
+        print(f"\n{int(n):,} records")
+        print(f"  ETL: pipeline {etl['pipeline_seconds']}s "
+              f"(extract+transform {etl['extract_transform_seconds']}s, enrich {etl['enrich_seconds']}s), "
+              f"snapshot {etl['snapshot_seconds']}s, similar index {etl['similar_index_seconds']}s, "
+              f"incremental re-run {etl['incremental_seconds']}s")
+        for mode in ("in_process", "uvicorn"):
+            if mode not in result:
+                continue
+            latency = result[mode]["latency"]
+            print(f"  {mode}: startup {result[mode]['startup_seconds']}s, "
+                  f"{latency['all']['requests_per_second']:,} req/s")
+            print(f"    {'kind':>12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+            for kind, stats in latency.items():
+                print(f"    {kind:>12} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            out.update(_flatten(item, f"{prefix}{key}."))
+        return out
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix[:-1]: value}
+    return {}
+
+
+def compare(old_path, new_path):
+    """Print every timing or throughput the two reports share, with the change."""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"old: {old['environment']['commit']}  new: {new['environment']['commit']}")
+
+    old_values, new_values = _flatten(old["sizes"]), _flatten(new["sizes"])
+    print(f"{'metric':<52} {'old':>10} {'new':>10} {'change':>8}")
+    for key, before in old_values.items():
+        after = new_values.get(key)
+        if after is None or key.endswith(("requests", "records", "concurrency", "workers")):
+            continue
+        change = f"{(after - before) / before * 100:+.1f}%" if before else ""
+        print(f"{key:<52} {before:>10} {after:>10} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per API run")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads against uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache on")
+    parser.add_argument("--no-uvicorn", dest="uvicorn", action="store_false", help="Skip the uvicorn runs")
+    parser.add_argument("--output", default="bench_report.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two reports")
+    parser.add_argument("--measure", metavar="WORKLOAD", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure_in_process(args.measure)
+        return
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args.sizes, args.requests, args.concurrency, args.workers, args.cache, not args.uvicorn)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
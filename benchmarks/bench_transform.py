@@ -0,0 +1,88 @@
+"""
+Transform/enrich engine benchmark: the per-record python engine vs the
+columnar arrow engine (etl/columnar.py) on synthetic raw records.
+
+Both engines are fed the same batches with the same timestamps and their
+output is checked to be byte-identical before timing is reported.
+
+Usage:
+    python -m benchmarks.bench_transform [--sizes 10000 100000 1000000] [--batch 10000]
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import time
+from collections import Counter
+
+from benchmarks.synthetic import generate_resources
+from etl.Transform import transform_records
+from etl.enriched import enrich_records
+from etl.pipeline import batches
+
+
+def raw_records(n):
+    """Raw (extract-stage) records with names and categories as found in READMEs."""
+    return [
+        {
+            "resource_name": f" {r['resource_name']}! ",
+            "source_url": r["source_url"],
+            "category": r["category"].title(),
+            "extracted_at": r["extracted_at"],
+        }
+        for r in generate_resources(n)
+    ]
+
+
+def time_stage(stage, records, batch_size):
+    """Seconds to run `stage` over every batch, and a digest of its output."""
+    digest = hashlib.blake2b(digest_size=16)
+    start = time.perf_counter()
+    for batch in batches(records, batch_size):
+        digest.update(json.dumps(stage(batch)).encode("utf-8"))
+    return time.perf_counter() - start, digest.hexdigest()
+
+
+def run(sizes, batch_size):
+    print(f"{'records':>10} {'engine':>7} {'transform s':>12} {'rows/s':>10} "
+          f"{'enrich s':>9} {'rows/s':>10}")
+
+    for n in sizes:
+        raw = raw_records(n)
+        cleaned = transform_records(raw, "T")
+        domains = Counter(r["domain"] for r in cleaned)
+        # Inputs live for the whole run; keep the collector off them so
+        # timings are not dominated by full GC passes over millions of dicts
+        gc.collect()
+        gc.freeze()
+
+        digests = set()
+        for engine in ("python", "arrow"):
+            # Warm up (imports, regex compilation)
+            enrich_records(transform_records(raw[:100], "T", engine), domains, "E", engine)
+
+            t, transform_digest = time_stage(
+                lambda batch: transform_records(batch, "T", engine), raw, batch_size
+            )
+            e, enrich_digest = time_stage(
+                lambda batch: enrich_records(batch, domains, "E", engine), cleaned, batch_size
+            )
+            digests.add((transform_digest, enrich_digest))
+            print(f"{n:>10} {engine:>7} {t:>12.2f} {n / t:>10,.0f} {e:>9.2f} {n / e:>10,.0f}")
+
+        # Both engines must produce byte-identical output
+        assert len(digests) == 1
+        gc.unfreeze()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args()
+    run(args.sizes, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Synthetic catalogs in the resources_enriched.json schema.
+
+Distributions loosely follow the real dataset: most resources fall in the
+"general" cluster and are tools, and a few domains own a large share of
+records (which is what drives domain_weight).
+"""
+
+import hashlib
+import random
+from collections import Counter
+from datetime import datetime, timezone
+
+SKILL_WEIGHTS = {
+    "general": 60,
+    "frontend": 12,
+    "data": 10,
+    "backend": 9,
+    "devops": 6,
+    "mobile": 3,
+}
+
+RESOURCE_TYPE_WEIGHTS = {
+    "tool": 80,
+    "course": 8,
+    "repository": 6,
+    "article": 4,
+    "documentation": 2,
+}
+
+CATEGORIES = [
+    "accessibility", "api", "css", "database", "design", "docker",
+    "javascript", "kubernetes", "machine learning", "python", "react",
+    "security", "testing", "tools", "ui", "ux",
+]
+
+WORDS = [
+    "awesome", "guide", "handbook", "kit", "lab", "learn", "library",
+    "playground", "reference", "studio", "tutorial", "docs", "toolbox",
+    "cheatsheet", "generator", "validator", "explorer", "monitor",
+]
+
+
+def _pick(rng: random.Random, weights: dict) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def generate_resources(n: int, seed: int = 42) -> list:
+    """
+    Return `n` enriched-schema records. Deterministic for a given seed.
+    """
+
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc).isoformat()
+
+    # Zipf-like domain popularity: a handful of hosts dominate
+    n_domains = max(10, n // 4)
+    domain_pool = [f"site{i}.example.com" for i in range(n_domains)]
+    domain_pool[0] = "github.com"
+    domain_ranks = [1.0 / (i + 1) for i in range(n_domains)]
+
+    domains = rng.choices(domain_pool, weights=domain_ranks, k=n)
+    domain_counts = Counter(domains)
+
+    resources = []
+    for i, domain in enumerate(domains):
+        url = f"https://{domain}/r/{i}"
+        category = rng.choice(CATEGORIES)
+        name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}"
+        is_github = domain == "github.com"
+        skill = _pick(rng, SKILL_WEIGHTS)
+        # Clustered resources hit one or two keywords, some from a second cluster
+        scores = {} if skill == "general" else {skill: rng.randint(1, 2)}
+        if scores and rng.random() < 0.2:
+            scores[rng.choice([s for s in SKILL_WEIGHTS if s not in ("general", skill)])] = 1
+
+        resources.append({
+            "resource_id": hashlib.md5(url.encode("utf-8")).hexdigest(),
+            "resource_name": name,
+            "source_url": url,
+            "domain": domain,
+            "category": category,
+            "resource_type": "repository" if is_github else _pick(rng, RESOURCE_TYPE_WEIGHTS),
+            "is_github": is_github,
+            "extracted_at": now,
+            "transformed_at": now,
+            "category_slug": category.replace(" ", "_"),
+            "skill_cluster": skill,
+            "skill_scores": scores,
+            "domain_weight": domain_counts[domain],
+            "enriched_at": now,
+        })
+
+    return resources
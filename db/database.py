@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 
-DATABASE_URL = "sqlite:///./resources.db"
+DATABASE_PATH = os.getenv("DATABASE_PATH", "./resources.db")
+DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
 engine = create_engine(
     DATABASE_URL, connect_args={"check_same_thread": False}
@@ -9,3 +13,30 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False)
 Base = declarative_base()
+
+
+def read_only_engine(path: str = DATABASE_PATH, pool_size: int = 8):
+    """
+    Pooled read-only connections for serving queries.
+
+    Opened with SQLite's `mode=ro`, so any number of worker processes can
+    share one data file while a separate seed process rewrites it.
+    """
+    url = f"sqlite:///file:{os.path.abspath(path)}?mode=ro&uri=true"
+    ro_engine = create_engine(
+        url,
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=pool_size,
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(ro_engine, "connect")
+    def _configure(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only = ON")
+        # Let the OS page cache serve hot index pages
+        cursor.execute("PRAGMA mmap_size = 268435456")
+        cursor.close()
+
+    return ro_engine
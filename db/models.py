@@ -1,5 +1,5 @@
 # db/models.py
-from sqlalchemy import Column, String, Integer, Boolean, DateTime
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Float, Index
 from db.database import Base
 
 class Resource(Base):
@@ -22,3 +22,33 @@ class Resource(Base):
     extracted_at = Column(DateTime)
     transformed_at = Column(DateTime)
     enriched_at = Column(DateTime)   # ✅ REQUIRED
+
+    # Serving columns, filled by db/seed.py:
+    # lower-cased filter keys, catalog order and the precomputed full-mode score
+    skill_key = Column(String)
+    type_key = Column(String)
+    # Every matched skill cluster, lower-cased and space-delimited
+    # (" frontend backend "), for include_secondary filters
+    skill_labels = Column(String)
+    position = Column(Integer)
+    score = Column(Float)
+    # Hash of everything above; lets a re-seed skip unchanged rows
+    content_hash = Column(String)
+
+    __table_args__ = (
+        # Demo order: (-domain_weight, resource_id) within a filter
+        Index("ix_resources_skill_type_weight", "skill_key", "type_key", domain_weight.desc(), "resource_id"),
+        Index("ix_resources_skill_weight", "skill_key", domain_weight.desc(), "resource_id"),
+        # Full order: (-score, position) within a filter
+        Index("ix_resources_skill_type_score", "skill_key", "type_key", score.desc(), "position"),
+        Index("ix_resources_skill_score", "skill_key", score.desc(), "position"),
+    )
+
+
+class CatalogMeta(Base):
+    """Key/value facts about the seeded catalog (dataset and model versions)."""
+
+    __tablename__ = "catalog_meta"
+
+    key = Column(String, primary_key=True)
+    value = Column(String)
@@ -1,25 +1,193 @@
-from db.database import engine, SessionLocal
-from db.models import Resource
-from api.data import RESOURCES
+import hashlib
+import json
+import os
+import time
 from datetime import datetime
+from functools import lru_cache
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.dialects.sqlite import insert
+
+from db.database import engine
+from db.models import CatalogMeta, Resource
+from api.data import ENRICHED_PATH, fingerprint, load_resources
+from api.store import ResourceStore
+from api.service.ranking import rank_store
+import api.ml.ranker as ranker
+
+DATETIME_FIELDS = ["extracted_at", "transformed_at", "enriched_at"]
+
+# Rows per executemany batch
+SEED_CHUNK_SIZE = int(os.getenv("SEED_CHUNK_SIZE", "5000"))
+
+RESOURCES = Resource.__table__
+
+# Bulk-load settings for the writing connection. WAL also lets read-only
+# API workers keep serving the previous catalog while a seed runs.
+BULK_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+]
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
 def parse_dt(value):
     if value is None:
         return None
     if isinstance(value, datetime):
         return value
-    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    # Timestamps are shared by every record of an ETL run, so parse each once
+    return _parse_iso(value)
+
+def content_hash(record, position, score):
+    raw = json.dumps([record, position, score], sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+def skill_labels(record):
+    """Primary and secondary skill clusters as a " a b " LIKE-able string."""
+    labels = dict.fromkeys(
+        label.lower()
+        for label in [record.get("skill_cluster") or "", *(record.get("skill_scores") or ())]
+    )
+    return f" {' '.join(labels)} "
+
+def serving_rows(records):
+    """
+    Records plus the columns the SQLite backend serves from: lower-cased
+    filter keys and skill labels, catalog position, the precomputed full-mode score and a
+    content hash.
+
+    Returns (rows, meta).
+    """
+    scores, ranking_mode = rank_store(ResourceStore.from_records(records))
+
+    rows = []
+    for position, (r, score) in enumerate(zip(records, scores.tolist())):
+        row = {k: parse_dt(v) if k in DATETIME_FIELDS else v for k, v in r.items()}
+        row.pop("skill_scores", None)
+        row["skill_key"] = (r.get("skill_cluster") or "").lower()
+        row["skill_labels"] = skill_labels(r)
+        row["type_key"] = (r.get("resource_type") or "").lower()
+        row["position"] = position
+        row["score"] = score
+        row["content_hash"] = content_hash(r, position, score)
+        rows.append(row)
+
+    meta = {
+        "ranking_mode": ranking_mode,
+        "model_version": ranker.model_version() if ranking_mode == "ml" else "",
+    }
+    return rows, meta
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _upsert_statement(columns):
+    stmt = insert(RESOURCES)
+    return stmt.on_conflict_do_update(
+        index_elements=[RESOURCES.c.resource_id],
+        set_={name: stmt.excluded[name] for name in columns if name != "resource_id"},
+    )
+
+def _existing_hashes(conn, ids):
+    query = select(RESOURCES.c.resource_id, RESOURCES.c.content_hash).where(
+        RESOURCES.c.resource_id.in_(bindparam("ids", expanding=True))
+    )
+    return dict(conn.execute(query, {"ids": ids}).all())
+
+def seed(path=ENRICHED_PATH, bind=None, chunk_size=SEED_CHUNK_SIZE):
+    """
+    Bulk, idempotent load of the enriched catalog.
+
+    Rows are upserted with INSERT ... ON CONFLICT DO UPDATE in chunks of
+    `chunk_size`; rows whose content hash is unchanged are skipped and rows
+    no longer in the catalog are deleted. Everything happens in one
+    transaction, so readers switch from the old catalog to the new one at
+    once. A load into an empty table builds the secondary indexes after
+    the rows are in.
+
+    Returns counts of inserted/updated/unchanged/deleted rows.
+    """
+    bind = bind if bind is not None else engine
+    started = time.perf_counter()
+
+    rows, meta = serving_rows(load_resources(path))
+    meta["dataset_version"] = fingerprint(path)
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    prepared = time.perf_counter()
+
+    with bind.connect() as conn:
+        for pragma in BULK_PRAGMAS:
+            conn.exec_driver_sql(pragma)
+        conn.commit()
+
+        with conn.begin():
+            fresh = conn.execute(select(func.count()).select_from(RESOURCES)).scalar_one() == 0
+            if fresh:
+                # Building indexes once over sorted data beats updating
+                # them row by row
+                for index in RESOURCES.indexes:
+                    index.drop(conn, checkfirst=True)
+
+            conn.exec_driver_sql(
+                "CREATE TEMP TABLE IF NOT EXISTS seed_ids (resource_id TEXT PRIMARY KEY)"
+            )
+            conn.exec_driver_sql("DELETE FROM seed_ids")
+
+            for chunk in _chunks(rows, chunk_size):
+                ids = [r["resource_id"] for r in chunk]
+                conn.execute(
+                    text("INSERT OR IGNORE INTO seed_ids (resource_id) VALUES (:resource_id)"),
+                    [{"resource_id": i} for i in ids],
+                )
+
+                existing = {} if fresh else _existing_hashes(conn, ids)
+                changed = [r for r in chunk if existing.get(r["resource_id"]) != r["content_hash"]]
+                stats["unchanged"] += len(chunk) - len(changed)
+                stats["updated"] += sum(1 for r in changed if r["resource_id"] in existing)
+                stats["inserted"] += sum(1 for r in changed if r["resource_id"] not in existing)
+
+                if changed:
+                    conn.execute(_upsert_statement(changed[0].keys()), changed)
+
+            stats["deleted"] = conn.execute(text(
+                "DELETE FROM resources WHERE resource_id NOT IN (SELECT resource_id FROM seed_ids)"
+            )).rowcount
+
+            if fresh:
+                for index in RESOURCES.indexes:
+                    index.create(conn)
+
+            meta_table = CatalogMeta.__table__
+            stmt = insert(meta_table)
+            conn.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[meta_table.c.key],
+                    set_={"value": stmt.excluded.value},
+                ),
+                [{"key": k, "value": v} for k, v in meta.items()],
+            )
 
-def seed():
-    session = SessionLocal()
+        conn.exec_driver_sql("ANALYZE")
+        conn.commit()
 
-    for r in RESOURCES:
-        r = {k: parse_dt(v) if k in ["extracted_at", "transformed_at", "enriched_at"] else v for k, v in r.items()}
-        session.merge(Resource(**r))
+    finished = time.perf_counter()
+    write_seconds = finished - prepared
+    stats["rows_per_second"] = round(len(rows) / write_seconds) if write_seconds else len(rows)
 
-    session.commit()
-    session.close()
-    print("✅ Database seeded")
+    print(
+        f"✅ Database seeded: {len(rows)} rows in {finished - started:.2f}s "
+        f"(load+score {prepared - started:.2f}s, write {write_seconds:.2f}s, "
+        f"{stats['rows_per_second']} rows/s) – {stats['inserted']} inserted, "
+        f"{stats['updated']} updated, {stats['unchanged']} unchanged, "
+        f"{stats['deleted']} deleted"
+    )
+    return stats
 
 if __name__ == "__main__":
     from db.database import Base
@@ -5,6 +5,9 @@ import hashlib
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 import csv
+import sys
+
+from etl.manifest import content_hash, load_manifest, load_previous, save_manifest
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -13,6 +16,10 @@ PROCESSED_DIR = os.path.join(BASE_DIR, "..", "data", "processed")
 CLEAN_JSON_PATH = os.path.join(PROCESSED_DIR, "resources_clean.json")
 CLEAN_CSV_PATH = os.path.join(PROCESSED_DIR, "resources_clean.csv")
 
+# Raw fields a clean record is derived from; extracted_at is excluded so a
+# re-extract of the same README is not a change
+RAW_CONTENT_FIELDS = ["resource_name", "source_url", "category"]
+
 
 def load_raw_data(path):
     with open(path, "r", encoding="utf-8") as f:
@@ -86,9 +93,62 @@ def generate_resource_id(url):
     return hashlib.md5(url.encode("utf-8")).hexdigest()
 
 
-def transform_resources(raw_resources):
+def transform_record(r, transformed_at=None):
+    url = r.get("source_url")
+    name = clean_text(r.get("resource_name"))
+    category = normalize_category(r.get("category"))
+    domain = extract_domain(url)
+    resource_type = infer_resource_type(name, domain)
+
+    return {
+        "resource_id": generate_resource_id(url),
+        "resource_name": name,
+        "source_url": url,
+        "domain": domain,
+        "category": category,
+        "resource_type": resource_type,
+        "is_github": domain == "github.com",
+        "extracted_at": r.get("extracted_at"),
+        "transformed_at": transformed_at or datetime.now(timezone.utc).isoformat()
+    }
+
+
+def transform_records(records, transformed_at=None, engine=None):
+    """
+    transform_record() over a batch, stamped with one timestamp. With the
+    "arrow" engine (etl/columnar.py) the batch is transformed column-wise;
+    the records are the same either way.
+    """
+    from etl import columnar
+
+    transformed_at = transformed_at or datetime.now(timezone.utc).isoformat()
+    if columnar.use_columnar(engine):
+        return columnar.transform_batch(records, transformed_at)
+    return [transform_record(r, transformed_at) for r in records]
+
+
+def transform_resources(raw_resources, engine=None):
+    cleaned, _, _ = transform_incremental(raw_resources, engine=engine)
+    return cleaned
+
+
+def transform_incremental(raw_resources, previous=None, manifest=None, engine=None):
+    """
+    Clean raw records, dropping duplicate URLs.
+
+    With `previous` ({resource_id: clean record} from the last run) and its
+    `manifest` ({resource_id: raw content hash}), records whose raw content
+    is unchanged are carried forward untouched instead of re-cleaned.
+
+    Returns (cleaned, new_manifest, changed_count).
+    """
+    previous = previous or {}
+    manifest = manifest or {}
+
     seen_urls = set()
     cleaned = []
+    new_manifest = {}
+    pending = []
 
     for r in raw_resources:
         url = r.get("source_url")
@@ -97,24 +157,21 @@ def transform_resources(raw_resources):
 
         seen_urls.add(url)
 
-        name = clean_text(r.get("resource_name"))
-        category = normalize_category(r.get("category"))
-        domain = extract_domain(url)
-        resource_type = infer_resource_type(name, domain)
-
-        cleaned.append({
-            "resource_id": generate_resource_id(url),
-            "resource_name": name,
-            "source_url": url,
-            "domain": domain,
-            "category": category,
-            "resource_type": resource_type,
-            "is_github": domain == "github.com",
-            "extracted_at": r.get("extracted_at"),
-            "transformed_at": datetime.now(timezone.utc).isoformat()
-        })
+        resource_id = generate_resource_id(url)
+        raw_hash = content_hash(r, RAW_CONTENT_FIELDS)
+        new_manifest[resource_id] = raw_hash
 
-    return cleaned
+        if resource_id in previous and manifest.get(resource_id) == raw_hash:
+            cleaned.append(previous[resource_id])
+        else:
+            pending.append(len(cleaned))
+            cleaned.append(r)
+
+    transformed = transform_records([cleaned[i] for i in pending], engine=engine)
+    for i, record in zip(pending, transformed):
+        cleaned[i] = record
+
+    return cleaned, new_manifest, len(pending)
 
 
 def save_json(data, path):
@@ -132,7 +189,7 @@ def save_csv(data, path):
         writer.writerows(data)
 
 
-def main():
+def main(full=False):
     os.makedirs(PROCESSED_DIR, exist_ok=True)
 
     print("Starting transform stage...")
@@ -140,11 +197,16 @@ def main():
     raw = load_raw_data(RAW_PATH)
     print(f"Loaded {len(raw)} raw records")
 
-    cleaned = transform_resources(raw)
-    print(f"Transformed into {len(cleaned)} clean records")
+    # Incremental unless asked for a full rebuild or there is no prior run
+    previous = {} if full else load_previous(CLEAN_JSON_PATH)
+    manifest = {} if full else load_manifest("transform")
+
+    cleaned, new_manifest, changed = transform_incremental(raw, previous, manifest)
+    print(f"Transformed into {len(cleaned)} clean records ({changed} new or changed)")
 
     save_json(cleaned, CLEAN_JSON_PATH)
     save_csv(cleaned, CLEAN_CSV_PATH)
+    save_manifest("transform", new_manifest)
 
     print("Transform stage completed successfully")
     print(f"JSON output: {CLEAN_JSON_PATH}")
@@ -152,4 +214,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(full="--full" in sys.argv)
@@ -0,0 +1,69 @@
+"""
+Run the whole ETL (extract → transform → enrich) as one streaming pipeline.
+
+Usage:
+    python -m etl [--raw PATH] [--source URL_OR_PATH ...] [--full] [--keep-intermediate]
+                  [--engine python|arrow] [--no-snapshot]
+
+Sources are fetched concurrently; a directory source stands for every
+markdown file under it.
+"""
+
+import argparse
+
+from etl.columnar import ENGINES
+from etl.enriched import ENRICHED_DATA_PATH
+from etl.pipeline import run
+from etl.sources import DEFAULT_SOURCES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--source",
+        action="append",
+        dest="sources",
+        help="README URL, file:// URL, file or directory to extract from (repeatable)",
+    )
+    parser.add_argument("--raw", help="Read raw records from a JSON/NDJSON file instead of fetching")
+    parser.add_argument("--output", default=ENRICHED_DATA_PATH, help="Enriched dataset to publish")
+    parser.add_argument("--full", action="store_true", help="Reprocess every record")
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        help="Transform/enrich engine (default: $ETL_ENGINE or python); arrow needs pyarrow",
+    )
+    parser.add_argument(
+        "--no-snapshot",
+        dest="snapshot",
+        action="store_false",
+        help="Publish only the JSON, without the API's binary snapshot",
+    )
+    parser.add_argument(
+        "--keep-intermediate",
+        action="store_true",
+        help="Also write raw and clean records as NDJSON under data/",
+    )
+    args = parser.parse_args()
+
+    print("Starting ETL pipeline...")
+    stats = run(
+        sources=args.sources or DEFAULT_SOURCES,
+        raw_path=args.raw,
+        output_path=args.output,
+        full=args.full,
+        keep_intermediate=args.keep_intermediate,
+        engine=args.engine,
+        snapshot=args.snapshot,
+    )
+    print(
+        f"Published {stats['records']} records to {args.output}: "
+        f"{stats['changed']} new or changed, {stats['carried']} carried forward, "
+        f"{stats['removed']} removed "
+        f"(extract+transform {stats['extract_transform_seconds']}s, "
+        f"enrich {stats['enrich_seconds']}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
 import json
 import os
+import sys
 from collections import Counter
 from datetime import datetime, timezone
 import re
 
+from etl.manifest import (
+    PIPELINE_MANIFEST_PATH,
+    content_hash,
+    load_manifest,
+    load_previous,
+    save_manifest,
+)
+from etl.skills import SkillClassifier
+from api.similar import SimilarIndex, similar_path, write_similar
+from api.store import ResourceStore, snapshot_path, source_info, write_snapshot
+
 # -----------------------------
 # Paths
 # -----------------------------
@@ -20,8 +32,8 @@ DOMAIN_SUMMARY_PATH = os.path.join(ENRICHED_DIR, "domain_summary.json")
 # Skill keyword mapping
 # -----------------------------
 SKILL_KEYWORDS = {
-    "frontend": ["javascript", "css", "react", "vue", "frontend", "accessibility"],
-    "backend": ["backend", "api", "server", "node", "django", "flask"],
+    "frontend": ["javascript", "css", "react", "reactjs", "vue", "vuejs", "frontend", "accessibility"],
+    "backend": ["backend", "api", "server", "node", "nodejs", "django", "flask"],
     "data": ["data", "database", "sql", "pandas", "numpy", "machine learning", "ml", "analytics"],
     "devops": ["docker", "kubernetes", "devops", "ci", "cd"],
     "mobile": ["android", "ios", "flutter", "react native"],
@@ -63,15 +75,20 @@ def normalize_category(category):
 
 
 # -----------------------------
-# Skill clustering (FIXED)
+# Skill clustering
 # -----------------------------
-def assign_skill_cluster(resource):
-    text = f"{resource.get('resource_name', '')} {resource.get('category', '')}".lower()
+# One automaton over the whole keyword table (etl/skills.py), built once
+SKILL_CLASSIFIER = SkillClassifier(SKILL_KEYWORDS)
+
+
+def skill_scores(resource):
+    """Per-cluster keyword scores for a clean record's name and category."""
+    text = f"{resource.get('resource_name') or ''} {resource.get('category') or ''}"
+    return SKILL_CLASSIFIER.scores(text)
 
-    for cluster, keywords in SKILL_KEYWORDS.items():
-        if any(k in text for k in keywords):
-            return cluster
-    return "general"
+
+def assign_skill_cluster(resource):
+    return SkillClassifier.primary(skill_scores(resource))
 
 # -----------------------------
 # Summaries
@@ -89,37 +106,155 @@ def build_summaries(resources):
 # -----------------------------
 # Enrichment
 # -----------------------------
-def enrich_resources(resources, domain_counts):
-    enriched = []
+def enrich_record(r, domain_counts, enriched_at=None):
+    normalized_category = normalize_category(r.get("category"))
+    # Scored on the clean category, whose words are still separated
+    scores = skill_scores(r)
+
+    return {
+        **r,
+        "category": normalized_category,
+        "category_slug": normalized_category.replace(" ", "_"),
+        "skill_cluster": SkillClassifier.primary(scores),
+        "skill_scores": scores,
+        "domain_weight": domain_counts.get(r.get("domain"), 0),
+        "enriched_at": enriched_at or datetime.now(timezone.utc).isoformat()
+    }
+
+
+def enrich_records(resources, domain_counts, enriched_at=None, engine=None):
+    """
+    enrich_record() over a batch, stamped with one timestamp; column-wise
+    with the "arrow" engine (etl/columnar.py), same records either way.
+    """
+    from etl import columnar
+
+    enriched_at = enriched_at or datetime.now(timezone.utc).isoformat()
+    if columnar.use_columnar(engine):
+        return columnar.enrich_batch(resources, domain_counts, enriched_at)
+    return [enrich_record(r, domain_counts, enriched_at) for r in resources]
+
+
+def enrich_resources(resources, domain_counts, engine=None):
+    return enrich_records(resources, domain_counts, engine=engine)
+
+# -----------------------------
+# Incremental enrichment
+# -----------------------------
+def enrich_incremental(resources, previous=None, manifest=None, counts=None, engine=None):
+    """
+    Enrich only new or changed clean records; carry the rest forward.
+
+    `previous` is the last run's {resource_id: enriched record}, `manifest`
+    its {resource_id: [clean_hash, domain, category]} and `counts` its
+    (category_counts, domain_counts). Summary counts are updated by the
+    delta of added, removed and changed records, and carried-forward
+    records only get a new domain_weight when their domain's count moved.
+    Without a previous run everything is enriched from scratch.
+
+    Returns (enriched, new_manifest, category_counts, domain_counts, changed_count).
+    """
+    previous = previous or {}
+    manifest = manifest or {}
+
+    entries = {}
+    changed = set()
+    for r in resources:
+        resource_id = r["resource_id"]
+        entries[resource_id] = [
+            content_hash(r),
+            r.get("domain", "unknown"),
+            r.get("category", "unknown"),
+        ]
+        if resource_id not in previous or manifest.get(resource_id, [None])[0] != entries[resource_id][0]:
+            changed.add(resource_id)
+
+    if counts is None or not previous:
+        category_counts, domain_counts = build_summaries(resources)
+        return (
+            enrich_resources(resources, domain_counts, engine),
+            entries,
+            category_counts,
+            domain_counts,
+            len(resources),
+        )
+
+    category_counts, domain_counts = Counter(counts[0]), Counter(counts[1])
+    before = Counter(counts[1])
+
+    retracted = (manifest.keys() - entries.keys()) | (changed & manifest.keys())
+    touched = set()
+    for resource_id in retracted:
+        _, domain, category = manifest[resource_id]
+        domain_counts[domain] -= 1
+        category_counts[category] -= 1
+        touched.add(domain)
+    for resource_id in changed:
+        _, domain, category = entries[resource_id]
+        domain_counts[domain] += 1
+        category_counts[category] += 1
+        touched.add(domain)
+
+    category_counts = Counter({k: v for k, v in category_counts.items() if v > 0})
+    domain_counts = Counter({k: v for k, v in domain_counts.items() if v > 0})
+    moved = {d for d in touched if domain_counts.get(d, 0) != before.get(d, 0)}
 
+    enriched = []
+    pending = []
     for r in resources:
-        normalized_category = normalize_category(r.get("category"))
+        resource_id = r["resource_id"]
+        if resource_id in changed:
+            pending.append(len(enriched))
+            enriched.append(r)
+            continue
 
-        enriched.append({
-            **r,
-            "category": normalized_category,
-            "category_slug": normalized_category.replace(" ", "_"),
-            "skill_cluster": assign_skill_cluster({
-                **r,
-                "category": normalized_category
-            }),
-            "domain_weight": domain_counts.get(r.get("domain"), 0),
-            "enriched_at": datetime.now(timezone.utc).isoformat()
-        })
+        record = previous[resource_id]
+        if record.get("domain") in moved:
+            record = {**record, "domain_weight": domain_counts.get(record.get("domain"), 0)}
+        enriched.append(record)
 
-    return enriched
+    batch = enrich_records([enriched[i] for i in pending], domain_counts, engine=engine)
+    for i, record in zip(pending, batch):
+        enriched[i] = record
+
+    return enriched, entries, category_counts, domain_counts, len(changed)
 
 # -----------------------------
 # Save JSON
 # -----------------------------
 def save_json(data, path):
-    with open(path, "w", encoding="utf-8") as f:
+    # Write then rename, so the API's reload watcher never sees a
+    # half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def save_dataset(records, path):
+    """
+    Publish enriched records: the JSON array plus the binary files the API
+    memory-maps. Those are written first, tied to the new JSON, so the
+    API's watcher never sees a JSON without them.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+    publish_snapshot(ResourceStore.from_records(records), path, tmp_path)
+    os.replace(tmp_path, path)
+
+def publish_snapshot(store, path, written_path=None):
+    """
+    Write the binary snapshot and the similar-resources index for the
+    dataset at `path` (contents at `written_path`).
+    """
+    source = source_info(written_path or path)
+    write_snapshot(store, snapshot_path(path), source)
+    write_similar(SimilarIndex.build(store), similar_path(path), source)
 
 # -----------------------------
 # Main
 # -----------------------------
-def main():
+def main(full=False):
     os.makedirs(ENRICHED_DIR, exist_ok=True)
 
     print("Starting enrichment stage...")
@@ -127,13 +262,34 @@ def main():
     resources = load_clean_data(INPUT_PATH)
     print(f"Loaded {len(resources)} clean records")
 
-    category_counts, domain_counts = build_summaries(resources)
-
-    enriched_resources = enrich_resources(resources, domain_counts)
-
-    save_json(enriched_resources, ENRICHED_DATA_PATH)
+    # Incremental unless asked for a full rebuild or there is no prior run
+    previous = {} if full else load_previous(ENRICHED_DATA_PATH)
+    manifest = {} if full else load_manifest("enrich")
+    saved_counts = None if full else load_manifest("enrich_counts")
+    counts = None
+    if saved_counts:
+        # Stored as [key, count] pairs so a None domain survives JSON
+        counts = (
+            dict(map(tuple, saved_counts["category"])),
+            dict(map(tuple, saved_counts["domain"])),
+        )
+
+    enriched_resources, new_manifest, category_counts, domain_counts, changed = (
+        enrich_incremental(resources, previous, manifest, counts)
+    )
+    print(f"Enriched {changed} new or changed records")
+
+    save_dataset(enriched_resources, ENRICHED_DATA_PATH)
     save_json(dict(category_counts), CATEGORY_SUMMARY_PATH)
     save_json(dict(domain_counts), DOMAIN_SUMMARY_PATH)
+    # The streaming pipeline's state no longer matches the output
+    if os.path.exists(PIPELINE_MANIFEST_PATH):
+        os.remove(PIPELINE_MANIFEST_PATH)
+    save_manifest("enrich", new_manifest)
+    save_manifest("enrich_counts", {
+        "category": list(category_counts.items()),
+        "domain": list(domain_counts.items()),
+    })
 
     print("Enrichment stage completed successfully")
     print(f"Enriched data written to: {ENRICHED_DATA_PATH}")
@@ -141,5 +297,14 @@ def main():
     print("\nSample enriched record:")
     print(json.dumps(enriched_resources[0], indent=2))
 
+def snapshot_main(path=ENRICHED_DATA_PATH):
+    """Rebuild only the binary files of an already published dataset."""
+    publish_snapshot(ResourceStore.load_json(path), path)
+    print(f"Snapshot written to: {snapshot_path(path)}")
+    print(f"Similar-resources index written to: {similar_path(path)}")
+
 if __name__ == "__main__":
-    main()
+    if "--snapshot-only" in sys.argv:
+        snapshot_main()
+    else:
+        main(full="--full" in sys.argv)
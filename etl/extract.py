@@ -1,7 +1,7 @@
-import requests
 import re
 import json
 import os
+import sys
 from datetime import datetime, timezone
 
 
@@ -14,33 +14,106 @@ GITHUB_RAW_URL = (
 
 
 def fetch_markdown(url):
+    import requests
+
     response = requests.get(url, timeout=10)
     response.raise_for_status()
     return response.text
 
-def parse_resources(markdown_text):
-    resources = []
-    current_category = "Uncategorized"
+# -----------------------------
+# Parsing
+# -----------------------------
+# Patterns are compiled once. The README is cut into sections at heading
+# lines (a cheap search for "\n#"), then each section is scanned once for
+# links, so the text is never split into lines. Links are found anywhere
+# on a line: items of nested lists at any depth get the category of the
+# nearest heading above them, and links on heading lines are skipped.
+HEADING_RE = re.compile(r"\n#{1,6}[^\S\n]+(.*)")
+FIRST_HEADING_RE = re.compile(r"#{1,6}[^\S\n]+(.*)")
+
+# Inline links: [name](url)
+LINK_RE = re.compile(r"\[(.*?)\]\((https?://[^)\n]+)\)")
+
+# Inline links, then reference links [name][label] and [name][]
+LINK_OR_REFERENCE_RE = re.compile(
+    r"\[(?:(.*?)\]\((https?://[^)\n]+)\)|([^\]\n]*)\]\[([^\]\n]*)\])"
+)
+
+# Link reference definitions: [label]: https://url "optional title"
+REFERENCE_RE = re.compile(
+    r"^[ \t]{0,3}\[([^\]\n]+)\]:[ \t]*<?(https?://[^\s>]+)>?",
+    re.MULTILINE,
+)
+
+
+def _label_key(label):
+    return " ".join(label.split()).casefold()
+
+
+def link_references(markdown_text):
+    """Reference-style link targets by normalized label (first one wins)."""
+    references = {}
+    for label, url in REFERENCE_RE.findall(markdown_text):
+        references.setdefault(_label_key(label), url)
+    return references
+
+
+def _sections(markdown_text):
+    """(category, start, end) for each run of text between headings."""
+    category, start = "Uncategorized", 0
 
-    for line in markdown_text.split("\n"):
-        # Capture headings of any level
-        heading_match = re.match(r"#{1,6}\s+(.*)", line)
-        if heading_match:
-            current_category = heading_match.group(1).strip()
+    first = FIRST_HEADING_RE.match(markdown_text)
+    if first:
+        category, start = first.group(1).strip(), first.end()
+
+    for heading in HEADING_RE.finditer(markdown_text, start):
+        yield category, start, heading.start()
+        category, start = heading.group(1).strip(), heading.end()
+
+    yield category, start, len(markdown_text)
+
+
+def iter_links(markdown_text):
+    """
+    Stream (category, name, url) for every link in a README, in document
+    order.
+    """
+    references = link_references(markdown_text) if "]:" in markdown_text else None
+
+    for category, start, end in _sections(markdown_text):
+        if not references:
+            for name, url in LINK_RE.findall(markdown_text, start, end):
+                yield category, name.strip(), url.strip()
             continue
 
-        # Capture markdown links
-        links = re.findall(r"\[(.*?)\]\((https?://[^)]+)\)", line)
-        for name, url in links:
-            resources.append({
-                "resource_name": name.strip(),
-                "source_url": url.strip(),
-                "category": current_category,
-                "extracted_at": datetime.now(timezone.utc).isoformat()
+        for name, url, ref_name, label in LINK_OR_REFERENCE_RE.findall(markdown_text, start, end):
+            if url:
+                yield category, name.strip(), url.strip()
+                continue
+            # [name][] uses the name itself as the label
+            url = references.get(_label_key(label or ref_name))
+            if url is not None:
+                yield category, ref_name.strip(), url
 
-            })
 
-    return resources
+def extraction_timestamp():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def iter_resources(markdown_text, extracted_at=None):
+    """Raw resource records; every record of a run shares one timestamp."""
+    extracted_at = extracted_at or extraction_timestamp()
+    for category, name, url in iter_links(markdown_text):
+        yield {
+            "resource_name": name,
+            "source_url": url,
+            "category": category,
+            "extracted_at": extracted_at,
+        }
+
+
+def parse_resources(markdown_text, extracted_at=None):
+    return list(iter_resources(markdown_text, extracted_at))
 
 def inspect_structure(markdown_text, n=50):
     lines = markdown_text.split("\n")
@@ -58,11 +131,13 @@ def main():
 
     os.makedirs(raw_dir, exist_ok=True)
 
-    print("Starting extraction...")
-    markdown = fetch_markdown(GITHUB_RAW_URL)
-    print(f"Downloaded markdown length: {len(markdown)} characters")
+    # Imported here: etl.sources builds on this module's parser
+    from etl.sources import DEFAULT_SOURCES, expand_sources, extract_sources
+
+    sources = expand_sources(sys.argv[1:] or DEFAULT_SOURCES)
+    print(f"Starting extraction from {len(sources)} source(s)...")
 
-    resources = parse_resources(markdown)
+    resources = list(extract_sources(sources))
     print(f"Parsed {len(resources)} resources")
 
     with open(RAW_DATA_PATH, "w", encoding="utf-8") as f:
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import sqlite3
+
+from api.store import fingerprint
+
+# -----------------------------
+# Paths
+# -----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MANIFEST_PATH = os.path.join(BASE_DIR, "..", "data", "manifest.json")
+PIPELINE_MANIFEST_PATH = os.path.join(BASE_DIR, "..", "data", "pipeline_manifest.sqlite")
+
+# Bump when transform/enrich rules change: a manifest written under other
+# rules is ignored, so the next run reprocesses everything
+RULES_VERSION = 2
+
+# Resource ids per SQLite lookup (bound parameters per statement)
+LOOKUP_CHUNK = 500
+
+# SQLite page cache per manifest, in KiB. Resource ids are hashes, so
+# lookups and inserts hit random pages; the default 2 MiB cache thrashes
+# on large catalogs
+MANIFEST_CACHE_KIB = 65536
+
+# -----------------------------
+# Content hashes
+# -----------------------------
+def content_hash(record, fields=None):
+    """
+    Stable hash of a record's content (or of selected fields), used to
+    tell whether a resource changed since the last run.
+    """
+    if fields is not None:
+        record = {f: record.get(f) for f in fields}
+    raw = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+# -----------------------------
+# Manifest
+# -----------------------------
+# One JSON file with a section per stage, each keyed by resource_id:
+#   {"transform": {resource_id: raw_hash},
+#    "enrich": {resource_id: [clean_hash, domain, category]}}
+
+def _read(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("rules_version") != RULES_VERSION:
+        return {}
+    return manifest
+
+def load_manifest(stage, path=MANIFEST_PATH):
+    return _read(path).get(stage, {})
+
+def save_manifest(stage, entries, path=MANIFEST_PATH):
+    manifest = _read(path)
+    manifest["rules_version"] = RULES_VERSION
+    manifest[stage] = entries
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def drop_manifest(stages, path=MANIFEST_PATH):
+    """Forget stage state whose outputs were overwritten by another run."""
+    manifest = _read(path)
+    if any(stage in manifest for stage in stages):
+        for stage in stages:
+            manifest.pop(stage, None)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+def load_previous(path):
+    """Previous stage output as {resource_id: record}, or {} if missing."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {r["resource_id"]: r for r in json.load(f)}
+
+# -----------------------------
+# Pipeline manifest
+# -----------------------------
+class ResourceManifest:
+    """
+    Per-resource state of a streaming pipeline run, kept in SQLite so
+    lookups stay on disk and memory does not grow with the catalog:
+    resource_id -> (raw_hash, domain, category, offset, length), where
+    offset/length locate the record in the published JSON file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        # A run writes its manifest to a temporary path and moves it into
+        # place once committed, so it needs no rollback journal or fsyncs
+        self._conn.executescript(f"""
+            PRAGMA cache_size = -{MANIFEST_CACHE_KIB};
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS resources (
+                resource_id TEXT PRIMARY KEY,
+                raw_hash TEXT,
+                domain TEXT,
+                category TEXT,
+                offset INTEGER,
+                length INTEGER
+            );
+        """)
+
+    @classmethod
+    def open_previous(cls, path):
+        """The last run's manifest, or None if missing or from other rules."""
+        if not os.path.exists(path):
+            return None
+        manifest = cls(path)
+        if manifest.meta("rules_version") != str(RULES_VERSION):
+            manifest.close()
+            return None
+        return manifest
+
+    def meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def get_many(self, resource_ids):
+        """{resource_id: (raw_hash, domain, category, offset, length)} for the recorded ones."""
+        ids = list(dict.fromkeys(resource_ids))
+        found = {}
+        for start in range(0, len(ids), LOOKUP_CHUNK):
+            chunk = ids[start:start + LOOKUP_CHUNK]
+            rows = self._conn.execute(
+                "SELECT resource_id, raw_hash, domain, category, offset, length FROM resources"
+                f" WHERE resource_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for row in rows:
+                found[row[0]] = row[1:]
+        return found
+
+    def add_many(self, rows):
+        """
+        Record (resource_id, raw_hash, domain, category) rows in one go.
+        Returns, per row, whether it was new (the first of its id).
+        """
+        seen = set(self.get_many(row[0] for row in rows))
+        added = []
+        for row in rows:
+            added.append(row[0] not in seen)
+            seen.add(row[0])
+        self._conn.executemany(
+            "INSERT INTO resources (resource_id, raw_hash, domain, category) VALUES (?, ?, ?, ?)",
+            [row for row, new in zip(rows, added) if new],
+        )
+        return added
+
+    def set_locations(self, locations):
+        """Store (offset, length, resource_id) rows."""
+        self._conn.executemany(
+            "UPDATE resources SET offset = ?, length = ? WHERE resource_id = ?",
+            locations,
+        )
+
+    def count_missing(self, other):
+        """How many of `other`'s resources are not in this manifest."""
+        self._conn.execute("ATTACH DATABASE ? AS other", (other.path,))
+        try:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM other.resources"
+                " WHERE resource_id NOT IN (SELECT resource_id FROM main.resources)"
+            ).fetchone()[0]
+        finally:
+            self._conn.execute("DETACH DATABASE other")
+
+    def describes(self, output_path):
+        """
+        Whether `output_path` is the file this manifest's offsets point
+        into. A size/mtime match is trusted; otherwise the content hash
+        decides (the file may have been replaced, e.g. by a git checkout).
+        """
+        recorded = self.meta("output")
+        if recorded is None or not os.path.exists(output_path):
+            return False
+        recorded = json.loads(recorded)
+        st = os.stat(output_path)
+        if st.st_size != recorded["size"]:
+            return False
+        if st.st_mtime_ns == recorded["mtime_ns"]:
+            return True
+        return fingerprint(output_path) == recorded["version"]
+
+    def commit(self, output=None):
+        """
+        Save the run. `output` is the identity of the published file
+        (size, mtime_ns and content hash, as api.store.source_info()).
+        """
+        meta = [("rules_version", str(RULES_VERSION))]
+        if output is not None:
+            meta.append(("output", json.dumps(output)))
+        self._conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta)
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
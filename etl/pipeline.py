@@ -0,0 +1,285 @@
+import itertools
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from api.store import StoreBuilder
+from etl.Transform import RAW_CONTENT_FIELDS, generate_resource_id, transform_records
+from etl.enriched import (
+    CATEGORY_SUMMARY_PATH,
+    DOMAIN_SUMMARY_PATH,
+    ENRICHED_DATA_PATH,
+    enrich_records,
+    publish_snapshot,
+    save_json,
+)
+from etl.manifest import (
+    MANIFEST_PATH,
+    PIPELINE_MANIFEST_PATH,
+    ResourceManifest,
+    content_hash,
+    drop_manifest,
+)
+from etl.sources import DEFAULT_SOURCES, extract_sources
+from etl.stream import JsonArrayWriter, RecordFile, iter_ndjson, read_records, tee_ndjson
+
+# -----------------------------
+# Paths
+# -----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RAW_NDJSON_PATH = os.path.join(BASE_DIR, "..", "data", "raw", "resources_raw.ndjson")
+CLEAN_NDJSON_PATH = os.path.join(BASE_DIR, "..", "data", "processed", "resources_clean.ndjson")
+
+# -----------------------------
+# Stages
+# -----------------------------
+# Every stage is a generator over records, so extract, transform and enrich
+# run interleaved in one process and only a record (or a spool line) is in
+# flight at a time. Per-resource state lives in an on-disk manifest, so
+# memory grows with the number of distinct domains and categories only.
+
+def extract_stream(sources=DEFAULT_SOURCES, raw_path=None):
+    """Raw records from every README in `sources`, or from a raw JSON/NDJSON file."""
+    if raw_path is not None:
+        return read_records(raw_path)
+    return extract_sources(sources)
+
+
+# Stages hand records to transform_records()/enrich_records() in batches,
+# so the columnar engine gets whole columns to work on
+BATCH_SIZE = 10000
+
+
+def batches(records, size=BATCH_SIZE):
+    records = iter(records)
+    while batch := list(itertools.islice(records, size)):
+        yield batch
+
+
+def transform_stream(
+    raw_records, previous, manifest, transform_all=False, transformed_at=None, engine=None
+):
+    """
+    Clean raw records, dropping duplicate URLs.
+
+    Records whose raw content hash matches `previous` (the last run's
+    manifest) are not transformed; a {"_carry": resource_id, "_at":
+    [offset, length]} marker stands in for them, to be replaced by the
+    previously published record. Every kept resource is recorded in
+    `manifest`. Both manifests are read and written a batch at a time.
+
+    Yields (item, domain, category, clean_record_or_None).
+    """
+    for batch in batches(raw_records):
+        keyed = []
+        for r in batch:
+            url = r.get("source_url")
+            if url:
+                keyed.append((generate_resource_id(url), content_hash(r, RAW_CONTENT_FIELDS), r))
+
+        known = previous.get_many(k[0] for k in keyed) if previous is not None else {}
+        carried = []
+        for resource_id, raw_hash, _ in keyed:
+            row = known.get(resource_id)
+            carried.append(row if row is not None and row[0] == raw_hash else None)
+
+        cleaned = iter(transform_records(
+            [r for (_, _, r), row in zip(keyed, carried) if row is None or transform_all],
+            transformed_at,
+            engine,
+        ))
+
+        rows, items = [], []
+        for (resource_id, raw_hash, _), row in zip(keyed, carried):
+            clean = next(cleaned) if row is None or transform_all else None
+            if row is not None:
+                _, domain, category, offset, length = row
+                item = {"_carry": resource_id, "_at": [offset, length]}
+            else:
+                domain = clean.get("domain", "unknown")
+                category = clean.get("category", "unknown")
+                item = clean
+            rows.append((resource_id, raw_hash, domain, category))
+            items.append((item, domain, category, clean))
+
+        for new, item in zip(manifest.add_many(rows), items):
+            if new:
+                yield item
+
+
+def enrich_stream(items, domain_counts, previous_path, enriched_at=None, engine=None):
+    """
+    Enrich transformed records and resolve carried-forward ones.
+
+    Carried records are read back from the previous output by offset and
+    only get a new domain_weight if their domain's count changed; the rest
+    are passed on with their published bytes, for the writer to copy.
+
+    Yields (record, published_bytes_or_None).
+    """
+    published = None
+    try:
+        for batch in batches(items):
+            fresh = iter(enrich_records(
+                [item for item in batch if "_carry" not in item],
+                domain_counts,
+                enriched_at,
+                engine,
+            ))
+
+            for item in batch:
+                if "_carry" not in item:
+                    yield next(fresh), None
+                    continue
+
+                if published is None:
+                    published = RecordFile(previous_path)
+                data = published.read_bytes(*item["_at"])
+                record = json.loads(data)
+                weight = domain_counts.get(record.get("domain"), 0)
+                if record.get("domain_weight") != weight:
+                    yield {**record, "domain_weight": weight}, None
+                else:
+                    yield record, data
+    finally:
+        if published is not None:
+            published.close()
+
+# -----------------------------
+# Pipeline
+# -----------------------------
+LOCATION_BATCH_SIZE = 10000
+
+
+def run(
+    sources=DEFAULT_SOURCES,
+    raw_path=None,
+    output_path=ENRICHED_DATA_PATH,
+    manifest_path=PIPELINE_MANIFEST_PATH,
+    stage_manifest_path=MANIFEST_PATH,
+    full=False,
+    keep_intermediate=False,
+    engine=None,
+    snapshot=True,
+):
+    """
+    Extract → transform → enrich in one streaming pass plus a spool.
+
+    domain_weight needs every record's domain before the first record can
+    be enriched, so pass one transforms into a temporary NDJSON spool while
+    counting domains and categories, and pass two enriches from the spool
+    straight into the published JSON array. Intermediate raw/clean NDJSON
+    files are only written with `keep_intermediate` (which also transforms
+    carried-forward records, so the clean file is complete). `engine`
+    picks the python or arrow (columnar) transform/enrich engine; both
+    publish the same records. With `snapshot`, published records are also
+    folded into columns for the API's binary snapshot and similar-resources
+    index (compact columns, not dicts, are held until the end of the run).
+
+    Returns run statistics.
+    """
+    started = time.perf_counter()
+
+    previous = None
+    if not full and os.path.exists(output_path):
+        previous = ResourceManifest.open_previous(manifest_path)
+        # Offsets are only good for the file they were taken from
+        if previous is not None and not previous.describes(output_path):
+            previous.close()
+            previous = None
+
+    new_manifest_path = f"{manifest_path}.tmp"
+    if os.path.exists(new_manifest_path):
+        os.remove(new_manifest_path)
+    manifest = ResourceManifest(new_manifest_path)
+
+    raw = extract_stream(sources, raw_path)
+    if keep_intermediate:
+        raw = tee_ndjson(raw, RAW_NDJSON_PATH)
+
+    category_counts, domain_counts = Counter(), Counter()
+    records = changed = 0
+
+    try:
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+            # Pass 1: transform, count, spool
+            clean_out = None
+            if keep_intermediate:
+                clean_out = open(f"{CLEAN_NDJSON_PATH}.tmp", "w", encoding="utf-8")
+
+            transformed_at = datetime.now(timezone.utc).isoformat()
+            for item, domain, category, clean in transform_stream(
+                raw, previous, manifest, keep_intermediate, transformed_at, engine
+            ):
+                domain_counts[domain] += 1
+                category_counts[category] += 1
+                records += 1
+                changed += "_carry" not in item
+
+                spool.write(json.dumps(item, ensure_ascii=False))
+                spool.write("\n")
+                if clean_out is not None:
+                    clean_out.write(json.dumps(clean, ensure_ascii=False))
+                    clean_out.write("\n")
+
+            if clean_out is not None:
+                clean_out.close()
+                os.replace(f"{CLEAN_NDJSON_PATH}.tmp", CLEAN_NDJSON_PATH)
+
+            extracted = time.perf_counter()
+
+            # Pass 2: enrich and publish
+            spool.seek(0)
+            writer = JsonArrayWriter(output_path)
+            builder = StoreBuilder() if snapshot else None
+            locations = []
+            try:
+                enriched_at = datetime.now(timezone.utc).isoformat()
+                enriched = enrich_stream(iter_ndjson(spool), domain_counts, output_path, enriched_at, engine)
+                for record, data in enriched:
+                    offset, length = writer.write(record, data)
+                    if builder is not None:
+                        builder.add(record)
+                    locations.append((offset, length, record["resource_id"]))
+                    if len(locations) >= LOCATION_BATCH_SIZE:
+                        manifest.set_locations(locations)
+                        locations = []
+                manifest.set_locations(locations)
+            except BaseException:
+                writer.abort()
+                raise
+            writer.close(
+                (lambda tmp_path: publish_snapshot(builder.build(), output_path, tmp_path))
+                if builder is not None else None
+            )
+
+        st = os.stat(output_path)
+        manifest.commit({"size": st.st_size, "mtime_ns": st.st_mtime_ns, "version": writer.version})
+        removed = manifest.count_missing(previous) if previous is not None else 0
+    finally:
+        manifest.close()
+        if previous is not None:
+            previous.close()
+
+    os.replace(new_manifest_path, manifest_path)
+    # The stage-by-stage enrich state no longer matches the output
+    drop_manifest(["enrich", "enrich_counts"], stage_manifest_path)
+
+    # Summaries live next to the published dataset
+    output_dir = os.path.dirname(output_path)
+    save_json(dict(category_counts), os.path.join(output_dir, os.path.basename(CATEGORY_SUMMARY_PATH)))
+    save_json(dict(domain_counts), os.path.join(output_dir, os.path.basename(DOMAIN_SUMMARY_PATH)))
+
+    finished = time.perf_counter()
+    return {
+        "records": records,
+        "changed": changed,
+        "carried": records - changed,
+        "removed": removed,
+        "extract_transform_seconds": round(extracted - started, 3),
+        "enrich_seconds": round(finished - extracted, 3),
+    }
@@ -0,0 +1,109 @@
+import re
+from collections import deque
+
+# -----------------------------
+# Skill classifier
+# -----------------------------
+# Keywords are matched as whole words: text is split into word tokens and
+# a keyword is a sequence of tokens ("machine learning"), so "ml" hits
+# "ML" and "ml-ops" but not "html". A trailing "s" is allowed on the last
+# token ("apis", "databases").
+#
+# All keywords are compiled into one Aho-Corasick automaton over tokens,
+# which finds every hit (overlapping ones included) in a single pass. Cost
+# per text depends on its length only, not on the size of the table.
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+DEFAULT_CLUSTER = "general"
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillClassifier:
+    """
+    Multi-label classifier built once from a {cluster: [keywords]} table.
+
+    scores() sums keyword hits per cluster, each weighted by its length in
+    tokens so specific phrases ("react native") outweigh the words inside
+    them ("react"). The primary cluster is the best-scoring one, ties going
+    to the cluster listed first.
+    """
+
+    def __init__(self, keywords):
+        self.clusters = list(keywords)
+        # Trie over tokens: per node a {token: child} map and the
+        # (cluster index, weight) of keywords ending there, fail-chain
+        # outputs merged in
+        self._goto = [{}]
+        self._out = [[]]
+
+        for index, cluster in enumerate(self.clusters):
+            for keyword in keywords[cluster]:
+                tokens = tokenize(keyword)
+                if not tokens:
+                    continue
+                hit = (index, len(tokens))
+                self._insert(tokens, hit)
+                self._insert(tokens[:-1] + [tokens[-1] + "s"], hit)
+
+        self._fail = self._link()
+
+    def _insert(self, tokens, hit):
+        node = 0
+        for token in tokens:
+            child = self._goto[node].get(token)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][token] = child
+                self._goto.append({})
+                self._out.append([])
+            node = child
+        if hit not in self._out[node]:
+            self._out[node].append(hit)
+
+    def _link(self):
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and token not in self._goto[state]:
+                    state = fail[state]
+                target = self._goto[state].get(token, 0)
+                fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + [
+                    hit for hit in self._out[fail[child]] if hit not in self._out[child]
+                ]
+        return fail
+
+    def hits(self, text):
+        """(cluster index, weight) of every keyword hit in `text`, in text order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for token in tokenize(text):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if out[node]:
+                yield from out[node]
+
+    def scores(self, text):
+        """{cluster: score} for clusters with at least one hit, in table order."""
+        counts = [0] * len(self.clusters)
+        for index, weight in self.hits(text):
+            counts[index] += weight
+        return {c: n for c, n in zip(self.clusters, counts) if n}
+
+    @staticmethod
+    def primary(scores):
+        """Best-scoring cluster (first listed on ties), or the default cluster."""
+        if not scores:
+            return DEFAULT_CLUSTER
+        # max() keeps the first of equal scores, and scores are in table order
+        return max(scores, key=scores.get)
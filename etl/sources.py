@@ -0,0 +1,279 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from etl.extract import GITHUB_RAW_URL, extraction_timestamp, iter_resources, parse_resources
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Paths / settings
+# -----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HTTP_CACHE_DIR = os.path.join(BASE_DIR, "..", "data", "raw", "http_cache")
+
+DEFAULT_SOURCES = (GITHUB_RAW_URL,)
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+FETCH_WORKERS = int(os.getenv("ETL_FETCH_WORKERS", "8"))
+PER_HOST_LIMIT = int(os.getenv("ETL_PER_HOST_LIMIT", "2"))
+PARSE_PROCESSES = int(os.getenv("ETL_PARSE_PROCESSES", str(os.cpu_count() or 1)))
+
+FETCH_TIMEOUT_SECONDS = 10
+FETCH_RETRIES = 3
+BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# -----------------------------
+# Sources
+# -----------------------------
+# A source is an http(s) URL, a file:// URL or a local path. A directory
+# stands for every markdown file under it, in path order, which is how
+# offline fixtures are fed to the pipeline.
+
+def is_remote(source):
+    return urlparse(source).scheme in ("http", "https")
+
+
+def local_path(source):
+    parsed = urlparse(source)
+    if parsed.scheme == "file":
+        return url2pathname(parsed.path)
+    return source
+
+
+def expand_sources(sources):
+    """Flatten directories into their markdown files and drop repeats."""
+    if isinstance(sources, str):
+        sources = [sources]
+
+    expanded = []
+    for source in sources:
+        path = None if is_remote(source) else local_path(source)
+        if path is not None and os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                expanded.extend(
+                    os.path.join(root, name)
+                    for name in sorted(files)
+                    if name.lower().endswith(MARKDOWN_SUFFIXES)
+                )
+        else:
+            expanded.append(source)
+
+    return list(dict.fromkeys(expanded))
+
+# -----------------------------
+# Fetching
+# -----------------------------
+class SourceFetcher:
+    """
+    Fetches sources concurrently over one shared HTTP connection pool.
+
+    At most `per_host` requests run against any one host at a time.
+    Connection errors and retryable statuses (429/5xx) are retried with
+    exponential backoff and jitter, honouring Retry-After. Responses are
+    cached on disk with their ETag/Last-Modified, and later fetches are
+    conditional, so an unchanged list costs a 304. If a source still fails
+    after all retries, its cached copy is used when there is one.
+    """
+
+    def __init__(
+        self,
+        cache_dir=HTTP_CACHE_DIR,
+        workers=FETCH_WORKERS,
+        per_host=PER_HOST_LIMIT,
+        retries=FETCH_RETRIES,
+        backoff=BACKOFF_SECONDS,
+        timeout=FETCH_TIMEOUT_SECONDS,
+        session=None,
+    ):
+        self.cache_dir = cache_dir
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._session = session
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self.stats = {"fetched": 0, "not_modified": 0, "retries": 0, "stale": 0, "local": 0}
+
+    # Shared pool ------------------------------------------------------
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def _host_slot(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    # Conditional GET cache ---------------------------------------------
+
+    def _cache_paths(self, url):
+        key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.md"
+
+    def _cached(self, url):
+        meta_path, body_path = self._cache_paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "r", encoding="utf-8") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _store(self, url, response, text):
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        if not (meta["etag"] or meta["last_modified"]):
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, body_path = self._cache_paths(url)
+        for path, content in ((body_path, text), (meta_path, json.dumps(meta))):
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(f"{path}.tmp", path)
+
+    # Fetch -------------------------------------------------------------
+
+    def _delay(self, attempt, response):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    when = parsedate_to_datetime(retry_after)
+                    delay = (when - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    delay = 0
+            return min(max(delay, 0), MAX_BACKOFF_SECONDS)
+
+        delay = self.backoff * (2 ** attempt)
+        return min(delay + random.uniform(0, self.backoff), MAX_BACKOFF_SECONDS)
+
+    def fetch(self, source):
+        """Markdown text of one source."""
+        if not is_remote(source):
+            self._count("local")
+            with open(local_path(source), "r", encoding="utf-8") as f:
+                return f.read()
+
+        import requests
+
+        meta, cached = self._cached(source)
+        headers = {}
+        if cached is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        slot = self._host_slot(source)
+        error = None
+
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                with slot:
+                    response = self.session.get(source, headers=headers, timeout=self.timeout)
+                if response.status_code == 304 and cached is not None:
+                    self._count("not_modified")
+                    return cached
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    text = response.text
+                    self._store(source, response, text)
+                    self._count("fetched")
+                    return text
+                error = requests.HTTPError(
+                    f"{response.status_code} for url: {source}", response=response
+                )
+            except requests.HTTPError as exc:
+                # Not retryable (e.g. 404)
+                error = exc
+                break
+            except requests.RequestException as exc:
+                error = exc
+
+            if attempt < self.retries:
+                self._count("retries")
+                time.sleep(self._delay(attempt, response))
+
+        if cached is not None:
+            logger.warning("Fetching %s failed (%s); using cached copy", source, error)
+            self._count("stale")
+            return cached
+        raise error
+
+# -----------------------------
+# Extract
+# -----------------------------
+def extract_sources(sources=DEFAULT_SOURCES, fetcher=None, processes=PARSE_PROCESSES):
+    """
+    Raw records from every source, in source order, all stamped with the
+    same extraction time.
+
+    Sources are fetched on a thread pool; each one is handed to a process
+    pool for parsing as soon as it arrives, so parsing a large list
+    overlaps with downloading the rest. A single source is parsed in
+    process, where a pool would only add start-up cost.
+    """
+    sources = expand_sources(sources)
+    fetcher = fetcher or SourceFetcher()
+    extracted_at = extraction_timestamp()
+
+    if len(sources) == 1 or processes <= 1:
+        with ThreadPoolExecutor(min(fetcher.workers, len(sources) or 1)) as fetch_pool:
+            for text in fetch_pool.map(fetcher.fetch, sources):
+                yield from iter_resources(text, extracted_at)
+        return
+
+    # Workers are spawned, not forked: fetch threads may hold locks
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(min(processes, len(sources)), mp_context=context) as parse_pool, \
+            ThreadPoolExecutor(min(fetcher.workers, len(sources))) as fetch_pool:
+
+        def fetch_and_parse(source):
+            return parse_pool.submit(parse_resources, fetcher.fetch(source), extracted_at)
+
+        pending = [fetch_pool.submit(fetch_and_parse, s) for s in sources]
+        for future in pending:
+            yield from future.result().result()
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+
+# -----------------------------
+# Streaming record I/O
+# -----------------------------
+# NDJSON is the pipeline's intermediate format: one record per line, so
+# stages can read and write one record at a time. Published datasets stay
+# JSON arrays for the API, but are written and read incrementally too.
+
+READ_CHUNK_SIZE = 1 << 16
+
+
+def iter_ndjson(f):
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_json_array(f, chunk_size=READ_CHUNK_SIZE):
+    """Yield the objects of a top-level JSON array without loading it whole."""
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("Expected a JSON array")
+    pos = 1
+    eof = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+
+        try:
+            if pos >= len(buffer):
+                raise json.JSONDecodeError("Need more data", buffer, pos)
+            item, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = f.read(chunk_size)
+            eof = not more
+            buffer = buffer[pos:] + more
+            pos = 0
+            continue
+
+        yield item
+
+
+def read_records(path):
+    """Records from a JSON array or NDJSON file, one at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first == "[":
+            yield from iter_json_array(f)
+        else:
+            yield from iter_ndjson(f)
+
+
+def write_ndjson(records, path):
+    """Write records as NDJSON (atomically); returns the count."""
+    count = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def tee_ndjson(records, path):
+    """Pass records through unchanged while also writing them to `path`."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False))
+            f.write("\n")
+            yield r
+    os.replace(tmp_path, path)
+
+
+class JsonArrayWriter:
+    """
+    Streams records into a JSON array file, byte-identical to
+    json.dump(records, f, indent=2, ensure_ascii=False).
+
+    write() returns each record's (offset, length) in the file so it can be
+    read back later without parsing the rest. The file is written to a
+    temporary path and only replaces `path` on close(); `version` is then
+    its content hash, as api.store.fingerprint() would compute it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._tmp_path = f"{path}.tmp"
+        self._f = open(self._tmp_path, "wb")
+        self._offset = 0
+        self._count = 0
+        self._digest = hashlib.blake2b(digest_size=8)
+        self.version = None
+
+    def _emit(self, data):
+        self._f.write(data)
+        self._digest.update(data)
+        self._offset += len(data)
+
+    def write(self, record, data=None):
+        """
+        Append a record. `data` may hold its bytes as an earlier writer
+        wrote them (see RecordFile.read_bytes()), to copy them unencoded.
+        """
+        self._emit(b"[\n  " if self._count == 0 else b",\n  ")
+        if data is None:
+            data = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ").encode("utf-8")
+        start = self._offset
+        self._emit(data)
+        self._count += 1
+        return start, len(data)
+
+    def close(self, before_replace=None):
+        """
+        Finish the file and move it into place. `before_replace(tmp_path)`
+        runs on the complete file just before it replaces `path`.
+        """
+        self._emit(b"\n]" if self._count else b"[]")
+        self._f.close()
+        self.version = self._digest.hexdigest()
+        if before_replace is not None:
+            before_replace(self._tmp_path)
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self._f.close()
+        os.remove(self._tmp_path)
+
+
+class RecordFile:
+    """Random access to records of a file by (offset, length)."""
+
+    def __init__(self, path):
+        self._f = open(path, "rb")
+
+    def read(self, offset, length):
+        return json.loads(self.read_bytes(offset, length))
+
+    def read_bytes(self, offset, length):
+        self._f.seek(offset)
+        return self._f.read(length)
+
+    def close(self):
+        self._f.close()
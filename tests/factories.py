@@ -0,0 +1,80 @@
+import random
+
+from api.data import Dataset
+from api.store import ResourceStore
+
+# -----------------------------
+# Record factories
+# -----------------------------
+# Enriched resources with every field the API reads. Tests override only
+# the fields they care about.
+
+def make_record(resource_id, **fields):
+    record = {
+        "resource_id": resource_id,
+        "resource_name": f"Resource {resource_id}",
+        "source_url": f"https://example.com/{resource_id}",
+        "domain": "example.com",
+        "category": "tools",
+        "resource_type": "tool",
+        "skill_cluster": "data",
+        "domain_weight": 1,
+        "is_github": False,
+    }
+    record.update(fields)
+    return record
+
+
+def make_records(n, **fields):
+    """
+    `n` records with ids id000, id001, ... A field given as a function is
+    called with the record's index, in the order the fields are passed.
+    """
+    return [
+        make_record(f"id{i:03d}", **{k: v(i) if callable(v) else v for k, v in fields.items()})
+        for i in range(n)
+    ]
+
+
+# Words of make_catalog() names; several share prefixes, for typeahead
+CATALOG_WORDS = ["react", "redux", "python", "pandas", "docs", "guide", "rust", "regex", "résumé"]
+
+
+def make_catalog(n, seed=3, renamed=()):
+    """
+    `n` records with random names, domains, categories and weights, for
+    search and similarity tests. Records in `renamed` get " Renamed"
+    appended to their name.
+    """
+    rng = random.Random(seed)
+
+    def name(i):
+        name = " ".join(rng.choice(CATALOG_WORDS).title() for _ in range(rng.randint(1, 3)))
+        return f"{name} Renamed" if i in renamed else name
+
+    return make_records(
+        n,
+        resource_name=name,
+        domain=lambda i: rng.choice(["github.com", "docs.python.org", "www.reactjs.org", "pandas.io"]),
+        category=lambda i: rng.choice(["web dev", "data", "python"]),
+        resource_type=lambda i: rng.choice(["tool", "course"]),
+        skill_cluster=lambda i: rng.choice(["frontend", "data", "Backend"]),
+        domain_weight=lambda i: rng.randint(0, 9),
+    )
+
+
+def make_store(rows):
+    """A store from (resource_id, skill_cluster, resource_type, domain_weight, is_github) rows."""
+    return ResourceStore.from_records([
+        make_record(rid, skill_cluster=skill, resource_type=rtype, domain_weight=weight, is_github=is_github)
+        for rid, skill, rtype, weight, is_github in rows
+    ])
+
+
+def make_dataset(version="v1"):
+    """60 backend resources, with plenty of equal weights so ties need breaking."""
+    rows = [
+        (f"id{i:03d}", "backend", "tool" if i % 3 else "course", i % 4, i % 5 == 0)
+        for i in range(60)
+    ]
+    return Dataset(make_store(rows), version)
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.service import get_recommendations, get_recommendations_batch
+from tests.factories import make_dataset
+
+
+def test_batch_matches_single_queries_in_request_order():
+    dataset = make_dataset()
+    queries = [
+        {"skill": "backend", "limit": 3},
+        {"skill": "data"},
+        {"skill": "Backend", "limit": 3},
+        {"skill": "backend", "resource_type": "course", "minimum_domain_weight": 2},
+    ]
+
+    items = get_recommendations_batch(queries, access_mode="full", dataset=dataset)
+
+    assert [item["status"] for item in items] == [200] * 4
+    for query, item in zip(queries, items):
+        expected = get_recommendations(access_mode="full", dataset=dataset, **query)
+        assert item["response"] == expected
+        assert item["elapsed_ms"] >= 0
+
+
+def test_batch_reports_failures_per_query():
+    client = TestClient(app)
+
+    response = client.post(
+        "/v1/recommendations/batch",
+        json={"queries": [{"skill": "frontend"}, {"skill": "frontend", "cursor": "bad"}]},
+    )
+
+    assert response.status_code == 200
+    first, second = response.json()["results"]
+    assert first["status"] == 200 and first["response"]["count"] > 0
+    assert second["status"] == 400 and second["response"] is None
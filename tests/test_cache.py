@@ -0,0 +1,69 @@
+from fastapi.testclient import TestClient
+
+from api.cache import ResponseCache, etag_matches
+from api.main import app
+
+
+def test_discovery_endpoints_revalidate_with_etag():
+    client = TestClient(app)
+
+    for path in ["/v1/skills", "/v1/resource-types", "/v1/domains", "/v1/stats", "/v1/debug/availability"]:
+        first = client.get(path)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        revalidated = client.get(path, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+
+
+def test_etag_matches_weak_and_listed_tags():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_response_cache_evicts_least_recently_used_over_budget():
+    cache = ResponseCache(max_bytes=10, ttl_seconds=60)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"
+
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"1234"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 8
+
+
+def test_response_cache_expires_entries(monkeypatch):
+    import api.cache as cache_module
+
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+    cache = ResponseCache(max_bytes=100, ttl_seconds=5)
+    cache.put("a", b"x")
+    assert cache.get("a") == b"x"
+
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_recommendations_served_from_cache():
+    client = TestClient(app)
+    params = {"skill": "frontend", "limit": 3, "offset": 1}
+
+    first = client.get("/v1/recommendations", params=params)
+    second = client.get("/v1/recommendations", params=params)
+
+    assert second.headers["x-cache"] == "HIT"
+    assert first.content == second.content
@@ -0,0 +1,52 @@
+import json
+from collections import Counter
+
+import pytest
+
+from etl.Transform import transform_records
+from etl.enriched import enrich_records
+from tests.test_etl_pipeline import pipeline
+from tests.test_etl_incremental import raw, strip
+
+pytest.importorskip("pyarrow")
+
+RAW = [
+    raw("React Docs!", "https://React.dev/learn", "JavaScript"),
+    raw("  Flask   tutorial ", "https://github.com/pallets/flask", "Backend & APIs"),
+    raw("Kubernetes\x0bBlog", "http://medium.com/k8s?ref=x#top", "DevOps / CI"),
+    raw(None, "https://example.com", None),
+    raw("", "https://user@Host.example.com:8080/path", "databasedatabase"),
+    raw("Déjà vu ML", "https://ünïcode.example.com/x", "Machine Learning"),
+    raw("IPv6", "https://[::1]/api", "Tools"),
+    raw("Android dev", "https://developer.android.com\t/guide", "a name Mobile"),
+    raw("!!!", "ftp://files.example.com/data.sql", "Data"),
+]
+
+
+def dumps(records):
+    return json.dumps(records, indent=2, ensure_ascii=False)
+
+
+def test_columnar_engine_is_byte_identical():
+    python = transform_records(RAW, "T", engine="python")
+    arrow = transform_records(RAW, "T", engine="arrow")
+    assert dumps(arrow) == dumps(python)
+
+    domains = Counter(r["domain"] for r in python)
+    assert dumps(enrich_records(python, domains, "E", engine="arrow")) == dumps(
+        enrich_records(python, domains, "E", engine="python")
+    )
+
+
+def test_pipeline_engines_publish_the_same_records(tmp_path):
+    (tmp_path / "python").mkdir()
+    (tmp_path / "arrow").mkdir()
+    python, _ = pipeline(tmp_path / "python", RAW * 2, engine="python")
+    arrow, _ = pipeline(tmp_path / "arrow", RAW * 2, engine="arrow")
+
+    assert strip(json.loads(arrow.read_text())) == strip(json.loads(python.read_text()))
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        transform_records(RAW, engine="spark")
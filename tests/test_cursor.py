@@ -0,0 +1,110 @@
+import pytest
+from fastapi import HTTPException
+
+from api.schemas import RecommendationResponse
+from api.service import get_recommendations
+from api.service.cursor import decode_cursor, encode_cursor
+from tests.factories import make_dataset
+
+
+def walk(dataset, **query):
+    ids, cursor = [], None
+    while True:
+        response = get_recommendations("backend", dataset=dataset, cursor=cursor, **query)
+        ids += [r["resource_id"] for r in response["results"]]
+        cursor = response["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def offset_walk(dataset, limit, **query):
+    ids, offset = [], 0
+    while True:
+        response = get_recommendations(
+            "backend", limit=limit, offset=offset, dataset=dataset, **query
+        )
+        if not response["results"]:
+            return ids
+        ids += [r["resource_id"] for r in response["results"]]
+        offset += limit
+
+
+@pytest.mark.parametrize("query", [
+    {},
+    {"resource_type": "Tool"},
+    {"minimum_domain_weight": 2},
+])
+def test_full_mode_cursor_walk_matches_offsets(query):
+    dataset = make_dataset()
+
+    ids = walk(dataset, limit=7, access_mode="full", **query)
+
+    assert ids == offset_walk(dataset, 7, access_mode="full", **query)
+    assert len(ids) == len(set(ids))
+
+
+def test_demo_mode_cursor_walk_matches_offsets():
+    dataset = make_dataset()
+
+    ids = walk(dataset, access_mode="demo")
+
+    assert len(ids) == 60
+    assert ids == offset_walk(dataset, 8, access_mode="demo")
+
+
+def test_demo_mode_offset_past_the_end_is_a_valid_empty_page():
+    response = get_recommendations("backend", offset=100, dataset=make_dataset(), access_mode="demo")
+
+    assert response["results"] == []
+    assert RecommendationResponse.model_validate(response).skill_cluster == "backend"
+
+
+def test_cursor_rejected_after_dataset_change():
+    first = get_recommendations("backend", access_mode="demo", dataset=make_dataset("v1"))
+
+    with pytest.raises(HTTPException) as exc:
+        get_recommendations(
+            "backend",
+            access_mode="demo",
+            dataset=make_dataset("v2"),
+            cursor=first["next_cursor"],
+        )
+    assert exc.value.status_code == 400
+
+
+def test_cursor_rejected_for_other_filters_or_garbage():
+    dataset = make_dataset()
+    first = get_recommendations("backend", access_mode="demo", dataset=dataset)
+
+    for kwargs in (
+        {"cursor": first["next_cursor"], "resource_type": "course"},
+        {"cursor": first["next_cursor"], "offset": 8},
+        {"cursor": "not-a-cursor"},
+    ):
+        with pytest.raises(HTTPException) as exc:
+            get_recommendations("backend", access_mode="demo", dataset=dataset, **kwargs)
+        assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("access_mode", ["demo", "full"])
+@pytest.mark.parametrize("key", [True, float("nan"), float("inf"), float("-inf"), "3"])
+def test_forged_cursor_keys_are_rejected(access_mode, key):
+    dataset = make_dataset()
+    first = get_recommendations("backend", limit=7, access_mode=access_mode, dataset=dataset)
+    # json.dumps writes NaN/Infinity, which json.loads accepts
+    forged = encode_cursor(decode_cursor(first["next_cursor"])._replace(key=key))
+
+    with pytest.raises(HTTPException) as exc:
+        get_recommendations("backend", limit=7, access_mode=access_mode, dataset=dataset, cursor=forged)
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Invalid cursor"
+
+
+def test_demo_cursor_key_must_be_whole():
+    dataset = make_dataset()
+    first = get_recommendations("backend", access_mode="demo", dataset=dataset)
+    forged = encode_cursor(decode_cursor(first["next_cursor"])._replace(key=2.5))
+
+    with pytest.raises(HTTPException) as exc:
+        get_recommendations("backend", access_mode="demo", dataset=dataset, cursor=forged)
+    assert exc.value.detail == "Invalid cursor"
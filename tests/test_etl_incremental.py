@@ -0,0 +1,89 @@
+from etl.Transform import transform_incremental, transform_resources
+from etl.enriched import build_summaries, enrich_incremental, enrich_resources
+
+TIMESTAMPS = ("extracted_at", "transformed_at", "enriched_at")
+
+
+def raw(name, url, category="Tools"):
+    return {
+        "resource_name": name,
+        "source_url": url,
+        "category": category,
+        "extracted_at": "2026-01-01T00:00:00+00:00",
+    }
+
+
+def run(raw_records, state=None):
+    """One incremental transform + enrich run; returns (enriched, state)."""
+    state = state or {}
+    cleaned, transform_manifest, _ = transform_incremental(
+        raw_records, state.get("clean"), state.get("transform")
+    )
+    enriched, enrich_manifest, categories, domains, changed = enrich_incremental(
+        cleaned,
+        state.get("enriched"),
+        state.get("enrich"),
+        state.get("counts"),
+    )
+    return enriched, {
+        "clean": {r["resource_id"]: r for r in cleaned},
+        "transform": transform_manifest,
+        "enriched": {r["resource_id"]: r for r in enriched},
+        "enrich": enrich_manifest,
+        "counts": (categories, domains),
+        "changed": changed,
+    }
+
+
+def strip(records):
+    return [{k: v for k, v in r.items() if k not in TIMESTAMPS} for r in records]
+
+
+def full_run(raw_records):
+    cleaned = transform_resources(raw_records)
+    _, domains = build_summaries(cleaned)
+    return enrich_resources(cleaned, domains)
+
+
+def test_incremental_run_matches_full_run():
+    first_raw = [
+        raw("React docs", "https://react.dev/docs"),
+        raw("Vue", "https://vuejs.org", "JavaScript"),
+        raw("Flask", "https://github.com/pallets/flask", "Backend"),
+        raw("Django", "https://github.com/django/django", "Backend"),
+        raw("Pandas", "https://pandas.pydata.org", "Data"),
+    ]
+    first, state = run(first_raw)
+
+    second_raw = [
+        raw("React documentation", "https://react.dev/docs"),       # changed
+        raw("Vue", "https://vuejs.org", "JavaScript"),               # unchanged
+        raw("Flask", "https://github.com/pallets/flask", "Backend"),
+        # Django removed: github.com weight drops for Flask
+        raw("Pandas", "https://pandas.pydata.org", "Data"),
+        raw("FastAPI", "https://fastapi.tiangolo.com", "API"),       # added
+        raw("Vue", "https://vuejs.org", "JavaScript"),               # duplicate URL
+    ]
+    second, state = run(second_raw, state)
+
+    assert strip(second) == strip(full_run(second_raw))
+    assert state["changed"] == 2
+
+    # Unchanged records are carried forward byte for byte ...
+    assert second[1] == first[1]
+    assert second[3] == first[4]
+    # ... except for a domain_weight delta
+    assert (first[2]["domain_weight"], second[2]["domain_weight"]) == (2, 1)
+    assert second[2]["enriched_at"] == first[2]["enriched_at"]
+
+
+def test_unchanged_catalog_is_a_no_op():
+    raw_records = [raw("Vue", "https://vuejs.org"), raw("Svelte", "https://svelte.dev")]
+    first, state = run(raw_records)
+
+    # A re-extract restamps extracted_at but is not a content change
+    again_raw = [{**r, "extracted_at": "2026-02-01T00:00:00+00:00"} for r in raw_records]
+    again, state = run(again_raw, state)
+
+    assert again == first
+    assert state["changed"] == 0
@@ -0,0 +1,112 @@
+import io
+import json
+
+from api.similar import load_similar, similar_path
+from api.store import ResourceStore, load_snapshot, snapshot_path, source_info
+from etl.Transform import transform_resources
+from etl.enriched import build_summaries, enrich_resources
+from etl.pipeline import run
+from etl.stream import iter_json_array, write_ndjson
+from tests.test_etl_incremental import raw, strip
+
+RAW = [
+    raw("React docs", "https://react.dev/docs", "JavaScript"),
+    raw("Flask", "https://github.com/pallets/flask", "Backend"),
+    raw("Django", "https://github.com/django/django", "Backend"),
+    raw("Flask again", "https://github.com/pallets/flask", "Backend"),
+    raw("Pandas", "https://pandas.pydata.org", "Data"),
+]
+
+
+def pipeline(tmp_path, raw_records, **kwargs):
+    raw_path = tmp_path / "raw.ndjson"
+    write_ndjson(raw_records, raw_path)
+    output = tmp_path / "enriched" / "resources_enriched.json"
+    output.parent.mkdir(exist_ok=True)
+
+    stats = run(
+        raw_path=str(raw_path),
+        output_path=str(output),
+        manifest_path=str(tmp_path / "pipeline_manifest.sqlite"),
+        stage_manifest_path=str(tmp_path / "manifest.json"),
+        **kwargs,
+    )
+    return output, stats
+
+
+def test_pipeline_matches_stage_by_stage_run(tmp_path):
+    output, stats = pipeline(tmp_path, RAW)
+
+    cleaned = transform_resources(RAW)
+    categories, domains = build_summaries(cleaned)
+    expected = enrich_resources(cleaned, domains)
+
+    published = json.loads(output.read_text())
+    assert strip(published) == strip(expected)
+    assert json.loads((output.parent / "domain_summary.json").read_text()) == dict(domains)
+    assert stats["records"] == 4 and stats["changed"] == 4
+
+    # The API's binary snapshot is published with the JSON and matches it
+    store, source = load_snapshot(snapshot_path(str(output)))
+    assert source == source_info(str(output))
+    assert list(store) == list(ResourceStore.load_json(str(output)))
+    index, source = load_similar(similar_path(str(output)))
+    assert source == source_info(str(output))
+    assert len(index) == 4
+
+
+def test_pipeline_rerun_carries_records_forward(tmp_path):
+    output, _ = pipeline(tmp_path, RAW)
+    first = output.read_bytes()
+
+    output, stats = pipeline(tmp_path, RAW)
+    assert output.read_bytes() == first
+    assert stats["changed"] == 0
+
+    # Dropping Django changes github.com's weight for the carried Flask record
+    without_django = [r for r in RAW if "django" not in r["source_url"]]
+    output, stats = pipeline(tmp_path, without_django)
+    published = json.loads(output.read_text())
+    flask = next(r for r in published if "flask" in r["source_url"])
+
+    assert (stats["changed"], stats["removed"]) == (0, 1)
+    assert flask["domain_weight"] == 1
+    assert flask["enriched_at"] == json.loads(first)[1]["enriched_at"]
+
+    renamed = [
+        {**r, "resource_name": "Pandas!"} if "pandas" in r["source_url"] else r
+        for r in without_django
+    ]
+    output, stats = pipeline(tmp_path, renamed)
+
+    assert (stats["changed"], stats["carried"], stats["removed"]) == (1, 2, 0)
+    assert json.loads(output.read_text())[2]["resource_name"] == "Pandas"
+
+
+def test_pipeline_rebuilds_when_output_was_replaced(tmp_path):
+    output, _ = pipeline(tmp_path, RAW)
+    first = output.read_bytes()
+
+    # Same bytes, new mtime (e.g. restored from a backup): still trusted
+    output.write_bytes(first)
+    _, stats = pipeline(tmp_path, RAW)
+    assert stats["changed"] == 0
+
+    # Same size, other content: the manifest's offsets no longer point at
+    # records, so everything is rebuilt rather than read back
+    published = json.loads(first)
+    swapped = json.dumps(published[::-1], indent=2, ensure_ascii=False).encode("utf-8")
+    assert len(swapped) == len(first)
+    output.write_bytes(swapped)
+
+    output, stats = pipeline(tmp_path, RAW)
+    assert stats["changed"] == 4
+    assert strip(json.loads(output.read_text())) == strip(published)
+
+
+def test_iter_json_array_handles_small_chunks():
+    records = [{"a": i, "text": "x" * i} for i in range(50)]
+
+    parsed = list(iter_json_array(io.StringIO(json.dumps(records, indent=2)), chunk_size=5))
+
+    assert parsed == records
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from etl.extract import parse_resources
+from etl.pipeline import run
+from etl.sources import SourceFetcher, expand_sources, extract_sources
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "sources")
+
+LIST = "# Tools\n\n- [Flask](https://github.com/pallets/flask)\n"
+
+
+def fixture(*parts):
+    return os.path.join(FIXTURES, *parts)
+
+
+def names(records):
+    return [(r["category"], r["resource_name"]) for r in records]
+
+
+def test_directory_source_expands_to_markdown_files_in_path_order():
+    assert expand_sources([FIXTURES, fixture("backend.md")]) == [
+        fixture("backend.md"),
+        fixture("frontend.md"),
+        fixture("more", "data.md"),
+    ]
+
+
+def test_sources_are_extracted_in_order_with_or_without_a_parse_pool(tmp_path):
+    expected = []
+    for path in expand_sources(FIXTURES):
+        with open(path, encoding="utf-8") as f:
+            expected += parse_resources(f.read())
+
+    fetcher = SourceFetcher(cache_dir=str(tmp_path))
+    pooled = list(extract_sources([FIXTURES], fetcher=fetcher, processes=2))
+    in_process = list(extract_sources([f"file://{FIXTURES}"], fetcher=fetcher, processes=1))
+
+    assert names(pooled) == names(in_process) == names(expected)
+    assert ("Databases", "PostgreSQL docs") in names(pooled)
+
+
+def test_pipeline_runs_offline_from_a_directory_source(tmp_path):
+    output = tmp_path / "enriched" / "resources_enriched.json"
+    output.parent.mkdir()
+
+    stats = run(
+        sources=[FIXTURES],
+        output_path=str(output),
+        manifest_path=str(tmp_path / "pipeline_manifest.sqlite"),
+        stage_manifest_path=str(tmp_path / "manifest.json"),
+    )
+
+    published = json.loads(output.read_text())
+    urls = [r["source_url"] for r in published]
+    # Flask appears in two lists and is kept once
+    assert len(urls) == len(set(urls)) == stats["records"] == 8
+
+# -----------------------------
+# HTTP
+# -----------------------------
+class Origin(BaseHTTPRequestHandler):
+    failures = {}
+    active = 0
+    peak = 0
+    requests = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append((self.path, self.headers.get("If-None-Match")))
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(0.05)
+            if cls.failures.get(self.path, 0) > 0:
+                cls.failures[self.path] -= 1
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+            elif self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+            else:
+                body = LIST.encode("utf-8")
+                self.send_response(200)
+                self.send_header("ETag", '"v1"')
+                self.send_header("Content-Type", "text/markdown; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin():
+    pytest.importorskip("requests")
+    Origin.failures, Origin.requests = {}, []
+    Origin.active = Origin.peak = 0
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Origin)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_conditional_get_reuses_cached_body(origin, tmp_path):
+    url = f"{origin}/list.md"
+
+    first = SourceFetcher(cache_dir=str(tmp_path))
+    assert first.fetch(url) == LIST
+
+    second = SourceFetcher(cache_dir=str(tmp_path))
+    assert second.fetch(url) == LIST
+    assert second.stats["not_modified"] == 1
+    assert Origin.requests == [("/list.md", None), ("/list.md", '"v1"')]
+
+
+def test_retryable_errors_are_retried_with_backoff(origin, tmp_path):
+    import requests
+
+    Origin.failures["/flaky.md"] = 2
+
+    fetcher = SourceFetcher(cache_dir=str(tmp_path), backoff=0.01)
+    assert fetcher.fetch(f"{origin}/flaky.md") == LIST
+    assert fetcher.stats["retries"] == 2
+
+    Origin.failures["/down.md"] = 10
+    with pytest.raises(requests.HTTPError):
+        SourceFetcher(cache_dir=str(tmp_path), retries=1, backoff=0.01).fetch(f"{origin}/down.md")
+
+
+def test_failed_source_falls_back_to_cached_copy(origin, tmp_path):
+    url = f"{origin}/list.md"
+    SourceFetcher(cache_dir=str(tmp_path)).fetch(url)
+
+    Origin.failures["/list.md"] = 10
+    fetcher = SourceFetcher(cache_dir=str(tmp_path), retries=1, backoff=0.01)
+    assert fetcher.fetch(url) == LIST
+    assert fetcher.stats["stale"] == 1
+
+
+def test_per_host_concurrency_is_limited(origin, tmp_path):
+    sources = [f"{origin}/list-{i}.md" for i in range(8)]
+    fetcher = SourceFetcher(cache_dir=str(tmp_path), workers=8, per_host=2)
+
+    records = list(extract_sources(sources, fetcher=fetcher, processes=1))
+
+    assert len(records) == 8
+    assert Origin.peak == 2
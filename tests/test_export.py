@@ -0,0 +1,105 @@
+import csv
+import gzip
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.routes.recommendations import _accepts_gzip
+from api.service import get_recommendations
+from api.service.export import RankedExport
+from tests.factories import make_dataset
+
+FULL = {"X-API-Key": "demo-key"}
+
+
+def test_export_chunks_follow_ranked_order():
+    dataset = make_dataset()
+    export = RankedExport("backend", minimum_domain_weight=2, dataset=dataset, chunk_size=7)
+
+    rows = [r for chunk in export.chunks() for r in chunk]
+    expected = get_recommendations(
+        "backend", limit=100, minimum_domain_weight=2, access_mode="full", dataset=dataset
+    )
+
+    assert [r["resource_id"] for r in rows] == [
+        r["resource_id"] for r in expected["results"]
+    ]
+    assert [r["score"] for r in rows] == [r["score"] for r in expected["results"]]
+
+
+def test_export_blank_resource_type_is_no_filter():
+    dataset = make_dataset()
+
+    def exported(resource_type):
+        export = RankedExport("backend", resource_type=resource_type, dataset=dataset)
+        return [r["resource_id"] for chunk in export.chunks() for r in chunk]
+
+    assert exported("  ") == exported(None)
+    assert len(exported(None)) == 60
+
+
+def test_export_streams_ndjson_csv_and_gzip():
+    client = TestClient(app)
+    params = {"skill": "frontend"}
+
+    ndjson = client.get("/v1/recommendations/export", params=params, headers=FULL)
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+
+    # TestClient decodes gzip transparently, so check the raw bytes
+    with client.stream(
+        "GET",
+        "/v1/recommendations/export",
+        params={**params, "format": "csv"},
+        headers={**FULL, "Accept-Encoding": "gzip"},
+    ) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+    table = list(csv.DictReader(io.StringIO(gzip.decompress(raw).decode("utf-8"))))
+
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert len(rows) == len(table) > 0
+    assert [r["resource_id"] for r in rows] == [r["resource_id"] for r in table]
+
+
+def test_export_requires_full_mode():
+    client = TestClient(app)
+
+    response = client.get("/v1/recommendations/export", params={"skill": "frontend"})
+
+    assert response.status_code == 401
+
+
+def test_export_filename_is_header_safe():
+    client = TestClient(app)
+
+    for skill, fallback, encoded in (
+        ("Frontend", "frontend", "frontend"),
+        ("données", "donn_es", "donn%C3%A9es"),
+        ('a"b; c', "a_b_c", "a%22b%3B%20c"),
+    ):
+        response = client.get("/v1/recommendations/export", params={"skill": skill}, headers=FULL)
+        assert response.status_code == 200
+        assert response.headers["content-disposition"] == (
+            f"attachment; filename=\"{fallback}.ndjson\"; filename*=UTF-8''{encoded}.ndjson"
+        )
+
+
+def test_gzip_is_negotiated_by_q_value():
+    assert _accepts_gzip("gzip")
+    assert _accepts_gzip("br;q=1.0, GZIP;q=0.5")
+    assert _accepts_gzip("identity, *")
+    assert not _accepts_gzip("gzip;q=0")
+    assert not _accepts_gzip("gzip; q=0.000, br")
+    assert not _accepts_gzip("*;q=0")
+    assert not _accepts_gzip("br")
+    assert not _accepts_gzip(None)
+
+    client = TestClient(app)
+    response = client.get(
+        "/v1/recommendations/export",
+        params={"skill": "frontend"},
+        headers={**FULL, "Accept-Encoding": "gzip;q=0"},
+    )
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,46 @@
+from etl.extract import iter_links, parse_resources
+
+README = """\
+Intro with an [inline link](https://intro.example.com) before any heading.
+
+# Frontend
+
+- [React](https://react.dev)
+  - [Hooks](https://react.dev/reference/react) and [Router](https://reactrouter.com)
+    - [Deeply nested][router docs]
+
+## [Linked heading](https://heading.example.com)
+
+- [Vue][] - collapsed reference
+- [Missing][nowhere] - undefined references are skipped
+- [Svelte] [not a link]
+
+[router docs]: https://reactrouter.com/docs "Router"
+[vue]: <https://vuejs.org>
+"""
+
+
+def test_links_stream_in_document_order_with_their_category():
+    assert list(iter_links(README)) == [
+        ("Uncategorized", "inline link", "https://intro.example.com"),
+        ("Frontend", "React", "https://react.dev"),
+        ("Frontend", "Hooks", "https://react.dev/reference/react"),
+        ("Frontend", "Router", "https://reactrouter.com"),
+        ("Frontend", "Deeply nested", "https://reactrouter.com/docs"),
+        ("[Linked heading](https://heading.example.com)", "Vue", "https://vuejs.org"),
+    ]
+
+
+def test_one_extraction_timestamp_per_run():
+    records = parse_resources(README)
+    assert len({r["extracted_at"] for r in records}) == 1
+
+    records = parse_resources(README, extracted_at="2026-01-01T00:00:00+00:00")
+    assert {r["extracted_at"] for r in records} == {"2026-01-01T00:00:00+00:00"}
+
+
+def test_heading_must_start_a_line():
+    text = "# Languages\n- [C#](https://learn.microsoft.com/dotnet/csharp) C# ## not a heading\n"
+    assert list(iter_links(text)) == [
+        ("Languages", "C#", "https://learn.microsoft.com/dotnet/csharp"),
+    ]
@@ -0,0 +1,93 @@
+from api.data import Dataset
+from api.index import ResourceIndex
+from api.service import get_recommendations
+from api.store import ResourceStore
+from api.service.materialized import RankingTable
+from tests.factories import make_store
+
+
+STORE = make_store([
+    ("c", "Backend", "tool", 2, False),
+    ("a", "backend", "Course", 2, False),
+    ("b", "backend", "tool", 7, False),
+    ("d", "data", "tool", 9, False),
+])
+
+
+def test_lookup_returns_demo_order():
+    index = ResourceIndex(STORE)
+
+    assert index.lookup("backend").tolist() == [2, 1, 0]
+    assert index.lookup("backend", "tool").tolist() == [2, 0]
+    assert index.lookup("backend", "course").tolist() == [1]
+    assert index.lookup("mobile").tolist() == []
+
+
+def test_lookup_applies_minimum_domain_weight():
+    index = ResourceIndex(STORE)
+
+    assert index.lookup("backend", minimum_domain_weight=3).tolist() == [2]
+    assert index.lookup("backend", minimum_domain_weight=2).tolist() == [2, 1, 0]
+    assert index.lookup("backend", "tool", minimum_domain_weight=8).tolist() == []
+
+
+def test_blank_resource_type_is_no_filter():
+    dataset = Dataset(STORE, "v1")
+    unfiltered = get_recommendations("backend", access_mode="full", dataset=dataset)
+
+    for blank in ("", "  "):
+        response = get_recommendations("backend", access_mode="full", resource_type=blank, dataset=dataset)
+        assert response == unfiltered
+    assert unfiltered["total_results"] == 3
+
+
+def test_store_round_trips_records():
+    record = STORE.record(1)
+
+    assert record["resource_id"] == "a"
+    assert record["skill_cluster"] == "backend"
+    assert record["resource_type"] == "Course"
+    assert record["domain_weight"] == 2
+    assert STORE.skill_cluster.categories == ["Backend", "backend", "data"]
+
+
+def test_ranking_table_orders_by_score_then_position():
+    store = make_store([
+        ("x", "data", "tool", 1, False),
+        ("y", "data", "course", 4, False),
+        ("z", "data", "course", 2, True),
+        ("w", "data", "course", 1, False),
+    ])
+    table = RankingTable(store, ResourceIndex(store), model=None)
+
+    ranked = table.ranked("data")
+    assert ranked.positions.tolist() == [1, 2, 0, 3]
+    assert ranked.scores.tolist() == [4.0, 4.0, 2.0, 1.0]
+    assert table.ranking_mode == "rule"
+
+    # Partial top-k over ad-hoc candidates agrees with the full ordering
+    assert table.top_k([3, 2, 1, 0], 3) == [(4.0, 1), (4.0, 2), (2.0, 0)]
+
+
+def test_secondary_clusters_extend_the_skill_posting():
+    store = ResourceStore.from_records([
+        {"resource_id": "a", "skill_cluster": "backend", "resource_type": "tool",
+         "domain_weight": 1, "skill_scores": {"backend": 1}},
+        {"resource_id": "b", "skill_cluster": "data", "resource_type": "tool",
+         "domain_weight": 5, "skill_scores": {"data": 2, "Backend": 1}},
+        {"resource_id": "c", "skill_cluster": "data", "resource_type": "course",
+         "domain_weight": 3, "skill_scores": {"data": 1}},
+    ])
+    index = ResourceIndex(store)
+
+    assert store.skill_labels[1] == ["data", "Backend"]
+    assert index.lookup("backend").tolist() == [0]
+    assert index.lookup("backend", include_secondary=True).tolist() == [1, 0]
+    assert index.lookup("backend", "tool", include_secondary=True).tolist() == [1, 0]
+    assert index.lookup("backend", "course", include_secondary=True).tolist() == []
+    # Keys where secondary labels add nothing share the primary posting
+    assert index.lookup("data", include_secondary=True).tolist() == [1, 2]
+    assert ("data", None) not in dict(index.related_items())
+
+    table = RankingTable(store, index, model=None)
+    assert table.ranked("backend", include_secondary=True).positions.tolist() == [1, 0]
@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import joblib
+from fastapi.testclient import TestClient
+
+import api.metrics as metrics
+import api.ml.ranker as ranker
+from api.main import app
+from api.metrics import Counter, Histogram, MODEL_FALLBACKS, STAGE_SECONDS, span
+from api.service.ranking import rank_resources
+
+
+def test_histogram_renders_cumulative_buckets_with_inclusive_bounds():
+    histogram = Histogram("test_latency_seconds", "Test", (0.1, 1.0), ("stage",))
+    metrics._registry.remove(histogram)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "rank")
+
+    lines = histogram.render()
+    assert '# TYPE test_latency_seconds histogram' in lines
+    assert 'test_latency_seconds_bucket{stage="rank",le="0.1"} 2' in lines
+    assert 'test_latency_seconds_bucket{stage="rank",le="1"} 3' in lines
+    assert 'test_latency_seconds_bucket{stage="rank",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_sum{stage="rank"} 3.65' in lines
+    assert 'test_latency_seconds_count{stage="rank"} 4' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("test_total", "Test", ("name",))
+    metrics._registry.remove(counter)
+    counter.inc('a"b\\c')
+    counter.inc('a"b\\c', amount=2)
+
+    assert counter.render()[-1] == 'test_total{name="a\\"b\\\\c"} 3'
+
+
+def test_metrics_endpoint_reports_request_and_stage_timings():
+    client = TestClient(app)
+    before = STAGE_SECONDS.count("rank")
+
+    client.get("/v1/recommendations", params={"skill": "data", "offset": 3})
+    client.get("/v1/resources/no-such-id/similar")
+    response = client.get("/v1/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert STAGE_SECONDS.count("rank") == before + 1
+
+    text = response.text
+    assert 'route="/v1/recommendations",status="200"' in text
+    # Path parameters are reported by their template, not their value
+    assert 'route="/v1/resources/{resource_id}/similar",status="404"' in text
+    assert "no-such-id" not in text
+    assert 'dri_candidates_count{endpoint="recommendations",access_mode="demo"}' in text
+    assert "dri_response_cache_misses_total" in text
+
+
+def test_server_timing_header_is_optional(monkeypatch):
+    client = TestClient(app)
+    params = {"skill": "data", "offset": 5}
+
+    assert "server-timing" not in client.get("/v1/recommendations", params=params).headers
+
+    monkeypatch.setattr(metrics, "SERVER_TIMING", True)
+    params["offset"] = 6
+    header = client.get("/v1/recommendations", params=params).headers["server-timing"]
+    stages = [entry.split(";")[0] for entry in header.split(", ")]
+    assert stages == ["filter", "rank", "paginate", "serialize", "app"]
+
+
+def test_spans_outside_a_request_still_record():
+    before = STAGE_SECONDS.count("test_stage")
+    with span("test_stage"):
+        pass
+    assert STAGE_SECONDS.count("test_stage") == before + 1
+
+
+class DummyModel:
+    def predict(self, X):
+        return [1.23]
+
+
+def test_model_fallbacks_are_counted(monkeypatch, tmp_path: Path):
+    # DummyModel returns one score however many rows it gets, so the
+    # batch call fails and every resource is scored on its own
+    monkeypatch.setattr(ranker, "MODEL_PATH", tmp_path / "linear_ranker.pkl")
+    joblib.dump(DummyModel(), ranker.MODEL_PATH)
+    monkeypatch.setattr(ranker, "_model", None)
+    before = MODEL_FALLBACKS.value("batch")
+
+    rank_resources([{"domain_weight": 1}, {"domain_weight": 3}])
+
+    assert MODEL_FALLBACKS.value("batch") == before + 1
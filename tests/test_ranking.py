@@ -1,8 +1,10 @@
+import os
+
 import joblib
 import pytest
 from pathlib import Path
 
-from api.service.ranking import rank_resource
+from api.service.ranking import rank_resource, rank_resources
 import api.ml.ranker as ranker
 import api.service.scoring as scoring
 
@@ -32,4 +34,98 @@ def test_rank_resource_uses_ml_when_available(monkeypatch, tmp_path: Path):
 
     score, mode = rank_resource({"domain_weight": 5})
     assert mode == "ml"
-    assert pytest.approx(score) == 1.23
\ No newline at end of file
+    assert pytest.approx(score) == 1.23
+
+
+class LinearModel:
+    def predict(self, X):
+        return [row[0] * 2 for row in X]
+
+
+def test_rank_resources_scores_in_one_batch(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(ranker, "MODEL_PATH", tmp_path / "linear_ranker.pkl")
+    joblib.dump(LinearModel(), ranker.MODEL_PATH)
+    monkeypatch.setattr(ranker, "_model", None)
+
+    scores, mode = rank_resources([{"domain_weight": 1}, {"domain_weight": 3}])
+    assert mode == "ml"
+    assert scores == [2.0, 6.0]
+
+
+def test_rank_resources_falls_back_per_resource(monkeypatch, tmp_path: Path):
+    # DummyModel returns one score however many rows it gets
+    monkeypatch.setattr(ranker, "MODEL_PATH", tmp_path / "linear_ranker.pkl")
+    joblib.dump(DummyModel(), ranker.MODEL_PATH)
+    monkeypatch.setattr(ranker, "_model", None)
+
+    scores, mode = rank_resources([{"domain_weight": 1}, {"domain_weight": 3}])
+    assert mode == "ml"
+    assert scores == pytest.approx([1.23, 1.23])
+
+
+def test_reload_model_if_changed_hot_swaps(monkeypatch, tmp_path: Path):
+    path = tmp_path / "linear_ranker.pkl"
+    monkeypatch.setattr(ranker, "MODEL_PATH", path)
+    monkeypatch.setattr(ranker, "_model", None)
+    monkeypatch.setattr(ranker, "_loaded", None)
+    monkeypatch.setattr(ranker, "_exists", None)
+
+    assert ranker.reload_model_if_changed() is False
+
+    joblib.dump(DummyModel(), path)
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    assert ranker.reload_model_if_changed() is True
+    assert isinstance(ranker._load_model(), DummyModel)
+    first_version = ranker.model_version()
+    assert first_version is not None
+    assert ranker.reload_model_if_changed() is False
+
+    joblib.dump(LinearModel(), path)
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert ranker.reload_model_if_changed() is True
+    assert isinstance(ranker._load_model(), LinearModel)
+    assert ranker.model_version() != first_version
+
+    path.unlink()
+    assert ranker.reload_model_if_changed() is True
+    assert ranker._load_model() is None
+    assert ranker.model_available() is False
+
+
+def test_corrupt_model_falls_back_to_rule_ranking(monkeypatch, tmp_path: Path):
+    from fastapi.testclient import TestClient
+
+    from api.main import app
+    from api.metrics import MODEL_FALLBACKS
+    from api.cache import RESPONSE_CACHE
+
+    path = tmp_path / "linear_ranker.pkl"
+    path.write_bytes(b"not a pickle")
+    monkeypatch.setattr(ranker, "MODEL_PATH", path)
+    monkeypatch.setattr(ranker, "_model", None)
+    monkeypatch.setattr(ranker, "_loaded", None)
+    monkeypatch.setattr(ranker, "_exists", None)
+    monkeypatch.setattr(ranker, "_failed", None)
+    RESPONSE_CACHE.clear()
+    before = MODEL_FALLBACKS.value("load")
+
+    client = TestClient(app)
+    for _ in range(2):
+        response = client.get(
+            "/v1/recommendations",
+            params={"skill": "data"},
+            headers={"X-API-Key": "demo-key"},
+        )
+        assert response.status_code == 200
+        assert response.json()["ranking_mode"] == "rule"
+
+    # Counted (and logged) once until the file changes, by the watcher too
+    assert ranker.reload_model_if_changed() is False
+    assert ranker.current_model() == (None, None)
+    assert MODEL_FALLBACKS.value("load") == before + 1
+
+    joblib.dump(DummyModel(), path)
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert ranker.reload_model_if_changed() is True
+    model, version = ranker.current_model()
+    assert isinstance(model, DummyModel) and version == ranker.model_version()
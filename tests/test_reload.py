@@ -0,0 +1,46 @@
+import json
+import os
+
+from api.data import DatasetHolder
+from tests.factories import make_record
+
+
+def write(path, records, mtime):
+    path.write_text(json.dumps(records), encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_holder_swaps_in_changed_file_and_keeps_old_snapshot(tmp_path):
+    path = tmp_path / "resources_enriched.json"
+    write(path, [make_record("a")], 1_000_000_000)
+
+    holder = DatasetHolder(str(path))
+    warmed = []
+    holder.add_warmer(warmed.append)
+    before = holder.dataset
+
+    assert holder.reload_if_changed() is False
+
+    write(path, [make_record("a"), make_record("b", skill_cluster="backend")], 2_000_000_000)
+    assert holder.reload_if_changed() is True
+
+    after = holder.dataset
+    assert warmed == [after]
+    assert after.version != before.version
+    assert len(after.store) == 2
+    # A request that captured the old snapshot still sees consistent data
+    assert len(before.store) == 1
+    assert before.index.lookup("backend").tolist() == []
+
+
+def test_holder_keeps_serving_when_new_file_is_invalid(tmp_path):
+    path = tmp_path / "resources_enriched.json"
+    write(path, [make_record("a")], 1_000_000_000)
+    holder = DatasetHolder(str(path))
+    before = holder.dataset
+
+    path.write_text('[{"resource_id": ', encoding="utf-8")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+
+    assert holder.reload_if_changed() is False
+    assert holder.dataset is before
@@ -0,0 +1,154 @@
+import math
+from collections import Counter
+
+from fastapi.testclient import TestClient
+
+from api.data import Dataset
+from api.main import app
+from api.search import BM25_B, BM25_K1, SearchIndex, domain_tokens, tokenize
+from api.service.search import search_resources
+from api.store import ResourceStore
+from tests.factories import make_catalog
+
+
+def brute_force(records, query_tokens, match_all=True):
+    """Reference BM25 over whole documents, straight from the formula."""
+    docs = [
+        Counter(tokenize(r["resource_name"]) + tokenize(r["category"]) + domain_tokens(r["domain"]))
+        for r in records
+    ]
+    n = len(docs)
+    avg = sum(sum(d.values()) for d in docs) / n
+    df = Counter(t for d in docs for t in d)
+
+    scores = {}
+    for pos, doc in enumerate(docs):
+        hits = [t for t in query_tokens if t in doc]
+        if not hits or (match_all and len(hits) < len(query_tokens)):
+            continue
+        length = sum(doc.values())
+        scores[pos] = sum(
+            math.log1p((n - df[t] + 0.5) / (df[t] + 0.5))
+            * doc[t] * (BM25_K1 + 1)
+            / (doc[t] + BM25_K1 * (1 - BM25_B + BM25_B * length / avg))
+            for t in hits
+        )
+    return scores
+
+
+def as_dict(match):
+    positions, scores = match
+    return dict(zip(positions.tolist(), scores.tolist()))
+
+
+def assert_same_scores(actual, expected):
+    assert actual.keys() == expected.keys()
+    for pos, score in expected.items():
+        assert math.isclose(actual[pos], score, rel_tol=1e-5)
+
+
+def test_bm25_matches_reference():
+    records = make_catalog(300)
+    index = SearchIndex(ResourceStore.from_records(records))
+
+    for query, match_all in [("react", True), ("Python docs", True), ("python docs", False), ("résumé", True)]:
+        expected = brute_force(records, tokenize(query), match_all)
+        assert_same_scores(as_dict(index.match(query, match_all=match_all)), expected)
+
+    assert as_dict(index.match("nothing here")) == {}
+    assert as_dict(index.match("react nothing")) == {}
+
+
+def test_prefix_expands_the_last_token():
+    records = make_catalog(200)
+    index = SearchIndex(ResourceStore.from_records(records))
+
+    # "re" -> react, redux, regex (and the "reactjs" domain label)
+    positions, _ = index.match("python re", prefix=True)
+    expected = {
+        pos for pos, r in enumerate(records)
+        if "python" in tokenize(r["resource_name"]) + tokenize(r["category"]) + domain_tokens(r["domain"])
+        and any(t.startswith("re") for t in tokenize(r["resource_name"]) + domain_tokens(r["domain"]))
+    }
+    assert set(positions.tolist()) == expected
+    # Without prefix, "re" is just an unknown word
+    assert len(index.match("python re")[0]) == 0
+
+
+def test_incremental_build_matches_a_fresh_build():
+    before = make_catalog(400)
+    after = make_catalog(450, renamed={5, 17, 200})
+    after = after[:100] + after[150:] + after[100:150]  # moved and re-positioned
+    del after[300]
+
+    previous = SearchIndex(ResourceStore.from_records(before))
+    store = ResourceStore.from_records(after)
+    incremental = SearchIndex(store, previous=previous)
+    fresh = SearchIndex(store)
+
+    # Only renamed and new records were tokenized again
+    assert incremental.reused == 400 - 3 - 1
+    for query, prefix in [("react", False), ("guide py", True), ("docs github", False), ("renamed", False)]:
+        assert_same_scores(as_dict(incremental.match(query, prefix)), as_dict(fresh.match(query, prefix)))
+
+
+def test_vocabulary_does_not_grow_across_reloads():
+    records = make_catalog(200)
+    index = SearchIndex(ResourceStore.from_records(records))
+
+    # Every reload renames everything to words never seen before, and
+    # drops a domain
+    for generation in range(10):
+        records = [
+            {**r, "resource_name": f"{r['resource_name']} gen{generation}x{i}",
+             "domain": "gitlab.com" if r["domain"] == "pandas.io" else r["domain"]}
+            for i, r in enumerate(make_catalog(200))
+        ]
+        store = ResourceStore.from_records(records)
+        index = SearchIndex(store, previous=index)
+
+        assert len(index.terms.ids) <= 2 * len(SearchIndex(store).terms.ids)
+        assert not any("pandas" in key for key in index._value_terms)
+
+    fresh = SearchIndex(store)
+    for query, prefix in [("react", False), ("gen9x1", False), ("docs gitl", True), ("pandas", False)]:
+        assert_same_scores(as_dict(index.match(query, prefix)), as_dict(fresh.match(query, prefix)))
+
+
+def test_search_filters_blends_and_caps_demo_results():
+    records = make_catalog(300)
+    dataset = Dataset(ResourceStore.from_records(records), "v1")
+
+    result = search_resources("python", limit=50, skill="backend", resource_type="Course", dataset=dataset)
+    assert result["count"] == 8  # demo cap
+    assert all(r["skill_cluster"] == "Backend" and r["resource_type"] == "course" for r in result["results"])
+    assert result["ranking_mode"] == "bm25"
+
+    plain = search_resources("python", limit=100, access_mode="full", dataset=dataset)
+    boosted = search_resources(
+        "python", limit=100, access_mode="full", domain_weight_boost=5, rank_boost=1, dataset=dataset
+    )
+    assert boosted["ranking_mode"] in ("bm25+ml", "bm25+rule")
+    assert boosted["total_results"] == plain["total_results"]
+    # A heavy domain_weight boost puts the heaviest domains first
+    weights = [r["domain_weight"] for r in boosted["results"]]
+    assert weights[0] == max(weights)
+    scores = [r["score"] for r in plain["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+    page = search_resources("python", limit=5, offset=5, access_mode="full", dataset=dataset)
+    assert page["results"] == plain["results"][5:10]
+
+
+def test_search_endpoint():
+    client = TestClient(app)
+
+    response = client.get("/v1/search", params={"q": "javascr", "prefix": "true"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query"] == "javascr"
+    assert data["count"] > 0
+    assert all("javascript" in (r["resource_name"] + r["category"]).lower() or "javascript" in r["domain"]
+               for r in data["results"])
+
+    assert client.get("/v1/search").status_code == 422
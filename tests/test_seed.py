@@ -0,0 +1,36 @@
+import json
+
+from sqlalchemy import create_engine, select
+
+from db.database import Base
+from db.models import CatalogMeta, Resource
+from db.seed import seed
+from tests.factories import make_record
+
+
+def test_seed_is_idempotent_and_applies_changes(tmp_path):
+    records = [make_record(f"id{i:03d}") for i in range(40)]
+    path = tmp_path / "resources_enriched.json"
+    path.write_text(json.dumps(records))
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    Base.metadata.create_all(engine)
+
+    first = seed(str(path), engine, chunk_size=7)
+    again = seed(str(path), engine, chunk_size=7)
+
+    records[3]["resource_name"] = "Renamed"
+    path.write_text(json.dumps(records[:-2]))
+    changed = seed(str(path), engine, chunk_size=7)
+
+    assert (first["inserted"], first["unchanged"]) == (40, 0)
+    assert (again["inserted"], again["updated"], again["unchanged"]) == (0, 0, 40)
+    assert (changed["updated"], changed["unchanged"], changed["deleted"]) == (1, 37, 2)
+
+    with engine.connect() as conn:
+        names = dict(conn.execute(select(Resource.resource_id, Resource.resource_name)).all())
+        meta = dict(conn.execute(select(CatalogMeta.key, CatalogMeta.value)).all())
+
+    assert len(names) == 38
+    assert names["id003"] == "Renamed"
+    assert meta["dataset_version"]
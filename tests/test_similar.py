@@ -0,0 +1,135 @@
+import json
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from api.data import Dataset, load_store
+from api.main import app
+from api.service.similar import get_similar_index, similar_resources
+from api.similar import QUANT_SCALE, SimilarIndex, embed, load_similar, similar_path, write_similar
+from api.store import ResourceStore
+from etl.enriched import save_dataset
+from tests.factories import make_catalog
+
+
+def exact_neighbours(index, position, k):
+    """Brute-force cosine over every stored vector, by (-score, position)."""
+    vectors = index.vectors.astype(np.float32)
+    scores = vectors @ vectors[index.slots[position]] / QUANT_SCALE**2
+    order = sorted(
+        (p for p in range(len(index)) if p != position),
+        key=lambda p: (-scores[index.slots[p]], p),
+    )
+    return order[:k]
+
+
+def test_embeddings_are_unit_vectors_of_name_category_and_domain():
+    records = make_catalog(200)
+    records[1] = {**records[0], "resource_id": "copy", "source_url": "https://example.com/copy"}
+    vectors = embed(ResourceStore.from_records(records)).astype(np.float32) / QUANT_SCALE
+
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=0.02)
+    # Same name, category and domain: same vector
+    assert (vectors[0] == vectors[1]).all()
+    # Deterministic: no model, no random state
+    assert (embed(ResourceStore.from_records(records)) == embed(ResourceStore.from_records(records))).all()
+
+
+def test_probing_every_list_is_exact():
+    index = SimilarIndex.build(ResourceStore.from_records(make_catalog(400)))
+    assert len(index.centroids) == 20
+
+    for position in [0, 7, 123, 399]:
+        hits = index.neighbours(position, 10, nprobe=len(index.centroids))
+        assert [h.position for h in hits] == exact_neighbours(index, position, 10)
+        scores = [h.score for h in hits]
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_default_probing_finds_most_true_neighbours():
+    index = SimilarIndex.build(ResourceStore.from_records(make_catalog(1000, seed=9)))
+    vectors = index.vectors.astype(np.float32) / QUANT_SCALE
+
+    recall = []
+    for position in range(0, 1000, 25):
+        query = vectors[index.slots[position]]
+        found = [h.score for h in index.neighbours(position, 10)]
+        # Ties are common: compare scores with the exact 10th best
+        exact = sorted(
+            (vectors[index.slots[p]] @ query for p in range(1000) if p != position), reverse=True
+        )[9]
+        recall.append(np.mean([score >= exact - 1e-4 for score in found]))
+    assert np.mean(recall) >= 0.9
+
+
+def test_index_round_trips_through_a_memory_map(tmp_path):
+    index = SimilarIndex.build(ResourceStore.from_records(make_catalog(300)))
+    path = str(tmp_path / "resources.similar")
+    write_similar(index, path, {"version": "v1"})
+
+    loaded, source = load_similar(path)
+    assert source == {"version": "v1"}
+    assert not loaded.vectors.flags.writeable
+    for position in [0, 42, 299]:
+        assert loaded.neighbours(position, 5) == index.neighbours(position, 5)
+
+    empty = str(tmp_path / "empty.similar")
+    write_similar(SimilarIndex.build(ResourceStore.from_records([])), empty)
+    assert len(load_similar(empty)[0]) == 0
+
+    with open(path, "r+b") as f:
+        f.write(b"garbage!")
+    with pytest.raises(ValueError):
+        load_similar(path)
+
+
+def test_api_maps_the_etl_index_only_when_it_matches(tmp_path, monkeypatch):
+    path = tmp_path / "resources_enriched.json"
+    save_dataset(make_catalog(120), str(path))
+    assert (tmp_path / "resources_enriched.similar").exists()
+
+    def build_fails(store):
+        raise AssertionError("rebuilt the index")
+
+    dataset = Dataset(*load_store(str(path)), path=str(path))
+    with monkeypatch.context() as m:
+        m.setattr(SimilarIndex, "build", build_fails)
+        index = get_similar_index(dataset)
+    assert not index.vectors.flags.writeable
+
+    # A dataset the file was not built from gets an in-process index
+    path.write_text(json.dumps(make_catalog(50)), encoding="utf-8")
+    dataset = Dataset(*load_store(str(path)), path=str(path))
+    assert len(get_similar_index(dataset)) == 50
+    assert len(load_similar(similar_path(str(path)))[0]) == 120
+
+
+def test_similar_resources_caps_demo_results_and_rejects_unknown_ids():
+    dataset = Dataset(ResourceStore.from_records(make_catalog(300)), "v1")
+
+    demo = similar_resources("id003", limit=20, dataset=dataset)
+    assert demo["count"] == 8
+    full = similar_resources("id003", limit=20, access_mode="full", dataset=dataset)
+    assert full["count"] == 20
+    assert full["results"][:8] == demo["results"]
+    assert all(r["resource_id"] != "id003" for r in full["results"])
+
+    with pytest.raises(HTTPException) as exc:
+        similar_resources("nope", dataset=dataset)
+    assert exc.value.status_code == 404
+
+
+def test_similar_endpoint():
+    client = TestClient(app)
+    resource_id = client.get("/v1/recommendations", params={"skill": "frontend"}).json()["results"][0]["resource_id"]
+
+    response = client.get(f"/v1/resources/{resource_id}/similar", params={"limit": 5})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["resource_id"] == resource_id
+    assert data["count"] == len(data["results"]) == 5
+    assert all(-1 <= r["score"] <= 1.0001 for r in data["results"])
+
+    assert client.get("/v1/resources/unknown/similar").status_code == 404
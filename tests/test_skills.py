@@ -0,0 +1,43 @@
+from etl.enriched import SKILL_KEYWORDS, enrich_record
+from etl.skills import SkillClassifier, tokenize
+
+CLASSIFIER = SkillClassifier({
+    "mobile": ["react native", "android"],
+    "frontend": ["react", "html", "css"],
+    "data": ["ml", "machine learning"],
+    "backend": ["api"],
+})
+
+
+def test_keywords_match_whole_words_only():
+    assert CLASSIFIER.scores("HTML Reference") == {"frontend": 1}
+    assert CLASSIFIER.scores("CSSnippets") == {}
+    assert CLASSIFIER.scores("ml-ops toolkit") == {"data": 1}
+    assert CLASSIFIER.scores("Public APIs") == {"backend": 1}
+
+
+def test_every_hit_found_in_one_pass():
+    # Overlapping keywords all count; longer phrases weigh more
+    assert list(CLASSIFIER.hits("React Native and Machine Learning")) == [
+        (1, 1), (0, 2), (2, 2),
+    ]
+    assert CLASSIFIER.scores("React Native and Machine Learning") == {
+        "mobile": 2, "frontend": 1, "data": 2,
+    }
+
+
+def test_primary_cluster_ties_go_to_the_first_listed():
+    assert SkillClassifier.primary({"mobile": 2, "frontend": 1, "data": 2}) == "mobile"
+    assert SkillClassifier.primary({}) == "general"
+
+
+def test_enrich_record_adds_cluster_scores():
+    record = enrich_record(
+        {"resource_name": "Machine Learning APIs", "category": "Data Science", "domain": "x.io"},
+        {"x.io": 3},
+    )
+
+    assert record["skill_scores"] == {"backend": 1, "data": 3}
+    assert record["skill_cluster"] == "data"
+    assert tokenize("node.js") == ["node", "js"]
+    assert "nodejs" in SKILL_KEYWORDS["backend"]
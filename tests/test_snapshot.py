@@ -0,0 +1,99 @@
+import json
+import os
+
+from api.data import Dataset, load_store
+from api.service import get_recommendations
+from api.service.backends import MemoryBackend, set_backend
+from api.store import ResourceStore, load_snapshot, snapshot_path, source_info, write_snapshot
+from etl.enriched import save_dataset
+from tests.factories import make_records
+
+
+def snapshot_records():
+    return make_records(
+        30,
+        resource_name=lambda i: f"Résumé {i}" if i % 5 == 0 else f"Resource {i}",
+        domain=lambda i: f"site{i % 3}.com",
+        resource_type=lambda i: "tool" if i % 3 else "course",
+        skill_cluster=lambda i: "data" if i % 4 == 0 else "backend",
+        skill_scores=lambda i: {"data": 2, "backend": 1} if i % 4 == 0 else {},
+        domain_weight=lambda i: i % 6,
+        is_github=lambda i: i % 7 == 0,
+    )
+
+
+def load_json_fails(*args):
+    raise AssertionError("parsed the JSON")
+
+
+def test_snapshot_round_trips_the_store(tmp_path):
+    store = ResourceStore.from_records(snapshot_records())
+    path = str(tmp_path / "resources.snapshot")
+    write_snapshot(store, path, {"version": "v1"})
+
+    loaded, source = load_snapshot(path)
+
+    assert source == {"version": "v1"}
+    assert list(loaded) == list(store)
+    assert [loaded.skill_labels[i] for i in range(4)] == [["data", "backend"], ["backend"], ["backend"], ["backend"]]
+    assert loaded.find("id017") == 17
+    assert loaded.nbytes == store.nbytes
+    # Views over a read-only mapping, not copies
+    assert not loaded.domain_weight.flags.writeable
+
+
+def test_snapshot_serves_the_same_answers_as_json(tmp_path):
+    records = snapshot_records()
+    path = tmp_path / "resources_enriched.json"
+    save_dataset(records, str(path))
+
+    from_snapshot = Dataset(*load_store(str(path)))
+    from_json = Dataset(ResourceStore.load_json(str(path)), from_snapshot.version)
+
+    set_backend(MemoryBackend())
+    try:
+        for query in [
+            {"access_mode": "full", "limit": 7, "offset": 3},
+            {"access_mode": "demo", "resource_type": "Course"},
+            {"access_mode": "full", "include_secondary": True, "minimum_domain_weight": 2},
+        ]:
+            assert get_recommendations("backend", dataset=from_snapshot, **query) == (
+                get_recommendations("backend", dataset=from_json, **query)
+            )
+    finally:
+        set_backend(None)
+
+
+def test_load_store_uses_matching_snapshot_only(tmp_path, monkeypatch):
+    path = tmp_path / "resources_enriched.json"
+    save_dataset(snapshot_records(), str(path))
+    version = source_info(str(path))["version"]
+
+    with monkeypatch.context() as m:
+        m.setattr(ResourceStore, "load_json", load_json_fails)
+        store, loaded_version = load_store(str(path))
+        assert (len(store), loaded_version) == (30, version)
+
+        # Touched but unchanged (e.g. a fresh checkout): hashed, still used
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        assert load_store(str(path))[1] == version
+
+    # Rewritten without a new snapshot: the JSON wins
+    path.write_text(json.dumps(snapshot_records()[:2]), encoding="utf-8")
+    store, loaded_version = load_store(str(path))
+    assert len(store) == 2
+    assert loaded_version != version
+
+    # Unreadable snapshot: the JSON wins
+    with open(snapshot_path(str(path)), "r+b") as f:
+        f.write(b"garbage!")
+    assert len(load_store(str(path))[0]) == 2
+
+
+def test_empty_store_round_trips(tmp_path):
+    path = str(tmp_path / "empty.snapshot")
+    write_snapshot(ResourceStore.from_records([]), path)
+
+    store, source = load_snapshot(path)
+    assert len(store) == 0
+    assert source is None
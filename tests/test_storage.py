@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import create_engine, event, insert
+
+from api.data import Dataset
+from api.service import get_recommendations, recommendation_cache_key
+from api.service.backends import MemoryBackend, set_backend
+from api.service.sqlite_backend import SQLiteBackend
+from api.store import ResourceStore
+from db.database import Base
+from db.models import CatalogMeta, Resource
+from db.seed import serving_rows
+from tests.factories import make_records
+
+
+def storage_records():
+    return make_records(
+        40,
+        category_slug="tools",
+        skill_cluster=lambda i: "data" if i % 6 == 0 else "Backend" if i % 7 == 0 else "backend",
+        skill_scores=lambda i: {"data": 2, "backend": 1} if i % 6 == 0 else {},
+        resource_type=lambda i: "tool" if i % 3 else "course",
+        domain_weight=lambda i: i % 4,
+        is_github=lambda i: i % 5 == 0,
+    )
+
+
+@pytest.fixture
+def backends(tmp_path):
+    records = storage_records()
+    dataset = Dataset(ResourceStore.from_records(records), "v1")
+
+    path = tmp_path / "catalog.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rows, meta = serving_rows(records)
+    with engine.begin() as conn:
+        conn.execute(insert(Resource), rows)
+        conn.execute(insert(CatalogMeta), [
+            {"key": k, "value": v} for k, v in {**meta, "dataset_version": "v1"}.items()
+        ])
+    engine.dispose()
+
+    sqlite = SQLiteBackend(str(path))
+    yield dataset, MemoryBackend(), sqlite
+    sqlite.engine.dispose()
+    set_backend(None)
+
+
+def answer(backend, dataset, **query):
+    set_backend(backend)
+    return get_recommendations("backend", dataset=dataset, **query)
+
+
+@pytest.mark.parametrize("access_mode", ["full", "demo"])
+@pytest.mark.parametrize("query", [
+    {},
+    {"resource_type": "Tool", "offset": 4},
+    {"minimum_domain_weight": 2, "limit": 3, "offset": 2},
+    {"include_secondary": True, "offset": 3},
+    {"include_secondary": True, "resource_type": "course", "minimum_domain_weight": 1},
+])
+def test_sqlite_backend_matches_memory(backends, access_mode, query):
+    dataset, memory, sqlite = backends
+
+    assert answer(sqlite, dataset, access_mode=access_mode, **query) == answer(
+        memory, dataset, access_mode=access_mode, **query
+    )
+
+
+def test_sqlite_cursor_continues_memory_cursor(backends):
+    dataset, memory, sqlite = backends
+
+    first = answer(memory, dataset, access_mode="full", limit=6)
+    second = answer(sqlite, dataset, access_mode="full", limit=6, cursor=first["next_cursor"])
+    expected = answer(memory, dataset, access_mode="full", limit=6, offset=6)
+
+    assert second["results"] == expected["results"]
+
+
+def test_sqlite_cursor_with_secondary_clusters(backends):
+    dataset, memory, sqlite = backends
+    query = {"access_mode": "full", "limit": 4, "include_secondary": True}
+
+    first = answer(sqlite, dataset, **query)
+    second = answer(sqlite, dataset, cursor=first["next_cursor"], **query)
+    expected = answer(memory, dataset, offset=4, **query)
+
+    assert second["results"] == expected["results"]
+
+
+def test_sqlite_reads_catalog_meta_once_per_dataset(backends):
+    dataset, _, sqlite = backends
+    statements = []
+    event.listen(
+        sqlite.engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql)
+    )
+
+    for offset in (0, 3, 6):
+        set_backend(sqlite)
+        recommendation_cache_key("backend", offset=offset, access_mode="full", dataset=dataset)
+        answer(sqlite, dataset, access_mode="full", offset=offset)
+
+    assert sum("catalog_meta" in sql for sql in statements) == 1
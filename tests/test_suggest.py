@@ -0,0 +1,140 @@
+import random
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from api.data import Dataset
+from api.main import app
+from api.search import TOKEN_RE
+from api.service.suggest import suggest
+from api.store import ResourceStore
+from api.suggest import KEY_BYTES, NODE_MIN_KEYS, PrefixIndex, Suggester, _string_table
+
+WORDS = ["react", "redux", "re", "python", "pandas", "Résumé", "İstanbul", "rust-lang", "a_b"]
+
+
+def make_texts(n, seed=5):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 4)))
+        if rng.random() < 0.3:
+            text += " extraordinarily-long-hyphenated-name"
+        texts.append(text)
+    weights = np.array([rng.randint(0, 40) for _ in texts])
+    return texts, weights
+
+
+def brute_force(texts, weights, prefix, limit=10):
+    """Texts with a word starting with `prefix`, by (-weight, position)."""
+    prefix = prefix.lower()
+    found = []
+    for i in sorted(range(len(texts)), key=lambda i: (-weights[i], i)):
+        lowered = texts[i].lower()
+        if any(lowered[m.start():].startswith(prefix) for m in TOKEN_RE.finditer(lowered)):
+            found.append(i)
+            if len(found) == limit:
+                break
+    return found
+
+
+def test_lookup_matches_brute_force():
+    texts, weights = make_texts(2000)
+    index = PrefixIndex(_string_table(texts), weights)
+    # Short prefixes are heavy nodes with stored top-k lists
+    assert len(index.nodes) > 1
+
+    prefixes = [
+        "", "r", "re", "REA", "react r", "rés", "RÉSUMÉ", "i̇stanbul", "lang", "b", "zz",
+        "python pandas", "extraordinarily-lo",  # longer than KEY_BYTES
+        "extraordinarily-long-hyphenated-name", "extraordinarily-long-hyphenated-nose",
+    ]
+    for prefix in prefixes:
+        assert index.lookup(prefix) == brute_force(texts, weights, prefix), prefix
+    assert index.lookup("re", limit=3) == brute_force(texts, weights, "re", limit=3)
+    assert len("extraordinarily-long-hyphenated-name") > KEY_BYTES
+
+
+def test_heavy_and_light_prefixes_agree():
+    # Same texts with and without precomputed nodes rank identically
+    texts, weights = make_texts(NODE_MIN_KEYS * 4)
+    index = PrefixIndex(_string_table(texts), weights)
+    for prefix in ["r", "re", "py", "extr"]:
+        expected = brute_force(texts, weights, prefix)
+        assert index.lookup(prefix) == expected
+        node = index.nodes.pop(prefix.encode(), None)
+        assert index.lookup(prefix) == expected
+        if node is not None:
+            index.nodes[prefix.encode()] = node
+
+
+def test_suggester_weighs_aggregates_by_summed_domain_weight():
+    records = [
+        {"resource_id": "a", "resource_name": "Data Handbook", "source_url": "u1", "domain": "docs.data.org",
+         "category": "data science", "skill_cluster": "data", "skill_scores": {"data": 2, "backend": 1},
+         "domain_weight": 3},
+        {"resource_id": "b", "resource_name": "Database Guide", "source_url": "u2", "domain": "github.com",
+         "category": "databases", "skill_cluster": "backend", "skill_scores": {"backend": 1},
+         "domain_weight": 9},
+        {"resource_id": "c", "resource_name": "Big Data", "source_url": "u3", "domain": "github.com",
+         "category": "data science", "skill_cluster": "data", "skill_scores": {"data": 1},
+         "domain_weight": 9},
+    ]
+    suggester = Suggester(ResourceStore.from_records(records))
+
+    assert [(s.text, s.weight) for s in suggester.suggest("dat", "name")] == [
+        ("Database Guide", 9), ("Big Data", 9), ("Data Handbook", 3),
+    ]
+    assert suggester.suggest("big", "name")[0].resource_id == "c"
+    assert [(s.text, s.weight) for s in suggester.suggest("data", "category")] == [
+        ("data science", 12), ("databases", 9),
+    ]
+    # Secondary skill labels count too: backend = 9 + 3
+    assert [(s.text, s.weight) for s in suggester.suggest("b", "skill")] == [("backend", 12)]
+    assert [(s.text, s.weight) for s in suggester.suggest("git", "domain")] == [("github.com", 18)]
+    assert suggester.suggest("science", "category")[0].text == "data science"
+
+
+def test_suggest_service_kinds_and_limits():
+    records = [
+        {"resource_id": f"id{i}", "resource_name": f"React Tool {i}", "source_url": f"u{i}",
+         "domain": "reactjs.org", "category": "react", "skill_cluster": "frontend",
+         "skill_scores": {"frontend": 1}, "domain_weight": i}
+        for i in range(20)
+    ]
+    dataset = Dataset(ResourceStore.from_records(records), "v1")
+
+    result = suggest("rea", limit=3, dataset=dataset)
+    assert [s["kind"] for s in result["suggestions"]] == ["category", "domain", "name", "name", "name"]
+    assert [s["text"] for s in result["suggestions"] if s["kind"] == "name"] == [
+        "React Tool 19", "React Tool 18", "React Tool 17",
+    ]
+    assert result["count"] == 5
+
+    only = suggest("  REA", kinds=["name", " Category "], limit=1, dataset=dataset)
+    assert [s["kind"] for s in only["suggestions"]] == ["category", "name"]
+    assert suggest("   ", dataset=dataset)["count"] == 0
+
+    # A kinds list naming nothing means every kind, not none
+    for blank in ([" "], ["", " "]):
+        assert suggest("rea", kinds=blank, limit=3, dataset=dataset) == result
+
+
+def test_suggest_endpoint():
+    client = TestClient(app)
+
+    response = client.get("/v1/suggest", params={"prefix": "java", "kinds": "category,name", "limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["prefix"] == "java"
+    assert data["count"] == len(data["suggestions"]) > 0
+    assert {s["kind"] for s in data["suggestions"]} <= {"category", "name"}
+    for s in data["suggestions"]:
+        assert any(w.startswith("java") for w in TOKEN_RE.findall(s["text"].lower()))
+        assert (s["resource_id"] is not None) == (s["kind"] == "name")
+
+    assert client.get("/v1/suggest", params={"prefix": "java", "kinds": "planet"}).status_code == 400
+    everything = client.get("/v1/suggest", params={"prefix": "java"}).json()
+    for blank in (",", " ", " , "):
+        assert client.get("/v1/suggest", params={"prefix": "java", "kinds": blank}).json() == everything
+    assert client.get("/v1/suggest").status_code == 422